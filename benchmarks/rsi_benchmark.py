@@ -0,0 +1,53 @@
+"""
+Compares RelativeStrengthIndex.compute against the original loop based Wilder smoothing.
+
+Usage: python benchmarks/rsi_benchmark.py [bars ...]
+"""
+import sys
+import timeit
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from stock_trader.trading_algorithms.indicators import RelativeStrengthIndex
+
+
+def loop_rsi(data: pd.DataFrame, window_size: int = 14) -> None:
+    delta = data["Close"].diff(1)
+    gain = delta.clip(lower=0).fillna(0)
+    loss = (-delta.clip(upper=0).fillna(0)).replace(-0.0, 0.0)
+    avg_gain = pd.Series([0.0] * len(data))
+    avg_loss = pd.Series([0.0] * len(data))
+    avg_gain[window_size] = gain[1 : window_size + 1].mean()
+    avg_loss[window_size] = loss[1 : window_size + 1].mean()
+    for i in range(window_size + 1, len(data)):
+        avg_gain.iloc[i] = (avg_gain.iloc[i - 1] * (window_size - 1) + gain.iloc[i]) / (window_size)
+        avg_loss.iloc[i] = (avg_loss.iloc[i - 1] * (window_size - 1) + loss.iloc[i]) / (window_size)
+    rs = avg_gain / avg_loss
+    rs.index = data.index
+    data["RSI_14"] = 100 - (100 / (1 + rs))
+
+
+def make_data(bars: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, size=bars)))
+    return pd.DataFrame({"Close": close}, index=pd.date_range("1980-01-01", periods=bars, freq="D"))
+
+
+def best_of(function: Callable[[pd.DataFrame], Any], data: pd.DataFrame, repeat: int) -> float:
+    return min(timeit.repeat(lambda: function(data.copy()), number=1, repeat=repeat))
+
+
+def main(sizes: list[int]) -> None:
+    rsi = RelativeStrengthIndex()
+    print(f"{'bars':>8} {'loop [s]':>10} {'vectorized [s]':>15} {'speedup':>9}")
+    for bars in sizes:
+        data = make_data(bars)
+        loop = best_of(loop_rsi, data, repeat=1)
+        vectorized = best_of(rsi.compute, data, repeat=5)
+        print(f"{bars:>8} {loop:>10.4f} {vectorized:>15.6f} {loop / vectorized:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 50_000])
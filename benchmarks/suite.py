@@ -0,0 +1,498 @@
+"""
+Benchmarks data sources, data loaders, indicators, signals, simulators and metrics on synthetic tickers.
+
+Every benchmark runs once per ticker count on daily OHLCV fixtures generated on first use. Sources
+that normally go to the network run against local stand-ins: Alpha Vantage against a local HTTP server
+answering every symbol with the history of the first fixture ticker, yfinance with its Ticker and
+download functions reading the fixtures. Runs are repeated up to --repeat times, or until
+--max-seconds were spent on a benchmark, and the best time is kept.
+
+Usage:
+    python benchmarks/suite.py run [--tickers 1 100 10000] [--bars 252] [--only PATTERN ...] [--output FILE]
+    python benchmarks/suite.py compare BASELINE CURRENT [--threshold 0.1]
+
+compare exits with status 1 when a benchmark got slower than the baseline by more than the threshold
+or when a benchmark of the baseline is missing from the current results.
+"""
+import argparse
+import contextlib
+import fnmatch
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_TICKERS = [1, 100, 10_000]
+DATE_RANGE_START = datetime(1900, 1, 1)
+DATE_RANGE_END = datetime(2100, 1, 1)
+
+
+@dataclass
+class Fixtures:
+    """
+    Synthetic tickers written as CSV files in the layout of LocalCSVDataSource, plus lazily built data.
+    """
+
+    folder: Path
+    bars: int
+    tickers: list[str]
+    _frames: dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    def frames(self, count: int) -> dict[str, pd.DataFrame]:
+        from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+        from stock_trader.utils.date_range import DateRange
+
+        source = LocalCSVDataSource(self.folder, self.folder / "cache")
+        date_range = DateRange(start=DATE_RANGE_START, end=DATE_RANGE_END)
+        for ticker in self.tickers[:count]:
+            if ticker not in self._frames:
+                self._frames[ticker] = source.fetch(ticker, date_range)
+        return {ticker: self._frames[ticker] for ticker in self.tickers[:count]}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    # builds what the benchmark needs outside of the timed part and returns the timed part
+    setup: Callable[[Fixtures, list[str], Path], Callable[[], Any]]
+
+
+def make_fixtures(folder: Path, count: int, bars: int) -> Fixtures:
+    folder.mkdir(parents=True, exist_ok=True)
+    tickers = [f"T{i:05d}" for i in range(count)]
+    dates = pd.bdate_range(end="2023-12-29", periods=bars)
+    rng = np.random.default_rng(0)
+    for ticker in tickers:
+        path = folder / f"{ticker.lower()}.us.txt"
+        if path.exists():
+            continue
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, size=bars)))
+        spread = close * rng.uniform(0.0, 0.02, size=bars)
+        df = pd.DataFrame(
+            {
+                "Open": close + rng.uniform(-1.0, 1.0, size=bars) * spread,
+                "High": close + spread,
+                "Low": close - spread,
+                "Close": close,
+                "Volume": rng.integers(1_000, 1_000_000, size=bars),
+                "OpenInt": 0,
+            },
+            index=pd.Index(dates, name="Date"),
+        )
+        df.to_csv(path, float_format="%.5f")
+    return Fixtures(folder, bars, tickers)
+
+
+def _date_range() -> Any:
+    from stock_trader.utils.date_range import DateRange
+
+    return DateRange(start=DATE_RANGE_START, end=DATE_RANGE_END)
+
+
+def _fetch_each(source: Any, tickers: list[str]) -> Callable[[], None]:
+    date_range = _date_range()
+
+    def fetch() -> None:
+        for ticker in tickers:
+            source.fetch(ticker, date_range)
+
+    return fetch
+
+
+def _local_csv(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+    from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+
+    # parses the CSV files on every fetch unless the ohlc_cache_folder setting is set
+    return _fetch_each(LocalCSVDataSource(fixtures.folder), tickers)
+
+
+def _local_csv_cached(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+    from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+
+    fetch = _fetch_each(LocalCSVDataSource(fixtures.folder, scratch / "ohlc_cache"), tickers)
+    fetch()
+    return fetch
+
+
+def _caching(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+    from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+    from stock_trader.acquisition.data_sources.refresh_cache import CachingDataSource
+
+    fetch = _fetch_each(CachingDataSource(LocalCSVDataSource(fixtures.folder), scratch / "remote_cache"), tickers)
+    fetch()
+    return fetch
+
+
+class _AlphaVantageStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, payload: bytes) -> None:
+        super().__init__(("127.0.0.1", 0), _AlphaVantageStubHandler)
+        self.payload = payload
+
+
+class _AlphaVantageStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, with Nagle's algorithm every request would wait for an ACK
+    disable_nagle_algorithm = True
+    server: _AlphaVantageStub
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.server.payload)))
+        self.end_headers()
+        self.wfile.write(self.server.payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _alpha_vantage(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+    from stock_trader.acquisition.data_sources.alpha_vantage import AlphaVantageDataSource
+    from stock_trader.acquisition.data_sources.alpha_vantage_client import AlphaVantageClient
+
+    df = next(iter(fixtures.frames(1).values()))
+    series = {
+        date.strftime("%Y-%m-%d"): {
+            "1. open": f"{row.Open:.4f}",
+            "2. high": f"{row.High:.4f}",
+            "3. low": f"{row.Low:.4f}",
+            "4. close": f"{row.Close:.4f}",
+            "5. volume": str(int(row.Volume)),
+        }
+        for date, row in zip(df.index[::-1], df.iloc[::-1].itertuples())
+    }
+    payload = json.dumps({"Meta Data": {}, "Time Series (Daily)": series}).encode()
+    server = _AlphaVantageStub(payload)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/query"
+    client = AlphaVantageClient("benchmark", url, calls_per_minute=1e12, burst=1e12)
+    return _fetch_each(AlphaVantageDataSource("benchmark", url, client), tickers)
+
+
+def _yfinance(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+    from stock_trader.acquisition.data_sources.yahoo_finance import YFinanceDataSource
+
+    frames = fixtures.frames(len(tickers))
+    # yf.download returns one frame with a (ticker, field) column per downloaded ticker
+    downloaded = pd.concat([frames[ticker] for ticker in tickers], axis=1, keys=[t.upper() for t in tickers])
+
+    class FixtureTicker:
+        def __init__(self, ticker: str) -> None:
+            self._ticker = ticker
+
+        def history(self, **kwargs: Any) -> pd.DataFrame:
+            return frames[self._ticker].tz_localize("America/New_York")
+
+    source = YFinanceDataSource()
+    date_range = _date_range()
+
+    def fetch() -> None:
+        with mock.patch("yfinance.Ticker", FixtureTicker), mock.patch("yfinance.download", return_value=downloaded):
+            source.fetch_many(tickers, date_range)
+
+    return fetch
+
+
+def _loader(make_loader: Callable[[Any], Any]) -> Callable[[Fixtures, list[str], Path], Callable[[], None]]:
+    def setup(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+        from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+
+        loader = make_loader(LocalCSVDataSource(fixtures.folder))
+        date_range = _date_range()
+
+        def load() -> None:
+            for _ in loader.iter_tickers(tickers, date_range):
+                pass
+
+        return load
+
+    return setup
+
+
+def _single_threaded_loader(source: Any) -> Any:
+    from stock_trader.acquisition.data_loaders.data_loader import SingleThreadedDataLoader
+
+    return SingleThreadedDataLoader(source)
+
+
+def _thread_pool_loader(source: Any) -> Any:
+    from stock_trader.acquisition.data_loaders.data_loader import ParallelDataLoader
+
+    return ParallelDataLoader(source, 4, ThreadPoolExecutor, batch_size=25)
+
+
+def _process_pool_loader(source: Any) -> Any:
+    from stock_trader.acquisition.data_loaders.data_loader import ParallelDataLoader
+
+    return ParallelDataLoader(source, 4, ProcessPoolExecutor, batch_size=25)
+
+
+def _shared_memory_loader(source: Any) -> Any:
+    from stock_trader.acquisition.data_loaders.data_loader import SharedMemoryDataLoader
+
+    return SharedMemoryDataLoader(source, 4, batch_size=25)
+
+
+def _async_loader(source: Any) -> Any:
+    from stock_trader.acquisition.data_loaders.data_loader import AsyncDataLoader
+
+    return AsyncDataLoader(source, max_concurrency=16)
+
+
+def _computation(make: Callable[[], Any], method: str) -> Callable[[Fixtures, list[str], Path], Callable[[], None]]:
+    def setup(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+        frames = list(fixtures.frames(len(tickers)).values())
+        computation = getattr(make(), method)
+
+        def compute() -> None:
+            # columns are added to shallow copies, so every run starts from the fixture columns
+            for df in frames:
+                computation(df.copy(deep=False))
+
+        return compute
+
+    return setup
+
+
+def _indicator(name: str) -> Callable[[Fixtures, list[str], Path], Callable[[], None]]:
+    from stock_trader.trading_algorithms import indicators
+
+    return _computation(getattr(indicators, name), "compute")
+
+
+def _signal(name: str) -> Callable[[Fixtures, list[str], Path], Callable[[], None]]:
+    from stock_trader.trading_algorithms import signals
+
+    return _computation(getattr(signals, name), "generate_signals")
+
+
+def _simulation(vectorized: bool) -> Callable[[Fixtures, list[str], Path], Callable[[], None]]:
+    def setup(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+        from stock_trader.simulation.portfolio_manager import PortfolioManager
+        from stock_trader.simulation.simulator import TradingSimulator, VectorizedTradingSimulator
+        from stock_trader.trading_algorithms.signals import RelativeStrengthIndexSignal
+
+        simulator_cls = VectorizedTradingSimulator if vectorized else TradingSimulator
+        frames = fixtures.frames(len(tickers))
+
+        def simulate() -> None:
+            for ticker, df in frames.items():
+                simulator = simulator_cls(RelativeStrengthIndexSignal(), PortfolioManager())
+                simulator.simulate(df.copy(deep=False), ticker)
+
+        return simulate
+
+    return setup
+
+
+def _histories(fixtures: Fixtures, tickers: list[str]) -> list[Any]:
+    from stock_trader.simulation.portfolio_manager import PortfolioManager
+    from stock_trader.simulation.simulator import VectorizedTradingSimulator
+    from stock_trader.trading_algorithms.signals import RelativeStrengthIndexSignal
+
+    histories = []
+    for ticker, df in fixtures.frames(len(tickers)).items():
+        simulator = VectorizedTradingSimulator(RelativeStrengthIndexSignal(), PortfolioManager())
+        simulator.simulate(df.copy(deep=False), ticker)
+        histories.append(simulator.history)
+    return histories
+
+
+def _legacy_metrics(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+    from stock_trader.reporting.performance_metrics import (
+        calculate_annualized_return,
+        calculate_max_drawdown,
+        calculate_sharpe_ratio,
+    )
+
+    histories = _histories(fixtures, tickers)
+
+    def calculate() -> None:
+        for history in histories:
+            calculate_annualized_return(history)
+            calculate_sharpe_ratio(history)
+            calculate_max_drawdown(history)
+
+    return calculate
+
+
+def _batched_metrics(fixtures: Fixtures, tickers: list[str], scratch: Path) -> Callable[[], None]:
+    from stock_trader.reporting.metrics_engine import calculate_metrics, stack_equity
+
+    histories = _histories(fixtures, tickers)
+
+    def calculate() -> None:
+        calculate_metrics(stack_equity(histories))
+
+    return calculate
+
+
+BENCHMARKS = [
+    Benchmark("source/local_csv", _local_csv),
+    Benchmark("source/local_csv_cached", _local_csv_cached),
+    Benchmark("source/caching_local_csv", _caching),
+    Benchmark("source/alpha_vantage", _alpha_vantage),
+    Benchmark("source/yfinance", _yfinance),
+    Benchmark("loader/single_threaded", _loader(_single_threaded_loader)),
+    Benchmark("loader/thread_pool", _loader(_thread_pool_loader)),
+    Benchmark("loader/process_pool", _loader(_process_pool_loader)),
+    Benchmark("loader/shared_memory", _loader(_shared_memory_loader)),
+    Benchmark("loader/async", _loader(_async_loader)),
+    Benchmark("indicator/SimpleMovingAverage", _indicator("SimpleMovingAverage")),
+    Benchmark("indicator/ExponentialMovingAverage", _indicator("ExponentialMovingAverage")),
+    Benchmark("indicator/RelativeStrengthIndex", _indicator("RelativeStrengthIndex")),
+    Benchmark("indicator/MovingAverageConvergenceDivergence", _indicator("MovingAverageConvergenceDivergence")),
+    Benchmark("signal/MovingAverageCrossoverSignal", _signal("MovingAverageCrossoverSignal")),
+    Benchmark("signal/RelativeStrengthIndexSignal", _signal("RelativeStrengthIndexSignal")),
+    Benchmark("signal/MovingAverageConvergenceDivergenceSignal", _signal("MovingAverageConvergenceDivergenceSignal")),
+    Benchmark("simulate/TradingSimulator", _simulation(vectorized=False)),
+    Benchmark("simulate/VectorizedTradingSimulator", _simulation(vectorized=True)),
+    Benchmark("metrics/performance_metrics", _legacy_metrics),
+    Benchmark("metrics/metrics_engine", _batched_metrics),
+]
+
+
+def measure(function: Callable[[], Any], repeat: int, max_seconds: float) -> list[float]:
+    times: list[float] = []
+    # TradingSimulator prints every trade it could not make, which would drown the results
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # at least one run, whatever repeat and max_seconds are
+        while not times or (len(times) < repeat and sum(times) < max_seconds):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def run(args: argparse.Namespace) -> None:
+    selected = [
+        benchmark
+        for benchmark in BENCHMARKS
+        if not args.only or any(fnmatch.fnmatch(benchmark.name, pattern) for pattern in args.only)
+    ]
+    fixtures_folder = Path(args.fixtures or Path(tempfile.gettempdir()) / f"stock_trader_benchmarks_{args.bars}")
+    print(f"Generating fixtures for {max(args.tickers)} tickers in {fixtures_folder}", file=sys.stderr)
+    fixtures = make_fixtures(fixtures_folder, max(args.tickers), args.bars)
+
+    results = []
+    print(f"{'benchmark':<52}{'tickers':>9}{'best [s]':>12}{'per ticker [us]':>17}{'runs':>6}")
+    for benchmark in selected:
+        for count in args.tickers:
+            with tempfile.TemporaryDirectory() as scratch:
+                timed = benchmark.setup(fixtures, fixtures.tickers[:count], Path(scratch))
+                times = measure(timed, args.repeat, args.max_seconds)
+            best = min(times)
+            results.append(
+                {
+                    "benchmark": benchmark.name,
+                    "tickers": count,
+                    "best_s": best,
+                    "mean_s": float(np.mean(times)),
+                    "runs": len(times),
+                }
+            )
+            print(f"{benchmark.name:<52}{count:>9}{best:>12.4f}{best / count * 1e6:>17.1f}{len(times):>6}")
+
+    report = {
+        "metadata": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "bars": args.bars,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results saved to {args.output}", file=sys.stderr)
+
+
+def find_regressions(
+    baseline: list[dict[str, Any]], current: list[dict[str, Any]], threshold: float
+) -> Iterator[tuple[str, int, float | None, float | None, bool]]:
+    """
+    Pair results by benchmark and ticker count.
+
+    Returns:
+    - Benchmark, ticker count, baseline and current best time (None when missing from one of the runs) and
+      whether the current time is slower than the baseline by more than threshold, e.g. 0.1 for 10%
+    """
+    before = {(result["benchmark"], result["tickers"]): result["best_s"] for result in baseline}
+    after = {(result["benchmark"], result["tickers"]): result["best_s"] for result in current}
+    for key in [*before, *(key for key in after if key not in before)]:
+        old, new = before.get(key), after.get(key)
+        regressed = old is not None and new is not None and new > old * (1.0 + threshold)
+        yield key[0], key[1], old, new, regressed
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+    with open(args.current) as file:
+        current = json.load(file)["results"]
+
+    regressions = missing = 0
+    print(f"{'benchmark':<52}{'tickers':>9}{'baseline [s]':>14}{'current [s]':>14}{'change':>9}")
+    for name, count, old, new, regressed in find_regressions(baseline, current, args.threshold):
+        old_text = "-" if old is None else f"{old:.4f}"
+        new_text = "-" if new is None else f"{new:.4f}"
+        change = "" if old is None or new is None else f"{new / old - 1.0:+.0%}"
+        # a benchmark that stopped running, or failed, must not pass for one that kept its speed
+        status = "  MISSING" if new is None else "  REGRESSION" if regressed else ""
+        print(f"{name:<52}{count:>9}{old_text:>14}{new_text:>14}{change:>9}{status}")
+        regressions += regressed
+        missing += new is None
+    print(f"{regressions} regression(s) above {args.threshold:.0%}, {missing} benchmark(s) missing from {args.current}")
+    return 1 if regressions or missing else 0
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and save their results as JSON")
+    run_parser.add_argument("--tickers", type=int, nargs="+", default=DEFAULT_TICKERS, help="ticker counts to run")
+    run_parser.add_argument("--bars", type=int, default=252, help="daily bars of every fixture ticker")
+    run_parser.add_argument("--only", nargs="+", help="glob patterns of benchmarks to run, e.g. 'loader/*'")
+    run_parser.add_argument("--repeat", type=int, default=3, help="runs of every benchmark, the best one is kept")
+    run_parser.add_argument("--max-seconds", type=float, default=5.0, help="stop repeating a benchmark after this")
+    run_parser.add_argument("--fixtures", help="folder for the fixture CSV files, reused between runs")
+    run_parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files and flag regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown, 0.1 is 10%%")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return compare(args)
+    # the data sources read their defaults from the settings, which need these to be set
+    scratch = tempfile.mkdtemp()
+    os.environ.setdefault("STOCK_TRADER_REPORT_OUTPUT_PATH", scratch)
+    os.environ.setdefault("STOCK_TRADER_SOURCE_DATA_FOLDER", scratch)
+    os.environ.setdefault("STOCK_TRADER_ALPHA_VANTAGE_API_KEY", "benchmark")
+    run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
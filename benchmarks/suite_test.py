@@ -0,0 +1,59 @@
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from suite import compare, find_regressions, measure
+
+
+def _result(benchmark: str, tickers: int, best_s: float) -> dict[str, Any]:
+    return {"benchmark": benchmark, "tickers": tickers, "best_s": best_s, "mean_s": best_s, "runs": 1}
+
+
+def _compare(tmp_path: Path, baseline: list[dict[str, Any]], current: list[dict[str, Any]]) -> int:
+    for name, results in [("baseline", baseline), ("current", current)]:
+        (tmp_path / f"{name}.json").write_text(json.dumps({"metadata": {}, "results": results}))
+    args = argparse.Namespace(
+        baseline=str(tmp_path / "baseline.json"), current=str(tmp_path / "current.json"), threshold=0.1
+    )
+    return compare(args)
+
+
+def test_results_are_paired_by_benchmark_and_ticker_count() -> None:
+    baseline = [_result("a", 1, 1.0), _result("a", 100, 2.0), _result("b", 1, 1.0)]
+    current = [_result("a", 100, 2.5), _result("a", 1, 1.05), _result("c", 1, 3.0)]
+    assert list(find_regressions(baseline, current, 0.1)) == [
+        ("a", 1, 1.0, 1.05, False),
+        ("a", 100, 2.0, 2.5, True),
+        ("b", 1, 1.0, None, False),
+        ("c", 1, None, 3.0, False),
+    ]
+
+
+def test_compare_passes_when_nothing_got_slower(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    baseline = [_result("a", 1, 1.0)]
+    assert _compare(tmp_path, baseline, [_result("a", 1, 0.5), _result("new", 1, 1.0)]) == 0
+    assert "0 regression(s) above 10%, 0 benchmark(s) missing" in capsys.readouterr().out
+
+
+def test_compare_fails_on_regressions(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert _compare(tmp_path, [_result("a", 1, 1.0)], [_result("a", 1, 1.2)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_compare_fails_on_benchmarks_missing_from_the_current_run(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    baseline = [_result("a", 1, 1.0), _result("a", 10_000, 100.0)]
+    assert _compare(tmp_path, baseline, [_result("a", 1, 1.0)]) == 1
+    output = capsys.readouterr().out
+    assert "MISSING" in output
+    assert "0 regression(s) above 10%, 1 benchmark(s) missing" in output
+
+
+def test_measure_runs_at_least_once() -> None:
+    runs: list[None] = []
+    assert len(measure(lambda: runs.append(None), repeat=3, max_seconds=0.0)) == 1
+    assert len(runs) == 1
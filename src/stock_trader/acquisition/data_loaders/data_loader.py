@@ -1,31 +1,53 @@
+import asyncio
+import itertools
+import math
+import threading
+import time
 from abc import ABC, abstractmethod
-from concurrent.futures import Executor, as_completed
-from typing import Self, Type
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Any, AsyncContextManager, Callable, Iterator, Self, Type, TypeVar
 
 import pandas as pd
+from stock_trader.acquisition.data_loaders.shared_memory import (
+    SharedFrame,
+    from_shared_memory,
+    release_shared_memory,
+    to_shared_memory,
+)
 from stock_trader.acquisition.data_sources.data_source import DataSource
+from stock_trader.acquisition.market_panel import MarketPanel
 
 from stock_trader.utils.date_range import DateRange
 
+T = TypeVar("T")
+
 
 class DataLoader(ABC):
     @abstractmethod
-    def load_for_tickers(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        # yields every ticker as soon as its data is loaded, so callers can process the universe
+        # while holding only a few tickers in memory at a time
         ...
 
+    def load_for_tickers(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
+        data = dict(self.iter_tickers(tickers, date_range))
+        return {ticker: data[ticker] for ticker in tickers if ticker in data}
+
+    def load_panel(self: Self, tickers: list[str], date_range: DateRange) -> MarketPanel:
+        return MarketPanel.from_frames(self.load_for_tickers(tickers, date_range))
+
 
 class SingleThreadedDataLoader(DataLoader):
-    def __init__(self: Self, data_source: DataSource) -> None:
+    def __init__(self: Self, data_source: DataSource, batch_size: int = 1) -> None:
         self._data_source = data_source
+        self._batch_size = batch_size
+
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        for batch in _batched(tickers, self._batch_size):
+            yield from _fetch_batch(self._data_source, batch, date_range).items()
 
-    def load_for_tickers(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
-        data = {}
-        for ticker in tickers:
-            try:
-                data[ticker] = self._data_source.fetch(ticker, date_range)
-            except pd.errors.EmptyDataError:
-                print(f"No data for {ticker} for the date range {date_range} - skipping")
-        return data
 
 class ParallelDataLoader(DataLoader):
     def __init__(
@@ -33,19 +55,229 @@ class ParallelDataLoader(DataLoader):
         data_source: DataSource,
         num_workers: int,
         executor_cls: Type[Executor],
+        batch_size: int = 1,
     ) -> None:
         self._data_source = data_source
         self._num_workers = num_workers
         self._executor_cls = executor_cls
+        self._batch_size = batch_size
 
-    def load_for_tickers(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
-        result = {}
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        # smaller batches than configured when there are too few tickers to keep every worker busy
+        batch_size = max(1, min(self._batch_size, math.ceil(len(tickers) / self._num_workers)))
         # both ThreadPoolExecutor and ProcessPoolExecutor have max_workers
         with self._executor_cls(max_workers=self._num_workers) as executor:  # type: ignore
-            futures = {executor.submit(self._data_source.fetch, ticker, date_range): ticker for ticker in tickers}
-            for future in as_completed(futures):
-                try:
-                    result[futures[future]] = future.result()
-                except pd.errors.EmptyDataError:
-                     print(f"No data for {futures[future]} for the date range {date_range} - skipping")
-        return result
+            def submit(batch: list[str]) -> Future[dict[str, pd.DataFrame]]:
+                return executor.submit(_fetch_batch, self._data_source, batch, date_range)
+
+            try:
+                for future in _iter_completed(submit, _batched(tickers, batch_size), 2 * self._num_workers):
+                    yield from future.result().items()
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+
+class SharedMemoryDataLoader(DataLoader):
+    """
+    Loads tickers in a process pool whose workers hand the data back through shared memory.
+
+    The data source is sent to each worker once, by the pool initializer. Workers write the standardized
+    OHLCV arrays into shared memory blocks and return only their descriptions, the parent process wraps
+    the blocks as DataFrames without copying them.
+    """
+
+    def __init__(self: Self, data_source: DataSource, num_workers: int, batch_size: int = 1) -> None:
+        self._data_source = data_source
+        self._num_workers = num_workers
+        self._batch_size = batch_size
+
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        batch_size = max(1, min(self._batch_size, math.ceil(len(tickers) / self._num_workers)))
+        with ProcessPoolExecutor(
+            max_workers=self._num_workers, initializer=_init_worker, initargs=(self._data_source,)
+        ) as executor:
+            futures: list[Future[dict[str, SharedFrame]]] = []
+
+            def submit(batch: list[str]) -> Future[dict[str, SharedFrame]]:
+                futures.append(executor.submit(_fetch_batch_to_shared_memory, batch, date_range))
+                return futures[-1]
+
+            attached = set()
+            try:
+                for future in _iter_completed(submit, _batched(tickers, batch_size), 2 * self._num_workers):
+                    frames = future.result()
+                    attached.add(future)
+                    for ticker, frame in frames.items():
+                        df = from_shared_memory(frame)
+                        df.attrs["ticker"] = ticker
+                        yield ticker, df
+            finally:
+                # blocks of batches nobody attached to, after a failure or an early stop, would leak otherwise
+                executor.shutdown(wait=True, cancel_futures=True)
+                for future in futures:
+                    if future not in attached and not future.cancelled() and future.exception() is None:
+                        for frame in future.result().values():
+                            release_shared_memory(frame)
+
+
+class AsyncDataLoader(DataLoader):
+    def __init__(self: Self, data_source: DataSource, max_concurrency: int) -> None:
+        self._data_source = data_source
+        self._max_concurrency = max_concurrency
+
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        # the event loop is driven by hand so that results can be yielded while it is paused,
+        # at most max_concurrency loads are scheduled at any time
+        loop = asyncio.new_event_loop()
+        session = self._data_source.async_session()
+        loop.run_until_complete(session.__aenter__())
+        pending: set[asyncio.Task[tuple[str, pd.DataFrame | None]]] = set()
+        remaining = iter(tickers)
+        try:
+            for ticker in itertools.islice(remaining, self._max_concurrency):
+                pending.add(loop.create_task(self._load(ticker, date_range)))
+            while pending:
+                done, pending = loop.run_until_complete(asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))
+                for task in done:
+                    for ticker in itertools.islice(remaining, 1):
+                        pending.add(loop.create_task(self._load(ticker, date_range)))
+                    ticker, df = task.result()
+                    if df is not None:
+                        yield ticker, df
+        finally:
+            loop.run_until_complete(self._close(pending, session))
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    async def _close(self: Self, pending: set[asyncio.Task[Any]], session: AsyncContextManager[None]) -> None:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await session.__aexit__(None, None, None)
+
+    async def _load(self: Self, ticker: str, date_range: DateRange) -> tuple[str, pd.DataFrame | None]:
+        try:
+            df = await self._data_source.fetch_async(ticker, date_range)
+            df.attrs["ticker"] = ticker
+            return ticker, df
+        except pd.errors.EmptyDataError:
+            print(f"No data for {ticker} for the date range {date_range} - skipping")
+            return ticker, None
+
+
+class InMemoryDataLoader(DataLoader):
+    """
+    Keeps tickers loaded through data_loader in memory, keyed by ticker and date range.
+
+    Meant for long-running processes answering many requests over the same universe: only tickers not
+    loaded before for a date range go to data_loader, all of them in one call. Callers get copies, so
+    columns they add never leak into later requests. Tickers the data source has no data for are
+    remembered as well and skipped without asking it again.
+
+    Entries older than ttl are loaded again, so data of the current session does not go stale, and
+    least recently used ones are dropped once all of them take more than max_bytes. clear() drops
+    everything at once.
+    """
+
+    def __init__(
+        self: Self,
+        data_loader: DataLoader,
+        max_bytes: int | None = None,
+        ttl: timedelta | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._data_loader = data_loader
+        self._max_bytes = max_bytes
+        self._ttl = ttl.total_seconds() if ttl is not None else math.inf
+        self._clock = clock
+        # frames with the time they were loaded at, least recently used first
+        self._frames: OrderedDict[tuple[str, datetime, datetime], tuple[pd.DataFrame | None, float]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        start, end = date_range.start, date_range.end
+        with self._lock:
+            now = self._clock()
+            missing = []
+            for ticker in dict.fromkeys(tickers):
+                entry = self._frames.get((ticker, start, end))
+                if entry is None or now - entry[1] >= self._ttl:
+                    missing.append(ticker)
+                else:
+                    self._frames.move_to_end((ticker, start, end))
+            loaded = self._data_loader.load_for_tickers(missing, date_range) if missing else {}
+            for ticker in missing:
+                self._store((ticker, start, end), loaded.get(ticker), now)
+            # taken before evicting, so that this call gets all of its tickers even beyond max_bytes
+            frames = [(ticker, self._frames[ticker, start, end][0]) for ticker in tickers]
+            self._evict()
+        for ticker, df in frames:
+            if df is not None:
+                copy = df.copy()
+                copy.attrs["ticker"] = ticker
+                yield ticker, copy
+
+    def clear(self: Self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._total_bytes = 0
+
+    def _store(self: Self, key: tuple[str, datetime, datetime], df: pd.DataFrame | None, loaded_at: float) -> None:
+        if key in self._frames:
+            self._total_bytes -= _get_size(self._frames.pop(key)[0])
+        self._frames[key] = (df, loaded_at)
+        self._total_bytes += _get_size(df)
+
+    def _evict(self: Self) -> None:
+        while self._max_bytes is not None and self._frames and self._total_bytes > self._max_bytes:
+            _, (df, _) = self._frames.popitem(last=False)
+            self._total_bytes -= _get_size(df)
+
+
+def _get_size(df: pd.DataFrame | None) -> int:
+    return 0 if df is None else int(df.memory_usage(index=True).sum())
+
+
+def _batched(tickers: list[str], batch_size: int) -> Iterator[list[str]]:
+    for start in range(0, len(tickers), batch_size):
+        yield tickers[start : start + batch_size]
+
+
+def _iter_completed(
+    submit: Callable[[list[str]], Future[T]], batches: Iterator[list[str]], max_in_flight: int
+) -> Iterator[Future[T]]:
+    # keeps at most max_in_flight batches submitted and yields them in completion order
+    pending = {submit(batch) for batch in itertools.islice(batches, max_in_flight)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.update(submit(batch) for batch in itertools.islice(batches, 1))
+            yield future
+
+
+def _fetch_batch(data_source: DataSource, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
+    data = data_source.fetch_many(tickers, date_range)
+    for ticker in tickers:
+        if ticker not in data:
+            print(f"No data for {ticker} for the date range {date_range} - skipping")
+        else:
+            # lets indicator results computed on the data be cached per ticker
+            data[ticker].attrs["ticker"] = ticker
+    return data
+
+
+_worker_data_source: DataSource | None = None
+
+
+def _init_worker(data_source: DataSource) -> None:
+    global _worker_data_source
+    _worker_data_source = data_source
+
+
+def _fetch_batch_to_shared_memory(tickers: list[str], date_range: DateRange) -> dict[str, SharedFrame]:
+    assert _worker_data_source is not None, "worker was not initialized with a data source"
+    return {
+        ticker: to_shared_memory(df)
+        for ticker, df in _fetch_batch(_worker_data_source, tickers, date_range).items()
+    }
@@ -2,8 +2,10 @@ from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Callable
 
 from stock_trader.acquisition.data_loaders.data_loader import (
+    AsyncDataLoader,
     DataLoader,
     ParallelDataLoader,
+    SharedMemoryDataLoader,
     SingleThreadedDataLoader,
 )
 from stock_trader.acquisition.data_sources.data_source import DataSource
@@ -12,13 +14,18 @@ from stock_trader.settings import APP_SETTINGS, Concurrency
 
 def data_loader_factory(data_source: DataSource) -> DataLoader:
     concurrency = APP_SETTINGS.concurrency
+    batch_size = APP_SETTINGS.fetch_batch_size
+    num_workers = APP_SETTINGS.num_workers
     if concurrency == Concurrency.SINGLE_THREADED:
-        return SingleThreadedDataLoader(data_source)
+        return SingleThreadedDataLoader(data_source, batch_size)
     elif concurrency == Concurrency.THREADS:
-        return ParallelDataLoader(data_source, 4, ThreadPoolExecutor)
+        return ParallelDataLoader(data_source, num_workers, ThreadPoolExecutor, batch_size)
     elif concurrency == Concurrency.PROCESSESS:
-        return ParallelDataLoader(data_source, 4, ProcessPoolExecutor)
-    # TODO: handle AsyncIO
+        return ParallelDataLoader(data_source, num_workers, ProcessPoolExecutor, batch_size)
+    elif concurrency == Concurrency.SHARED_MEMORY:
+        return SharedMemoryDataLoader(data_source, num_workers, batch_size)
+    elif concurrency == Concurrency.ASYNCIO:
+        return AsyncDataLoader(data_source, 64)
     raise ValueError("unsupported concurrency type")
 
 
@@ -1,7 +1,13 @@
 from typing import Type
 import pytest
 from stock_trader.acquisition import data_loaders
-from stock_trader.acquisition.data_loaders.data_loader import DataLoader, ParallelDataLoader
+from stock_trader.acquisition.data_loaders.data_loader import (
+    AsyncDataLoader,
+    DataLoader,
+    ParallelDataLoader,
+    SharedMemoryDataLoader,
+    SingleThreadedDataLoader,
+)
 from stock_trader.acquisition.data_loaders.data_loader_factory import (
     data_loader_factory,
     Concurrency,
@@ -14,6 +20,9 @@ from stock_trader.acquisition.data_sources.data_source import DataSource
     [
         (Concurrency.THREADS, ParallelDataLoader),
         (Concurrency.PROCESSESS, ParallelDataLoader),
+        (Concurrency.SHARED_MEMORY, SharedMemoryDataLoader),
+        (Concurrency.ASYNCIO, AsyncDataLoader),
+        (Concurrency.SINGLE_THREADED, SingleThreadedDataLoader),
     ],
 )
 def test_correctly_typed_loaders_can_be_produced(
@@ -1,17 +1,31 @@
+import asyncio
+import threading
+from collections.abc import Generator
 from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, Self
+import pandas as pd
 from pandas import Index
 import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
 from stock_trader.acquisition.data_loaders.data_loader import (
+    AsyncDataLoader,
+    InMemoryDataLoader,
     ParallelDataLoader,
+    SharedMemoryDataLoader,
     SingleThreadedDataLoader,
 )
-from stock_trader.acquisition.data_sources.data_source import DataSource
+from stock_trader.acquisition.data_sources.alpha_vantage import AlphaVantageDataSource
+from stock_trader.acquisition.data_sources.alpha_vantage_client import AlphaVantageClient
+from stock_trader.acquisition.data_sources.data_source import DataSource, TickerNotFoundError
+from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+from stock_trader.conftest import AlphaVantageStubServer, FakeDataSource, is_backed_by_shared_memory
 from stock_trader.utils.date_range import DateRange
 
 
 def test_single_threaded_data_loader_loads_data_for_each_ticker(
     fake_data_source: DataSource,
-):
+) -> None:
     loader = SingleThreadedDataLoader(fake_data_source)
     data = loader.load_for_tickers(["a"], DateRange.days_back(3))
     assert data is not None
@@ -20,7 +34,9 @@ def test_single_threaded_data_loader_loads_data_for_each_ticker(
 
 
 @pytest.mark.parametrize("executor", [ThreadPoolExecutor, ProcessPoolExecutor])
-def test_parallel_data_loader_loads_data_for_each_ticker(fake_data_source: DataSource, executor: type[Executor]):
+def test_parallel_data_loader_loads_data_for_each_ticker(
+    fake_data_source: DataSource, executor: type[Executor]
+) -> None:
     loader = ParallelDataLoader(fake_data_source, num_workers=2, executor_cls=executor)
     data = loader.load_for_tickers(["AAPL", "GOOG"], DateRange.days_back(3))
     assert data is not None
@@ -29,3 +45,178 @@ def test_parallel_data_loader_loads_data_for_each_ticker(fake_data_source: DataS
     expected_columns: Index = Index(["Open", "High", "Low", "Close", "Volume"], dtype="object")
     for ticker_data in data.values():
         assert (ticker_data.columns == expected_columns).all()
+
+
+class BatchRecordingDataSource(FakeDataSource):
+    def __init__(self: Self) -> None:
+        self.batches: list[list[str]] = []
+
+    def fetch_many(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
+        self.batches.append(tickers)
+        return {ticker: self.fetch(ticker, date_range) for ticker in tickers if ticker != "EMPTY"}
+
+
+def test_single_threaded_data_loader_fetches_tickers_in_batches(capsys: pytest.CaptureFixture[str]) -> None:
+    data_source = BatchRecordingDataSource()
+    loader = SingleThreadedDataLoader(data_source, batch_size=2)
+    data = loader.load_for_tickers(["AAPL", "GOOG", "EMPTY", "MSFT", "GE"], DateRange.days_back(3))
+    assert data_source.batches == [["AAPL", "GOOG"], ["EMPTY", "MSFT"], ["GE"]]
+    assert list(data) == ["AAPL", "GOOG", "MSFT", "GE"]
+    assert "No data for EMPTY" in capsys.readouterr().out
+
+
+def test_parallel_data_loader_splits_batches_across_workers() -> None:
+    data_source = BatchRecordingDataSource()
+    loader = ParallelDataLoader(data_source, num_workers=2, executor_cls=ThreadPoolExecutor, batch_size=50)
+    data = loader.load_for_tickers(["AAPL", "GOOG", "MSFT", "GE"], DateRange.days_back(3))
+    assert sorted(data_source.batches) == [["AAPL", "GOOG"], ["MSFT", "GE"]]
+    assert sorted(data) == ["AAPL", "GE", "GOOG", "MSFT"]
+
+
+TEST_DATA = Path(__file__).parents[1] / "data_sources" / "test_data"
+
+
+def test_shared_memory_data_loader_returns_same_data_as_single_threaded() -> None:
+    data_source = LocalCSVDataSource(TEST_DATA)
+    date_range = DateRange(start=datetime(2007, 11, 9), end=datetime(2017, 11, 9))
+    expected = SingleThreadedDataLoader(data_source).load_for_tickers(["aapl", "ge"], date_range)
+    loader = SharedMemoryDataLoader(data_source, num_workers=2)
+    data = loader.load_for_tickers(["aapl", "ge"], date_range)
+    assert sorted(data) == ["aapl", "ge"]
+    for ticker, df in data.items():
+        pd.testing.assert_frame_equal(df, expected[ticker])
+        assert is_backed_by_shared_memory(df["Close"].to_numpy())
+
+
+def test_shared_memory_data_loader_raises_TickerNotFound_when_ticker_not_found() -> None:
+    loader = SharedMemoryDataLoader(LocalCSVDataSource(TEST_DATA), num_workers=2)
+    with pytest.raises(TickerNotFoundError):
+        loader.load_for_tickers(["aapl", "nvgasdasda"], DateRange.years_back(10))
+
+
+class CountingDataSource(FakeDataSource):
+    def __init__(self: Self) -> None:
+        self.fetched: list[str] = []
+        self._lock = threading.Lock()
+
+    def fetch(self: Self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        with self._lock:
+            self.fetched.append(ticker)
+        return super().fetch(ticker, date_range)
+
+    async def fetch_async(self: Self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        # the first ticker is the slowest one to load
+        await asyncio.sleep(0.05 if ticker == "T0" else 0)
+        return self.fetch(ticker, date_range)
+
+
+def test_parallel_data_loader_keeps_a_bounded_number_of_batches_in_flight() -> None:
+    data_source = CountingDataSource()
+    loader = ParallelDataLoader(data_source, num_workers=1, executor_cls=ThreadPoolExecutor)
+    tickers = loader.iter_tickers([f"T{i}" for i in range(100)], DateRange.days_back(3))
+    assert isinstance(tickers, Generator)
+    assert next(tickers)[0] == "T0"
+    tickers.close()
+    assert len(data_source.fetched) <= 3
+
+
+def test_async_data_loader_yields_tickers_in_completion_order() -> None:
+    data_source = CountingDataSource()
+    loader = AsyncDataLoader(data_source, max_concurrency=2)
+    tickers = [f"T{i}" for i in range(10)]
+    assert [ticker for ticker, _ in loader.iter_tickers(tickers, DateRange.days_back(3))][-1] == "T0"
+    assert list(loader.load_for_tickers(tickers, DateRange.days_back(3))) == tickers
+
+
+def test_async_data_loader_stops_scheduling_when_consumer_stops() -> None:
+    data_source = CountingDataSource()
+    loader = AsyncDataLoader(data_source, max_concurrency=2)
+    tickers = loader.iter_tickers([f"T{i}" for i in range(100)], DateRange.days_back(3))
+    assert isinstance(tickers, Generator)
+    next(tickers)
+    tickers.close()
+    assert len(data_source.fetched) <= 3
+
+
+def _unthrottled_alpha_vantage(stub: AlphaVantageStubServer) -> AlphaVantageDataSource:
+    return AlphaVantageDataSource("key", client=AlphaVantageClient("key", stub.url, calls_per_minute=1e9, pool_size=16))
+
+
+def test_async_data_loader_falls_back_to_threads_for_blocking_sources(fake_data_source: DataSource) -> None:
+    loader = AsyncDataLoader(fake_data_source, max_concurrency=2)
+    data = loader.load_for_tickers(["AAPL", "GOOG", "MSFT"], DateRange.days_back(3))
+    assert list(data) == ["AAPL", "GOOG", "MSFT"]
+    expected_columns: Index = Index(["Open", "High", "Low", "Close", "Volume"], dtype="object")
+    for ticker_data in data.values():
+        assert (ticker_data.columns == expected_columns).all()
+
+
+def test_async_data_loader_fetches_alpha_vantage_over_reused_connections(
+    alpha_vantage_stub: AlphaVantageStubServer,
+) -> None:
+    tickers = [f"T{i}" for i in range(200)]
+    loader = AsyncDataLoader(_unthrottled_alpha_vantage(alpha_vantage_stub), max_concurrency=16)
+    data = loader.load_for_tickers(tickers, DateRange(start=datetime(2023, 1, 1), end=datetime(2023, 12, 31)))
+    assert sorted(data) == sorted(tickers)
+    assert all(len(ticker_data) == 30 for ticker_data in data.values())
+    assert len(alpha_vantage_stub.queries) == len(tickers)
+    assert len(alpha_vantage_stub.client_ports) <= 16
+
+
+def test_async_data_loader_raises_TickerNotFound_when_ticker_not_found(
+    alpha_vantage_stub: AlphaVantageStubServer,
+) -> None:
+    loader = AsyncDataLoader(_unthrottled_alpha_vantage(alpha_vantage_stub), max_concurrency=4)
+    with pytest.raises(TickerNotFoundError):
+        loader.load_for_tickers(["AAPL", "missing"], DateRange.years_back(10))
+
+
+class RecordingLoader(SingleThreadedDataLoader):
+    def __init__(self: Self, data_source: DataSource) -> None:
+        super().__init__(data_source)
+        self.calls: list[list[str]] = []
+
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        self.calls.append(list(tickers))
+        return super().iter_tickers(tickers, date_range)
+
+
+def test_in_memory_data_loader_loads_every_ticker_once(fake_data_source: DataSource) -> None:
+    recording = RecordingLoader(fake_data_source)
+    loader = InMemoryDataLoader(recording)
+    date_range = DateRange(start=datetime(2023, 1, 1), end=datetime(2023, 1, 10))
+    first = loader.load_for_tickers(["GE", "AAPL"], date_range)
+    first["GE"]["Signal"] = 1.0
+    second = loader.load_for_tickers(["AAPL", "GE", "MSFT"], date_range)
+
+    assert recording.calls == [["GE", "AAPL"], ["MSFT"]]
+    assert "Signal" not in second["GE"].columns
+    pd.testing.assert_frame_equal(second["AAPL"], first["AAPL"])
+
+
+def test_in_memory_data_loader_reloads_expired_tickers(fake_data_source: DataSource) -> None:
+    now = [0.0]
+    recording = RecordingLoader(fake_data_source)
+    loader = InMemoryDataLoader(recording, ttl=timedelta(minutes=5), clock=lambda: now[0])
+    date_range = DateRange(start=datetime(2023, 1, 1), end=datetime(2023, 1, 10))
+    loader.load_for_tickers(["GE"], date_range)
+    now[0] = 120.0
+    loader.load_for_tickers(["GE", "AAPL"], date_range)
+    now[0] = 310.0
+    loader.load_for_tickers(["GE", "AAPL"], date_range)
+
+    assert recording.calls == [["GE"], ["AAPL"], ["GE"]]
+
+
+def test_in_memory_data_loader_drops_least_recently_used_tickers(fake_data_source: DataSource) -> None:
+    recording = RecordingLoader(fake_data_source)
+    date_range = DateRange(start=datetime(2023, 1, 1), end=datetime(2023, 1, 10))
+    frame_size = int(fake_data_source.fetch("GE", date_range).memory_usage(index=True).sum())
+    loader = InMemoryDataLoader(recording, max_bytes=2 * frame_size)
+    loader.load_for_tickers(["GE", "AAPL"], date_range)
+    loader.load_for_tickers(["GE"], date_range)
+    # MSFT pushes out AAPL, which was used less recently than GE
+    assert list(loader.load_for_tickers(["MSFT"], date_range)) == ["MSFT"]
+    loader.load_for_tickers(["GE", "AAPL"], date_range)
+
+    assert recording.calls == [["GE", "AAPL"], ["MSFT"], ["AAPL"]]
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Self
+
+import numpy as np
+import pandas as pd
+
+# every array in a block starts at a multiple of this many bytes
+_ALIGNMENT = 8
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    """
+    Description of a DataFrame written into a shared memory block: a datetime64[ns] index followed by
+    one array per column, each starting at an aligned offset.
+    """
+
+    block_name: str
+    length: int
+    index_name: str | None
+    columns: tuple[tuple[str, str], ...]
+
+
+class _AttachedBlock(SharedMemory):
+    def __del__(self: Self) -> None:
+        # arrays wrapping the block may outlive this object, the mapping is then
+        # released together with the last of them
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+
+def to_shared_memory(df: pd.DataFrame) -> SharedFrame:
+    columns = tuple((str(col), _get_numpy_dtype(col, dtype).str) for col, dtype in df.dtypes.items())
+    offsets = _get_offsets(len(df), [np.dtype(np.int64)] + [np.dtype(dtype) for _, dtype in columns])
+    block = SharedMemory(create=True, size=max(1, offsets[-1]))
+    try:
+        assert block.buf is not None
+        index_values = df.index.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        arrays = [index_values] + [df[col].to_numpy() for col in df.columns]
+        for array, offset in zip(arrays, offsets):
+            np.frombuffer(block.buf, dtype=array.dtype, count=len(array), offset=offset)[:] = array
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    # the parent process takes over the block, it must not be unlinked when this process exits
+    resource_tracker.unregister(block._name, "shared_memory")  # type: ignore
+    return SharedFrame(block.name, len(df), df.index.name, columns)
+
+
+def from_shared_memory(frame: SharedFrame, unlink: bool = True) -> pd.DataFrame:
+    """
+    Attach to a block written by to_shared_memory and wrap it in a DataFrame without copying.
+
+    By default the block is unlinked right away, the mapping stays valid and nothing is left behind
+    once it is released. With unlink=False the block stays available to other processes, which then
+    all share it read-only, and its creator releases it with release_shared_memory().
+    """
+    block = _AttachedBlock(frame.block_name)
+    assert block.buf is not None
+    if unlink:
+        block.unlink()
+    else:
+        # the block belongs to its creator, this process must not unlink it when it exits
+        resource_tracker.unregister(block._name, "shared_memory")  # type: ignore
+    dtypes = [np.dtype(np.int64)] + [np.dtype(dtype) for _, dtype in frame.columns]
+    offsets = _get_offsets(frame.length, dtypes)
+    arrays = [
+        np.frombuffer(block.buf, dtype=dtype, count=frame.length, offset=offset)
+        for dtype, offset in zip(dtypes, offsets)
+    ]
+    if not unlink:
+        for array in arrays:
+            array.flags.writeable = False
+    index = pd.DatetimeIndex(arrays[0].view("datetime64[ns]"), name=frame.index_name, copy=False)
+    # with copy=False every column keeps wrapping its own array instead of being consolidated into a copy
+    data = {name: array for (name, _), array in zip(frame.columns, arrays[1:])}
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def release_shared_memory(frame: SharedFrame) -> None:
+    try:
+        block = SharedMemory(frame.block_name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def _get_numpy_dtype(column: Any, dtype: Any) -> np.dtype:
+    # extension dtypes (e.g. nullable Int64 or categories) and objects are not plain arrays of fixed size items
+    if not isinstance(dtype, np.dtype) or dtype.hasobject:
+        raise TypeError(f"column {column} has dtype {dtype}, only numeric numpy dtypes fit into shared memory")
+    return dtype
+
+
+def _get_offsets(length: int, dtypes: list[np.dtype]) -> list[int]:
+    # offsets of each array followed by the total size of the block
+    offsets = [0]
+    for dtype in dtypes:
+        size = length * dtype.itemsize
+        offsets.append(offsets[-1] + -(-size // _ALIGNMENT) * _ALIGNMENT)
+    return offsets
@@ -0,0 +1,62 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.api.extensions import ExtensionDtype
+
+from stock_trader.acquisition.data_loaders.shared_memory import (
+    from_shared_memory,
+    release_shared_memory,
+    to_shared_memory,
+)
+from stock_trader.acquisition.data_sources.data_source import DataSource
+from stock_trader.conftest import is_backed_by_shared_memory
+
+
+def test_dataframe_survives_roundtrip_through_shared_memory(fake_data_source: DataSource) -> None:
+    df = fake_data_source.load_to_dataframe("AAPL")
+    df.index.name = "Date"
+    loaded = from_shared_memory(to_shared_memory(df))
+    pd.testing.assert_frame_equal(loaded, df, check_freq=False)
+    assert is_backed_by_shared_memory(loaded["Close"].to_numpy())
+    assert loaded["Volume"].dtype == np.int64
+
+
+@pytest.mark.parametrize("dtype", [pd.Int64Dtype(), pd.CategoricalDtype(), np.dtype(object)])
+def test_columns_that_are_not_numpy_arrays_are_rejected(
+    fake_data_source: DataSource, dtype: ExtensionDtype | np.dtype
+) -> None:
+    df = fake_data_source.load_to_dataframe("AAPL")
+    df["Volume"] = df["Volume"].astype(dtype)
+    with pytest.raises(TypeError, match="Volume"):
+        to_shared_memory(df)
+
+
+def test_block_is_unlinked_once_attached(fake_data_source: DataSource) -> None:
+    frame = to_shared_memory(fake_data_source.load_to_dataframe("AAPL"))
+    from_shared_memory(frame)
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(frame.block_name)
+
+
+def test_released_block_can_not_be_attached(fake_data_source: DataSource) -> None:
+    frame = to_shared_memory(fake_data_source.load_to_dataframe("AAPL").iloc[:0])
+    release_shared_memory(frame)
+    release_shared_memory(frame)
+    with pytest.raises(FileNotFoundError):
+        from_shared_memory(frame)
+
+
+def test_block_attached_without_unlinking_is_shared_read_only(fake_data_source: DataSource) -> None:
+    frame = to_shared_memory(fake_data_source.load_to_dataframe("AAPL"))
+    try:
+        first = from_shared_memory(frame, unlink=False)
+        second = from_shared_memory(frame, unlink=False)
+        pd.testing.assert_frame_equal(first, second)
+        with pytest.raises(ValueError):
+            first["Close"].to_numpy()[0] = 0.0
+    finally:
+        release_shared_memory(frame)
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(frame.block_name)
@@ -1,13 +1,33 @@
-from typing import Any, Self, cast
+import contextlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Self
 
+from stock_trader.acquisition.data_sources.alpha_vantage_client import ALPHA_VANTAGE_URL, AlphaVantageClient
 from stock_trader.acquisition.data_sources.data_source import DataSource, TickerNotFoundError
-import requests
+from stock_trader.utils.date_range import DateRange
 import pandas as pd
 
 
 class AlphaVantageDataSource(DataSource):
-    def __init__(self: Self, api_key: str) -> None:
-        self.__API_KEY = api_key
+    def __init__(
+        self: Self,
+        api_key: str,
+        base_url: str = ALPHA_VANTAGE_URL,
+        client: AlphaVantageClient | None = None,
+    ) -> None:
+        self._client = client or AlphaVantageClient(api_key, base_url)
+
+    async def fetch_async(self: Self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        raw_data = await self._fetch_raw_data_async(ticker)
+        df = self._make_dataframe_from_raw_data(raw_data)
+        df = self.standardize_dataframe(df)
+        return self.trim_to_data_range(date_range, df)
+
+    @contextlib.asynccontextmanager
+    async def async_session(self: Self) -> AsyncIterator[None]:
+        # all requests made inside the context share one connection pool
+        async with self._client.async_session():
+            yield
 
     def standardize_dataframe(self: Self, df: pd.DataFrame) -> pd.DataFrame:
         df.columns = self._rename_columns(df)
@@ -21,18 +41,24 @@ class AlphaVantageDataSource(DataSource):
         df = self._make_dataframe_from_raw_data(raw_data)
         return df
 
+    def load_to_dataframe_since(self: Self, ticker: str, since: datetime) -> pd.DataFrame:
+        # compact output holds the latest 100 bars which is plenty for a daily refresh
+        raw_data = self._fetch_raw_data(ticker, outputsize="compact")
+        return self._make_dataframe_from_raw_data(raw_data)
+
     def _make_dataframe_from_raw_data(self: Self, raw_data: dict[str, Any]) -> pd.DataFrame:
         return pd.DataFrame.from_dict(raw_data["Time Series (Daily)"], orient="index")
 
-    def _fetch_raw_data(self: Self, ticker: str) -> dict[str, Any]:
-        r = requests.get(
-            f"https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={ticker}&apikey={self.__API_KEY}"
-        )
-        raw_data = r.json()
-        # TODO: Handle throttling
+    def _fetch_raw_data(self: Self, ticker: str, **extra_params: str) -> dict[str, Any]:
+        return self._check_raw_data(self._client.get_daily(ticker, **extra_params))
+
+    async def _fetch_raw_data_async(self: Self, ticker: str) -> dict[str, Any]:
+        return self._check_raw_data(await self._client.get_daily_async(ticker))
+
+    def _check_raw_data(self: Self, raw_data: dict[str, Any]) -> dict[str, Any]:
         if "Error Message" in raw_data:
             raise TickerNotFoundError()
-        return cast(dict[str, Any], raw_data)
+        return raw_data
 
     def _convert_columns(self: Self, df: pd.DataFrame) -> None:
         for col in df.columns:
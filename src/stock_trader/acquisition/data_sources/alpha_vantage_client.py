@@ -0,0 +1,213 @@
+import asyncio
+import contextlib
+import json
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Self, cast
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+# Alpha Vantage answers over-quota calls with HTTP 200 and one of these keys instead of the data
+THROTTLE_KEYS = ("Note", "Information")
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# failures of a single attempt worth retrying: dropped connections, timeouts and bodies that are not JSON,
+# e.g. the HTML error page of a proxy - but not hosts that can not be reached at all, see _check_reachable
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.JSONDecodeError)
+RETRYABLE_ASYNC_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError)
+
+
+class AlphaVantageError(Exception):
+    ...
+
+
+class AlphaVantageThrottledError(AlphaVantageError):
+    ...
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at rate_per_minute, holding at most capacity tokens.
+
+    Callers reserve a token up front and are told how long to wait for it, so concurrent threads or tasks
+    queue up in order instead of polling. The bucket is per process - every worker of a process pool
+    gets its own copy.
+    """
+
+    def __init__(
+        self: Self,
+        rate_per_minute: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate_per_second = rate_per_minute / 60.0
+        self._capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self: Self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate_per_second)
+            self._updated = now
+            self._tokens -= 1.0
+            return max(0.0, -self._tokens / self._rate_per_second)
+
+    def acquire(self: Self) -> None:
+        time.sleep(self.reserve())
+
+    async def acquire_async(self: Self) -> None:
+        await asyncio.sleep(self.reserve())
+
+    def __getstate__(self: Self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self: Self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class AlphaVantageClient:
+    """
+    Alpha Vantage HTTP client sharing one pooled connection per host and staying within the key's quota.
+
+    Every attempt takes a token from the limiter first. Throttle payloads, HTTP 429 and 5xx answers are
+    retried with full-jitter exponential backoff and raise AlphaVantageThrottledError once max_retries
+    is exhausted, instead of being handed back as data. Dropped connections, timeouts and bodies that are
+    not JSON are retried the same way and raise AlphaVantageError once exhausted. Any other error status,
+    a host name that does not resolve and a refused connection raise AlphaVantageError right away.
+    """
+
+    def __init__(
+        self: Self,
+        api_key: str,
+        base_url: str = ALPHA_VANTAGE_URL,
+        calls_per_minute: float = 5.0,
+        burst: float = 1.0,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+        pool_size: int = 10,
+    ) -> None:
+        self._api_key = api_key
+        self._base_url = base_url
+        self._limiter = TokenBucket(calls_per_minute, burst)
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_cap = backoff_cap
+        self._pool_size = pool_size
+        self._session: requests.Session | None = None
+        self._async_session: aiohttp.ClientSession | None = None
+
+    def get_daily(self: Self, ticker: str, **extra_params: str) -> dict[str, Any]:
+        params = self._get_query_params(ticker, extra_params)
+        error: Exception | None = None
+        for attempt in range(self._max_retries + 1):
+            self._limiter.acquire()
+            try:
+                r = self._get_session().get(self._base_url, params=params, timeout=30)
+                error = None
+                if r.status_code not in RETRYABLE_STATUSES:
+                    self._check_status(ticker, r.status_code)
+                    raw_data = r.json()
+                    if not self.is_throttled(raw_data):
+                        return cast(dict[str, Any], raw_data)
+            except RETRYABLE_ERRORS as e:
+                self._check_reachable(ticker, e)
+                error = e
+            if attempt < self._max_retries:
+                time.sleep(self._get_backoff_delay(attempt))
+        raise self._get_exhausted_error(ticker, error) from error
+
+    async def get_daily_async(self: Self, ticker: str, **extra_params: str) -> dict[str, Any]:
+        if self._async_session is None:
+            async with self.async_session():
+                return await self.get_daily_async(ticker, **extra_params)
+        params = self._get_query_params(ticker, extra_params)
+        error: Exception | None = None
+        for attempt in range(self._max_retries + 1):
+            await self._limiter.acquire_async()
+            try:
+                async with self._async_session.get(
+                    self._base_url, params=params, timeout=aiohttp.ClientTimeout(total=30)
+                ) as r:
+                    error = None
+                    if r.status not in RETRYABLE_STATUSES:
+                        self._check_status(ticker, r.status)
+                        raw_data = await r.json(content_type=None)
+                        if not self.is_throttled(raw_data):
+                            return cast(dict[str, Any], raw_data)
+            except RETRYABLE_ASYNC_ERRORS as e:
+                self._check_reachable(ticker, e)
+                error = e
+            if attempt < self._max_retries:
+                await asyncio.sleep(self._get_backoff_delay(attempt))
+        raise self._get_exhausted_error(ticker, error) from error
+
+    @contextlib.asynccontextmanager
+    async def async_session(self: Self) -> AsyncIterator[None]:
+        connector = aiohttp.TCPConnector(limit=self._pool_size)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            self._async_session = session
+            try:
+                yield
+            finally:
+                self._async_session = None
+
+    @staticmethod
+    def is_throttled(raw_data: Any) -> bool:
+        return isinstance(raw_data, dict) and "Time Series (Daily)" not in raw_data and any(
+            key in raw_data for key in THROTTLE_KEYS
+        )
+
+    def _get_session(self: Self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    @staticmethod
+    def _check_status(ticker: str, status: int) -> None:
+        # e.g. 401 or 404 from a misconfigured base_url, retrying would not help
+        if status >= 400:
+            raise AlphaVantageError(f"Alpha Vantage answered HTTP {status} to the request for {ticker}")
+
+    @staticmethod
+    def _check_reachable(ticker: str, error: Exception) -> None:
+        # no network or a misconfigured base_url, retrying would only delay the error by the whole backoff
+        if isinstance(error, aiohttp.ClientConnectorError) or (
+            isinstance(error, requests.ConnectionError)
+            and isinstance(getattr(error.args[0] if error.args else None, "reason", None), NewConnectionError)
+        ):
+            raise AlphaVantageError(f"could not connect to Alpha Vantage for {ticker}: {error!r}") from error
+
+    @staticmethod
+    def _get_exhausted_error(ticker: str, error: Exception | None) -> AlphaVantageError:
+        # error is the failure of the last attempt, None when it was throttled
+        if error is None:
+            return AlphaVantageThrottledError(f"Alpha Vantage kept throttling requests for {ticker}")
+        return AlphaVantageError(f"requests to Alpha Vantage for {ticker} kept failing: {error!r}")
+
+    def _get_backoff_delay(self: Self, attempt: int) -> float:
+        return random.uniform(0.0, min(self._backoff_cap, self._backoff_base * 2**attempt))
+
+    def _get_query_params(self: Self, ticker: str, extra_params: dict[str, str]) -> dict[str, str]:
+        return {"function": "TIME_SERIES_DAILY", "symbol": ticker, "apikey": self._api_key, **extra_params}
+
+    def __getstate__(self: Self) -> dict[str, Any]:
+        # sessions are bound to the process (and event loop) that opened them
+        state = self.__dict__.copy()
+        state["_session"] = None
+        state["_async_session"] = None
+        return state
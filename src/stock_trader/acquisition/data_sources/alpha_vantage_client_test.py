@@ -0,0 +1,131 @@
+import asyncio
+import pickle
+import socket
+
+import pytest
+
+from stock_trader.acquisition.data_sources.alpha_vantage_client import (
+    AlphaVantageClient,
+    AlphaVantageError,
+    AlphaVantageThrottledError,
+    TokenBucket,
+)
+from stock_trader.conftest import AlphaVantageStubServer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def client(alpha_vantage_stub: AlphaVantageStubServer) -> AlphaVantageClient:
+    return AlphaVantageClient("key", alpha_vantage_stub.url, calls_per_minute=1e9, max_retries=3, backoff_base=0.001)
+
+
+def test_token_bucket_spaces_reservations_to_match_the_quota() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=5, capacity=1, clock=clock)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(12.0)
+    assert bucket.reserve() == pytest.approx(24.0)
+    clock.now = 60.0
+    assert bucket.reserve() == pytest.approx(0.0)
+
+
+def test_token_bucket_allows_bursts_up_to_capacity() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=60, capacity=3, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.0, pytest.approx(1.0)]
+
+
+def test_throttle_payloads_are_detected() -> None:
+    assert AlphaVantageClient.is_throttled({"Note": "Thank you for using Alpha Vantage!"})
+    assert AlphaVantageClient.is_throttled({"Information": "Our standard API rate limit is 25 requests per day."})
+    assert not AlphaVantageClient.is_throttled({"Error Message": "Invalid API call."})
+    assert not AlphaVantageClient.is_throttled({"Meta Data": {}, "Time Series (Daily)": {}})
+
+
+def test_throttled_requests_are_retried(client: AlphaVantageClient, alpha_vantage_stub: AlphaVantageStubServer) -> None:
+    alpha_vantage_stub.throttled_responses = 2
+    raw_data = client.get_daily("GE")
+    assert "Time Series (Daily)" in raw_data
+    assert len(alpha_vantage_stub.queries) == 3
+
+
+def test_throttled_error_raised_when_retries_exhausted(
+    client: AlphaVantageClient, alpha_vantage_stub: AlphaVantageStubServer
+) -> None:
+    alpha_vantage_stub.throttled_responses = 10
+    with pytest.raises(AlphaVantageThrottledError):
+        client.get_daily("GE")
+    assert len(alpha_vantage_stub.queries) == 4
+
+
+def test_throttled_async_requests_are_retried(
+    client: AlphaVantageClient, alpha_vantage_stub: AlphaVantageStubServer
+) -> None:
+    alpha_vantage_stub.throttled_responses = 2
+    raw_data = asyncio.run(client.get_daily_async("GE", outputsize="compact"))
+    assert "Time Series (Daily)" in raw_data
+    assert alpha_vantage_stub.queries[-1]["outputsize"] == "compact"
+
+
+def test_dropped_connections_and_bodies_that_are_not_json_are_retried(
+    client: AlphaVantageClient, alpha_vantage_stub: AlphaVantageStubServer
+) -> None:
+    alpha_vantage_stub.failures = [(None, ""), (200, "<html>Bad Gateway</html>")]
+    assert "Time Series (Daily)" in client.get_daily("GE")
+    alpha_vantage_stub.failures = [(None, ""), (200, "<html>Bad Gateway</html>")]
+    assert "Time Series (Daily)" in asyncio.run(client.get_daily_async("GE"))
+    assert len(alpha_vantage_stub.queries) == 6
+
+
+def test_error_raised_when_failures_outlast_retries(
+    client: AlphaVantageClient, alpha_vantage_stub: AlphaVantageStubServer
+) -> None:
+    alpha_vantage_stub.failures = [(200, "not json")] * 4
+    with pytest.raises(AlphaVantageError, match="kept failing") as error:
+        client.get_daily("GE")
+    assert not isinstance(error.value, AlphaVantageThrottledError)
+    assert len(alpha_vantage_stub.queries) == 4
+
+
+def test_error_statuses_that_are_not_retryable_raise_right_away(
+    client: AlphaVantageClient, alpha_vantage_stub: AlphaVantageStubServer
+) -> None:
+    alpha_vantage_stub.failures = [(401, '{"message": "unauthorized"}'), (404, "not found")]
+    with pytest.raises(AlphaVantageError, match="HTTP 401"):
+        client.get_daily("GE")
+    with pytest.raises(AlphaVantageError, match="HTTP 404"):
+        asyncio.run(client.get_daily_async("GE"))
+    assert len(alpha_vantage_stub.queries) == 2
+
+
+def test_unreachable_hosts_raise_right_away(monkeypatch: pytest.MonkeyPatch) -> None:
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+    client = AlphaVantageClient("key", f"http://127.0.0.1:{port}/query", calls_per_minute=1e9)
+    monkeypatch.setattr(client, "_get_backoff_delay", lambda attempt: pytest.fail("unreachable hosts are not retried"))
+    with pytest.raises(AlphaVantageError, match="could not connect"):
+        client.get_daily("GE")
+    with pytest.raises(AlphaVantageError, match="could not connect"):
+        asyncio.run(client.get_daily_async("GE"))
+
+
+def test_requests_reuse_pooled_connection(
+    client: AlphaVantageClient, alpha_vantage_stub: AlphaVantageStubServer
+) -> None:
+    for ticker in ["GE", "AAPL", "MSFT", "NVDA"]:
+        client.get_daily(ticker)
+    assert len(alpha_vantage_stub.client_ports) == 1
+
+
+def test_client_can_be_sent_to_worker_processes(client: AlphaVantageClient) -> None:
+    client.get_daily("GE")
+    restored = pickle.loads(pickle.dumps(client))
+    assert "Time Series (Daily)" in restored.get_daily("GE")
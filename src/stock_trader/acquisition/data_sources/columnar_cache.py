@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Self
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarCache:
+    """
+    On-disk cache of standardized OHLC DataFrames stored column by column as raw .npy files.
+
+    Each entry is a folder with one file for the index, one per column and a meta.json. Entries are
+    loaded memory-mapped and only returned when the validity metadata given to load (e.g. size and
+    mtime of the file the entry was built from) equals the one given to store. Loading an entry marks
+    it as recently used, evict drops least recently used entries until the cache fits in a size budget.
+
+    The first evict reads the sizes of all entries from disk, after that they are kept up to date by
+    store, load and invalidate, so that evicting after every store does not list the whole cache again.
+    Entries stored by other processes in the meantime are added to it when they are loaded.
+    """
+
+    _META_FILE = "meta.json"
+    _INDEX_FILE = "index.npy"
+
+    def __init__(self: Self, cache_folder: Path) -> None:
+        self._cache_folder = Path(cache_folder)
+        # sizes of the entries, least recently used first, None until the first evict
+        self._sizes: OrderedDict[str, int] | None = None
+        self._total_size = 0
+
+    def load(self: Self, key: str, validity: dict[str, Any]) -> pd.DataFrame | None:
+        entry = self.load_entry(key)
+        if entry is None or entry[1] != validity:
+            return None
+        return entry[0]
+
+    def load_entry(self: Self, key: str) -> tuple[pd.DataFrame, dict[str, Any]] | None:
+        entry = self._cache_folder / key
+        try:
+            with open(entry / self._META_FILE) as meta_file:
+                meta = json.load(meta_file)
+            index = pd.DatetimeIndex(np.load(entry / self._INDEX_FILE, mmap_mode="r"), name=meta["index_name"])
+            columns = {
+                column: np.load(entry / f"{position}.npy", mmap_mode="r")
+                for position, column in enumerate(meta["columns"])
+            }
+            # the meta file's mtime records when the entry was last used
+            os.utime(entry / self._META_FILE)
+            if self._sizes is not None:
+                if key in self._sizes:
+                    self._sizes.move_to_end(key)
+                else:
+                    self._track(key, self._get_entry_size(entry))
+        except (FileNotFoundError, KeyError, ValueError):
+            # missing, half-replaced or corrupted entries are simply a cache miss
+            return None
+        return pd.DataFrame(columns, index=index, copy=False), meta["validity"]
+
+    def store(self: Self, key: str, df: pd.DataFrame, validity: dict[str, Any]) -> None:
+        self._cache_folder.mkdir(parents=True, exist_ok=True)
+        staging = self._cache_folder / f".{key}.{uuid.uuid4().hex}"
+        staging.mkdir()
+        np.save(staging / self._INDEX_FILE, df.index.to_numpy(dtype="datetime64[ns]"))
+        for position, column in enumerate(df.columns):
+            np.save(staging / f"{position}.npy", df[column].to_numpy())
+        with open(staging / self._META_FILE, "w") as meta_file:
+            json.dump(
+                {"validity": validity, "columns": list(df.columns), "index_name": df.index.name},
+                meta_file,
+            )
+        size = self._get_entry_size(staging) if self._sizes is not None else 0
+        self._replace_entry(staging, self._cache_folder / key)
+        if self._sizes is not None:
+            self._track(key, size)
+
+    def invalidate(self: Self, key: str) -> None:
+        shutil.rmtree(self._cache_folder / key, ignore_errors=True)
+        if self._sizes is not None and key in self._sizes:
+            self._total_size -= self._sizes.pop(key)
+
+    def evict(self: Self, max_bytes: int) -> None:
+        if self._sizes is None:
+            self._sizes = self._read_sizes()
+            self._total_size = sum(self._sizes.values())
+        while self._sizes and self._total_size > max_bytes:
+            self.invalidate(next(iter(self._sizes)))
+
+    def _read_sizes(self: Self) -> OrderedDict[str, int]:
+        entries = []
+        if self._cache_folder.exists():
+            for entry in self._cache_folder.iterdir():
+                if entry.name.startswith("."):
+                    continue  # entries still being stored
+                try:
+                    last_used = (entry / self._META_FILE).stat().st_mtime_ns
+                    size = self._get_entry_size(entry)
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                entries.append((last_used, entry.name, size))
+        return OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    def _track(self: Self, key: str, size: int) -> None:
+        assert self._sizes is not None
+        self._total_size += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._sizes.move_to_end(key)
+
+    def _get_entry_size(self: Self, entry: Path) -> int:
+        return sum(file.stat().st_size for file in entry.iterdir())
+
+    def _replace_entry(self: Self, staging: Path, entry: Path) -> None:
+        self.invalidate(entry.name)
+        try:
+            os.replace(staging, entry)
+        except OSError:
+            # another process stored the same entry in the meantime
+            shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1,91 @@
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_trader.acquisition.data_sources.columnar_cache import ColumnarCache
+from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+from stock_trader.acquisition.data_sources.data_source import DataSource, TickerNotFoundError
+from stock_trader.utils.date_range import DateRange
+
+TEST_DATA = Path(__file__).parent / "test_data"
+DATE_RANGE = DateRange(start=datetime(2007, 11, 9), end=datetime(2017, 11, 9))
+
+
+@pytest.fixture
+def data_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "data"
+    shutil.copytree(TEST_DATA, folder)
+    return folder
+
+
+def test_stored_dataframe_is_loaded_memory_mapped(tmp_path: Path, fake_data_source: DataSource) -> None:
+    cache = ColumnarCache(tmp_path)
+    df = fake_data_source.load_to_dataframe("AAPL")
+    cache.store("aapl", df, {"size": 1})
+    loaded = cache.load("aapl", {"size": 1})
+    assert loaded is not None
+    pd.testing.assert_frame_equal(loaded, df, check_freq=False)
+    assert isinstance(loaded["Open"].to_numpy().base, np.memmap)
+
+
+def test_load_misses_when_validity_differs(tmp_path: Path, fake_data_source: DataSource) -> None:
+    cache = ColumnarCache(tmp_path)
+    cache.store("aapl", fake_data_source.load_to_dataframe("AAPL"), {"size": 1})
+    assert cache.load("aapl", {"size": 2}) is None
+    assert cache.load("ge", {"size": 1}) is None
+
+
+def test_evict_keeps_the_sizes_of_entries_instead_of_listing_the_cache(
+    tmp_path: Path, fake_data_source: DataSource, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ColumnarCache(tmp_path)
+    df = fake_data_source.load_to_dataframe("AAPL")
+    cache.store("aapl", df, {})
+    cache.store("ge", df, {})
+    entry_size = sum(file.stat().st_size for file in (tmp_path / "ge").iterdir())
+    cache.evict(10 * entry_size)
+
+    listed: list[Path] = []
+    iterdir = Path.iterdir
+
+    def recording_iterdir(path: Path) -> Iterator[Path]:
+        listed.append(path)
+        return iterdir(path)
+
+    monkeypatch.setattr(Path, "iterdir", recording_iterdir)
+    assert cache.load_entry("aapl") is not None
+    cache.store("msft", df, {})
+    cache.evict(int(2.5 * entry_size))
+
+    assert tmp_path not in listed
+    assert sorted(entry.name for entry in iterdir(tmp_path)) == ["aapl", "msft"]
+
+
+def test_cached_local_csv_returns_same_data_as_uncached(data_folder: Path, tmp_path: Path) -> None:
+    uncached = LocalCSVDataSource(data_folder)
+    cached = LocalCSVDataSource(data_folder, tmp_path / "cache")
+    expected = uncached.fetch("ge", DATE_RANGE)
+    pd.testing.assert_frame_equal(cached.fetch("ge", DATE_RANGE), expected)  # builds the cache entry
+    pd.testing.assert_frame_equal(cached.fetch("GE", DATE_RANGE), expected)  # served from the cache entry
+    assert (tmp_path / "cache" / "ge" / "meta.json").exists()
+
+
+def test_cache_entry_is_rebuilt_when_source_file_changes(data_folder: Path, tmp_path: Path) -> None:
+    data_source = LocalCSVDataSource(data_folder, tmp_path / "cache")
+    full_length = len(data_source.fetch("ge", DATE_RANGE))
+    source_file = data_folder / "ge.us.txt"
+    lines = source_file.read_text().splitlines(keepends=True)
+    source_file.write_text("".join(lines[:-10]))
+    os.utime(source_file, ns=(0, 0))
+    assert len(data_source.fetch("ge", DATE_RANGE)) < full_length
+
+
+def test_cached_local_csv_raises_TickerNotFound_when_ticker_not_found(data_folder: Path, tmp_path: Path) -> None:
+    with pytest.raises(TickerNotFoundError):
+        LocalCSVDataSource(data_folder, tmp_path / "cache").fetch("nvgasdasda", DATE_RANGE)
@@ -1,9 +1,16 @@
+import asyncio
+import contextlib
 import functools
-from typing import Any, Self
+from datetime import datetime
+from typing import Any, AsyncIterator, Self
 import pandas as pd
 from abc import ABCMeta, abstractmethod
 
 from stock_trader.utils.date_range import DateRange
+from stock_trader.utils.profiling import profiled
+
+# methods timed as profiling stages whichever class defines them, mapped to the position of their ticker
+_PROFILED_METHODS = {"fetch": 1, "fetch_many": None, "standardize_dataframe": 1, "trim_to_data_range": 2}
 
 
 class TickerNotFoundError(Exception):
@@ -18,18 +25,47 @@ class DataSourceMeta(ABCMeta):
 
             @functools.wraps(original_fetch)
             def fetch_wrapper(*args, **kwargs) -> pd.DataFrame:  # type: ignore
-                result = original_fetch(*args, **kwargs)
+                result: pd.DataFrame = original_fetch(*args, **kwargs)
+                _validate_fetch_result(f"{name}.fetch", result)
+                return result
 
-                if not isinstance(result, pd.DataFrame):
-                    raise TypeError(f"{name}.fetch must return a pandas DataFrame")
+            setattr(cls, "fetch", fetch_wrapper)
 
-                required_columns = {"Open", "High", "Low", "Close", "Volume"}
-                if not required_columns.issubset(result.columns):
-                    raise ValueError(f"{name}.fetch must return a DataFrame with columns {required_columns}")
+        if "fetch_async" in attrs and name != "DataSource":
+            original_fetch_async = cls.fetch_async  # type: ignore
 
+            @functools.wraps(original_fetch_async)
+            async def fetch_async_wrapper(*args, **kwargs) -> pd.DataFrame:  # type: ignore
+                result: pd.DataFrame = await original_fetch_async(*args, **kwargs)
+                _validate_fetch_result(f"{name}.fetch_async", result)
                 return result
 
-            setattr(cls, "fetch", fetch_wrapper)
+            setattr(cls, "fetch_async", fetch_async_wrapper)
+
+        if "fetch_many" in attrs and name != "DataSource":
+            original_fetch_many = cls.fetch_many  # type: ignore
+
+            @functools.wraps(original_fetch_many)
+            def fetch_many_wrapper(*args, **kwargs) -> dict[str, pd.DataFrame]:  # type: ignore
+                result: dict[str, pd.DataFrame] = original_fetch_many(*args, **kwargs)
+                for df in result.values():
+                    _validate_fetch_result(f"{name}.fetch_many", df)
+                return result
+
+            setattr(cls, "fetch_many", fetch_many_wrapper)
+
+        for method_name, ticker_arg in _PROFILED_METHODS.items():
+            if method_name in attrs:
+                setattr(cls, method_name, profiled(method_name, ticker_arg)(getattr(cls, method_name)))
+
+
+def _validate_fetch_result(method_name: str, result: Any) -> None:
+    if not isinstance(result, pd.DataFrame):
+        raise TypeError(f"{method_name} must return a pandas DataFrame")
+
+    required_columns = {"Open", "High", "Low", "Close", "Volume"}
+    if not required_columns.issubset(result.columns):
+        raise ValueError(f"{method_name} must return a DataFrame with columns {required_columns}")
 
 
 class DataSource(metaclass=DataSourceMeta):
@@ -38,10 +74,35 @@ class DataSource(metaclass=DataSourceMeta):
         df = self.standardize_dataframe(df)
         return self.trim_to_data_range(date_range, df)
 
+    async def fetch_async(self: Self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        # blocking data sources fall back to running fetch in a worker thread
+        return await asyncio.to_thread(self.fetch, ticker, date_range)
+
+    def fetch_many(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
+        # sources able to download several tickers in one request override this,
+        # tickers without data in the date range are left out of the result
+        result = {}
+        for ticker in tickers:
+            try:
+                result[ticker] = self.fetch(ticker, date_range)
+            except pd.errors.EmptyDataError:
+                continue
+        return result
+
+    @contextlib.asynccontextmanager
+    async def async_session(self: Self) -> AsyncIterator[None]:
+        # sources with native async fetching open their connection pool here
+        yield
+
     @abstractmethod
     def load_to_dataframe(self: Self, ticker: str) -> pd.DataFrame:
         ...
 
+    def load_to_dataframe_since(self: Self, ticker: str, since: datetime) -> pd.DataFrame:
+        # sources that can download just the recent part of the history override this,
+        # the result has to cover at least everything from `since` onwards
+        return self.load_to_dataframe(ticker)
+
     def standardize_dataframe(self: Self, df: pd.DataFrame) -> pd.DataFrame:
         df.dropna(inplace=True)
         df.sort_index(inplace=True)
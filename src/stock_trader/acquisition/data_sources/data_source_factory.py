@@ -2,8 +2,10 @@ from enum import Enum, auto
 from pathlib import Path
 from stock_trader import settings
 from stock_trader.acquisition.data_sources.alpha_vantage import AlphaVantageDataSource
+from stock_trader.acquisition.data_sources.alpha_vantage_client import AlphaVantageClient
 from stock_trader.acquisition.data_sources.data_source import DataSource
 from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+from stock_trader.acquisition.data_sources.refresh_cache import CachingDataSource
 from stock_trader.acquisition.data_sources.yahoo_finance import YFinanceDataSource
 
 
@@ -19,9 +21,22 @@ def data_source_factory(
     data_folder: Path | None = None,
 ) -> DataSource:
     if source == Source.ALPHA_VANTAGE and alpha_vantage_api_key is not None:
-        return AlphaVantageDataSource(alpha_vantage_api_key or settings.APP_SETTINGS.alpha_vantage_api_key)
+        api_key = alpha_vantage_api_key or settings.APP_SETTINGS.alpha_vantage_api_key
+        client = AlphaVantageClient(api_key, calls_per_minute=settings.APP_SETTINGS.alpha_vantage_calls_per_minute)
+        return _with_remote_cache(AlphaVantageDataSource(api_key, client=client))
     elif source == Source.LOCAL:
         return LocalCSVDataSource(data_folder)
     elif source == Source.YFINANCE:
-        return YFinanceDataSource()
+        return _with_remote_cache(YFinanceDataSource())
     raise RuntimeError("invalid parameters to data source factory")
+
+
+def _with_remote_cache(data_source: DataSource) -> DataSource:
+    if settings.APP_SETTINGS.remote_cache_folder is None:
+        return data_source
+    return CachingDataSource(
+        data_source,
+        settings.APP_SETTINGS.remote_cache_folder,
+        ttl=settings.APP_SETTINGS.remote_cache_ttl,
+        max_bytes=settings.APP_SETTINGS.remote_cache_max_bytes,
+    )
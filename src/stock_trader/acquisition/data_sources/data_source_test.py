@@ -1,13 +1,19 @@
+import asyncio
 from datetime import datetime
 from pathlib import Path
+from typing import Self, cast
+import numpy as np
 import pandas as pd
 import pytest
 from stock_trader import settings
+from stock_trader.acquisition.data_sources import yahoo_finance
 from stock_trader.acquisition.data_sources.alpha_vantage import AlphaVantageDataSource
+from stock_trader.acquisition.data_sources.alpha_vantage_client import AlphaVantageClient
 from stock_trader.acquisition.data_sources.data_source import DataSource
 
 from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource, TickerNotFoundError
 from stock_trader.acquisition.data_sources.yahoo_finance import YFinanceDataSource
+from stock_trader.conftest import AlphaVantageStubServer
 from stock_trader.utils.date_range import DateRange
 
 FROZEN_TIME = "2017-11-09"
@@ -43,3 +49,68 @@ def test_returns_maximum_available_range_of_data_when_date_range_larger(
 def test_raises_TickerNotFound_when_ticker_not_found(data_source: DataSource) -> None:
     with pytest.raises(TickerNotFoundError):
         data_source.fetch("nvgasdasda", DateRange.years_back(10))
+
+
+def test_alpha_vantage_fetch_async_returns_same_data_as_fetch(alpha_vantage_stub: AlphaVantageStubServer) -> None:
+    client = AlphaVantageClient("key", alpha_vantage_stub.url, calls_per_minute=1e9)
+    data_source = AlphaVantageDataSource("key", client=client)
+    date_range = DateRange(start=datetime(2023, 9, 1), end=datetime(2023, 9, 20))
+    df = data_source.fetch("ge", date_range)
+    assert len(df) == 14
+    pd.testing.assert_frame_equal(asyncio.run(data_source.fetch_async("ge", date_range)), df)
+    assert alpha_vantage_stub.queries[0] == {"function": "TIME_SERIES_DAILY", "symbol": "ge", "apikey": "key"}
+
+
+def _fake_yf_download(tickers: list[str], **_: object) -> pd.DataFrame:
+    index = pd.date_range("2023-09-01", periods=4, freq="D")
+    frames = {}
+    for ticker in tickers:
+        ticker = ticker.upper()
+        values = np.full(4, np.nan) if ticker.startswith("MISSING") else np.arange(4.0)
+        frames[ticker] = pd.DataFrame(
+            {"Open": values, "High": values, "Low": values, "Close": values, "Volume": values}, index=index
+        )
+    return pd.concat(frames, axis=1)
+
+
+def test_yfinance_fetch_many_downloads_all_tickers_at_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[str]] = []
+
+    def download(tickers: list[str], **kwargs: object) -> pd.DataFrame:
+        calls.append(tickers)
+        return _fake_yf_download(tickers)
+
+    monkeypatch.setattr(yahoo_finance.yf, "download", download)
+    date_range = DateRange(start=datetime(2023, 9, 2), end=datetime(2023, 9, 20))
+    data = YFinanceDataSource().fetch_many(["ge", "aapl"], date_range)
+    assert calls == [["ge", "aapl"]]
+    assert list(data) == ["ge", "aapl"]
+    assert list(data["ge"].columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert list(data["aapl"]["Close"]) == [1.0, 2.0, 3.0]
+
+
+class _FakeYFTicker:
+    def __init__(self: Self, ticker: str) -> None:
+        self._ticker = ticker
+
+    def history(self: Self, **_: object) -> pd.DataFrame:
+        history = cast(pd.DataFrame, _fake_yf_download([self._ticker])[self._ticker.upper()])
+        return history.dropna(how="all")
+
+
+def test_yfinance_fetch_many_leaves_unknown_tickers_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(yahoo_finance.yf, "download", _fake_yf_download)
+    monkeypatch.setattr(yahoo_finance.yf, "Ticker", _FakeYFTicker)
+    data = YFinanceDataSource().fetch_many(["ge", "missing", "aapl"], DateRange.years_back(10))
+    assert list(data) == ["ge", "aapl"]
+
+
+def test_yfinance_fetch_many_downloads_tickers_left_out_of_the_batch_alone(monkeypatch: pytest.MonkeyPatch) -> None:
+    def download(tickers: list[str], **kwargs: object) -> pd.DataFrame:
+        return _fake_yf_download([ticker for ticker in tickers if ticker != "msft"])
+
+    monkeypatch.setattr(yahoo_finance.yf, "download", download)
+    monkeypatch.setattr(yahoo_finance.yf, "Ticker", _FakeYFTicker)
+    data = YFinanceDataSource().fetch_many(["ge", "msft", "aapl"], DateRange.years_back(10))
+    assert list(data) == ["ge", "msft", "aapl"]
+    pd.testing.assert_frame_equal(data["msft"], data["ge"])
@@ -2,20 +2,43 @@ from math import e
 from pathlib import Path
 from typing import Self
 import pandas as pd
+from stock_trader.acquisition.data_sources.columnar_cache import ColumnarCache
 from stock_trader.acquisition.data_sources.data_source import DataSource, TickerNotFoundError
 from stock_trader.settings import APP_SETTINGS
+from stock_trader.utils.date_range import DateRange
 
 
 class LocalCSVDataSource(DataSource):
-    def __init__(self: Self, data_folder: Path | None = None) -> None:
+    def __init__(self: Self, data_folder: Path | None = None, cache_folder: Path | None = None) -> None:
         self._data_folder = data_folder or APP_SETTINGS.source_data_folder
+        cache_folder = cache_folder or APP_SETTINGS.ohlc_cache_folder
+        self._cache = ColumnarCache(cache_folder) if cache_folder is not None else None
+
+    def fetch(self: Self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        if self._cache is None:
+            return super().fetch(ticker, date_range)
+        return self.trim_to_data_range(date_range, self._load_standardized_from_cache(ticker, self._cache))
 
     def load_to_dataframe(self: Self, ticker: str) -> pd.DataFrame:
         try:
-            file_name = f"{ticker.lower()}.us.txt"
-            return pd.read_csv(self._data_folder / file_name, parse_dates=True, index_col=0)
+            return pd.read_csv(self._get_file_path(ticker), parse_dates=True, index_col=0)
+        except FileNotFoundError as e:
+            raise TickerNotFoundError() from e
+
+    def _load_standardized_from_cache(self: Self, ticker: str, cache: ColumnarCache) -> pd.DataFrame:
+        try:
+            stat = self._get_file_path(ticker).stat()
         except FileNotFoundError as e:
             raise TickerNotFoundError() from e
+        validity = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        df = cache.load(ticker.lower(), validity)
+        if df is None:
+            df = self.standardize_dataframe(self.load_to_dataframe(ticker))
+            cache.store(ticker.lower(), df, validity)
+        return df
+
+    def _get_file_path(self: Self, ticker: str) -> Path:
+        return Path(self._data_folder) / f"{ticker.lower()}.us.txt"
 
     def __str__(self) -> str:
         return "LocalCSV"
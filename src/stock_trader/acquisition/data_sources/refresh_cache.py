@@ -0,0 +1,131 @@
+import asyncio
+import contextlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Self
+
+import pandas as pd
+
+from stock_trader.acquisition.data_sources.columnar_cache import ColumnarCache
+from stock_trader.acquisition.data_sources.data_source import DataSource
+from stock_trader.utils.date_range import DateRange
+
+# the widest range a nanosecond resolution DatetimeIndex can represent
+_FULL_HISTORY = DateRange(start=datetime(1678, 1, 1), end=datetime(2262, 1, 1))
+
+
+class CachingDataSource(DataSource):
+    """
+    Keeps the full standardized history of every ticker fetched through a remote data source on disk.
+
+    Histories younger than ttl are served straight from the cache. Older ones are refreshed by
+    downloading only the tail since the last cached bar (load_to_dataframe_since) and appending it.
+    With max_bytes set, least recently used tickers are evicted once the cache grows past it.
+    Tickers not cached yet are downloaded through the native async fetching of the remote source, if
+    it has one, when fetched with fetch_async.
+    """
+
+    def __init__(
+        self: Self,
+        data_source: DataSource,
+        cache_folder: Path,
+        ttl: timedelta = timedelta(hours=12),
+        max_bytes: int | None = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self._data_source = data_source
+        self._cache = ColumnarCache(Path(cache_folder) / str(data_source))
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._clock = clock
+
+    def fetch(self: Self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        return self.trim_to_data_range(date_range, self.load_to_dataframe(ticker))
+
+    async def fetch_async(self: Self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        now = self._clock()
+        entry = self._cache.load_entry(ticker.lower())
+        if entry is None:
+            history = await self._data_source.fetch_async(ticker, _FULL_HISTORY)
+            self._store(ticker, history, now)
+        elif self._is_fresh(entry[1], now):
+            history = entry[0]
+        else:
+            # refreshing the tail has no async counterpart in the remote sources
+            history = await asyncio.to_thread(self._refresh, ticker, entry[0])
+            self._store(ticker, history, now)
+        return self.trim_to_data_range(date_range, history)
+
+    @contextlib.asynccontextmanager
+    async def async_session(self: Self) -> AsyncIterator[None]:
+        async with self._data_source.async_session():
+            yield
+
+    def fetch_many(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
+        # tickers seen for the first time are downloaded in one batch, cached ones are served from their entry
+        now = self._clock()
+        entries = {ticker: self._cache.load_entry(ticker.lower()) for ticker in tickers}
+        uncached = [ticker for ticker, entry in entries.items() if entry is None]
+        downloaded = self._data_source.fetch_many(uncached, _FULL_HISTORY) if uncached else {}
+
+        result = {}
+        for ticker, entry in entries.items():
+            if entry is not None:
+                history = self._get_history(ticker, entry, now)
+            elif ticker in downloaded:
+                history = downloaded[ticker]
+                self._store(ticker, history, now)
+            else:
+                # left out of the batch, the download of the ticker alone raises TickerNotFoundError if it is unknown
+                try:
+                    history = self._get_history(ticker, None, now)
+                except pd.errors.EmptyDataError:
+                    continue
+            result[ticker] = self.trim_to_data_range(date_range, history)
+        return result
+
+    def load_to_dataframe(self: Self, ticker: str) -> pd.DataFrame:
+        return self._get_history(ticker, self._cache.load_entry(ticker.lower()), self._clock())
+
+    def _get_history(
+        self: Self, ticker: str, entry: tuple[pd.DataFrame, dict[str, Any]] | None, now: datetime
+    ) -> pd.DataFrame:
+        # entry is the cached history of the ticker with its validity, loaded once by the caller
+        if entry is None:
+            history = self._download(ticker)
+        else:
+            history, validity = entry
+            if self._is_fresh(validity, now):
+                return history
+            history = self._refresh(ticker, history)
+        self._store(ticker, history, now)
+        return history
+
+    def _is_fresh(self: Self, validity: dict[str, Any], now: datetime) -> bool:
+        return now - datetime.fromisoformat(validity["fetched_at"]) < self._ttl
+
+    def _store(self: Self, ticker: str, history: pd.DataFrame, fetched_at: datetime) -> None:
+        self._cache.store(ticker.lower(), history, {"fetched_at": fetched_at.isoformat()})
+        if self._max_bytes is not None:
+            self._cache.evict(self._max_bytes)
+
+    def _download(self: Self, ticker: str) -> pd.DataFrame:
+        return self._data_source.standardize_dataframe(self._data_source.load_to_dataframe(ticker))
+
+    def _refresh(self: Self, ticker: str, history: pd.DataFrame) -> pd.DataFrame:
+        if len(history) == 0:
+            return self._download(ticker)
+        last_cached = history.index[-1]
+        tail = self._data_source.standardize_dataframe(
+            self._data_source.load_to_dataframe_since(ticker, last_cached.to_pydatetime())
+        )
+        if len(tail) == 0:
+            return history
+        if tail.index[0] > last_cached:
+            # the tail does not reach back to the cached history, so there may be a gap between them
+            return self._download(ticker)
+        # the last cached bar may have been captured mid-session, the fresh download wins
+        return pd.concat([history[history.index < tail.index[0]], tail[list(history.columns)]])
+
+    def __str__(self: Self) -> str:
+        return f"Cached{self._data_source}"
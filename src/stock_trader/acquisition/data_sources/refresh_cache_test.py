@@ -0,0 +1,200 @@
+import asyncio
+import contextlib
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Self
+
+import pandas as pd
+import pytest
+
+from stock_trader.acquisition.data_sources.alpha_vantage import AlphaVantageDataSource
+from stock_trader.acquisition.data_sources.alpha_vantage_client import AlphaVantageClient
+from stock_trader.acquisition.data_sources.columnar_cache import ColumnarCache
+from stock_trader.acquisition.data_sources.data_source import DataSource, TickerNotFoundError
+from stock_trader.acquisition.data_sources.refresh_cache import CachingDataSource
+from stock_trader.conftest import AlphaVantageStubServer
+from stock_trader.utils.date_range import DateRange
+
+ALL_TIME = DateRange(start=datetime(1900, 1, 1), end=datetime(2100, 1, 1))
+
+
+class FakeRemoteDataSource(DataSource):
+    def __init__(self: Self, bars: int) -> None:
+        self.bars = bars
+        self.calls: list[str] = []
+
+    def load_to_dataframe(self: Self, ticker: str) -> pd.DataFrame:
+        self.calls.append("full")
+        return self._make_history()
+
+    def load_to_dataframe_since(self: Self, ticker: str, since: datetime) -> pd.DataFrame:
+        self.calls.append("tail")
+        history = self._make_history()
+        return history[history.index >= since]
+
+    def _make_history(self: Self) -> pd.DataFrame:
+        values = [float(i) for i in range(self.bars)]
+        return pd.DataFrame(
+            {"Open": values, "High": values, "Low": values, "Close": values, "Volume": range(self.bars)},
+            index=pd.date_range("2023-01-02", periods=self.bars, freq="D"),
+        )
+
+    def __str__(self: Self) -> str:
+        return "FakeRemote"
+
+
+class FakeBatchRemoteDataSource(FakeRemoteDataSource):
+    def __init__(self: Self, bars: int, left_out: set[str] | None = None) -> None:
+        super().__init__(bars)
+        self.left_out = left_out or set()
+
+    def load_to_dataframe(self: Self, ticker: str) -> pd.DataFrame:
+        if ticker.startswith("MISSING"):
+            raise TickerNotFoundError()
+        return super().load_to_dataframe(ticker)
+
+    def fetch_many(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
+        self.calls.append(f"batch {','.join(tickers)}")
+        return {
+            ticker: self.trim_to_data_range(date_range, self._make_history())
+            for ticker in tickers
+            if ticker not in self.left_out
+        }
+
+
+class FakeAsyncRemoteDataSource(FakeRemoteDataSource):
+    async def fetch_async(self: Self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        self.calls.append("async")
+        return self.trim_to_data_range(date_range, self._make_history())
+
+    @contextlib.asynccontextmanager
+    async def async_session(self: Self) -> AsyncIterator[None]:
+        self.calls.append("session")
+        yield
+
+
+class FakeClock:
+    def __init__(self: Self) -> None:
+        self.now = datetime(2023, 6, 1)
+
+    def __call__(self: Self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_history_is_served_from_cache_within_ttl(tmp_path: Path, clock: FakeClock) -> None:
+    remote = FakeRemoteDataSource(bars=10)
+    data_source = CachingDataSource(remote, tmp_path, ttl=timedelta(hours=1), clock=clock)
+    first = data_source.fetch("GE", ALL_TIME)
+    clock.now += timedelta(minutes=30)
+    second = data_source.fetch("ge", DateRange(start=datetime(2023, 1, 5), end=datetime(2023, 1, 7)))
+    assert remote.calls == ["full"]
+    assert len(first) == 10
+    assert list(second.index) == list(pd.date_range("2023-01-05", periods=3, freq="D"))
+
+
+def test_only_missing_tail_is_downloaded_after_ttl(tmp_path: Path, clock: FakeClock) -> None:
+    remote = FakeRemoteDataSource(bars=10)
+    data_source = CachingDataSource(remote, tmp_path, ttl=timedelta(hours=1), clock=clock)
+    data_source.fetch("GE", ALL_TIME)
+    remote.bars = 12
+    clock.now += timedelta(days=1)
+    refreshed = data_source.fetch("GE", ALL_TIME)
+    assert remote.calls == ["full", "tail"]
+    pd.testing.assert_frame_equal(refreshed, remote._make_history(), check_freq=False)
+
+
+def test_full_history_is_downloaded_when_tail_leaves_a_gap(tmp_path: Path, clock: FakeClock) -> None:
+    remote = FakeRemoteDataSource(bars=10)
+    data_source = CachingDataSource(remote, tmp_path, ttl=timedelta(hours=1), clock=clock)
+    data_source.fetch("GE", ALL_TIME)
+    remote.load_to_dataframe_since = lambda ticker, since: remote._make_history().iloc[-2:]  # type: ignore
+    remote.bars = 20
+    clock.now += timedelta(days=1)
+    assert len(data_source.fetch("GE", ALL_TIME)) == 20
+    assert remote.calls == ["full", "full"]
+
+
+def test_uncached_tickers_are_downloaded_in_one_batch(tmp_path: Path, clock: FakeClock) -> None:
+    remote = FakeBatchRemoteDataSource(bars=10)
+    data_source = CachingDataSource(remote, tmp_path, clock=clock)
+    data_source.fetch("GE", ALL_TIME)
+    date_range = DateRange(start=datetime(2023, 1, 5), end=datetime(2023, 1, 7))
+    data = data_source.fetch_many(["GE", "AAPL", "MSFT"], date_range)
+    assert remote.calls == ["full", "batch AAPL,MSFT"]
+    assert list(data) == ["GE", "AAPL", "MSFT"]
+    assert all(len(df) == 3 for df in data.values())
+    assert len(data_source.fetch("MSFT", ALL_TIME)) == 10
+    assert remote.calls == ["full", "batch AAPL,MSFT"]
+
+
+def test_cache_entries_are_loaded_once_by_fetch_many(
+    tmp_path: Path, clock: FakeClock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    remote = FakeBatchRemoteDataSource(bars=10)
+    data_source = CachingDataSource(remote, tmp_path, clock=clock)
+    data_source.fetch_many(["GE", "AAPL"], ALL_TIME)
+    loaded: list[str] = []
+    load_entry = ColumnarCache.load_entry
+
+    def recording_load_entry(cache: ColumnarCache, key: str) -> tuple[pd.DataFrame, dict[str, Any]] | None:
+        loaded.append(key)
+        return load_entry(cache, key)
+
+    monkeypatch.setattr(ColumnarCache, "load_entry", recording_load_entry)
+    data = data_source.fetch_many(["GE", "AAPL"], ALL_TIME)
+    assert loaded == ["ge", "aapl"]
+    assert all(len(df) == 10 for df in data.values())
+
+
+def test_tickers_left_out_of_the_batch_are_downloaded_one_by_one(tmp_path: Path, clock: FakeClock) -> None:
+    remote = FakeBatchRemoteDataSource(bars=10, left_out={"AAPL", "MISSING"})
+    data_source = CachingDataSource(remote, tmp_path, clock=clock)
+    data = data_source.fetch_many(["GE", "AAPL"], ALL_TIME)
+    assert remote.calls == ["batch GE,AAPL", "full"]
+    assert list(data) == ["GE", "AAPL"]
+    assert len(data_source.fetch("AAPL", ALL_TIME)) == 10
+    with pytest.raises(TickerNotFoundError):
+        data_source.fetch_many(["GE", "MISSING"], ALL_TIME)
+
+
+def test_least_recently_used_tickers_are_evicted(tmp_path: Path, clock: FakeClock) -> None:
+    remote = FakeRemoteDataSource(bars=10)
+    data_source = CachingDataSource(remote, tmp_path, clock=clock)
+    data_source.fetch("GE", ALL_TIME)
+    entry_size = sum(file.stat().st_size for file in (tmp_path / "FakeRemote" / "ge").iterdir())
+    os.utime(tmp_path / "FakeRemote" / "ge" / "meta.json", (0, 0))
+
+    data_source = CachingDataSource(remote, tmp_path, max_bytes=int(entry_size * 1.5), clock=clock)
+    data_source.fetch("AAPL", ALL_TIME)
+    assert not (tmp_path / "FakeRemote" / "ge").exists()
+    assert (tmp_path / "FakeRemote" / "aapl").exists()
+
+
+def test_async_fetching_of_the_remote_source_is_used(tmp_path: Path, clock: FakeClock) -> None:
+    remote = FakeAsyncRemoteDataSource(bars=10)
+    data_source = CachingDataSource(remote, tmp_path, ttl=timedelta(hours=1), clock=clock)
+
+    async def fetch_twice() -> list[pd.DataFrame]:
+        async with data_source.async_session():
+            return [await data_source.fetch_async("GE", ALL_TIME) for _ in range(2)]
+
+    first, second = asyncio.run(fetch_twice())
+    assert remote.calls == ["session", "async"]
+    pd.testing.assert_frame_equal(second, remote._make_history(), check_freq=False)
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+
+def test_alpha_vantage_refresh_uses_compact_output(tmp_path: Path, alpha_vantage_stub: AlphaVantageStubServer) -> None:
+    client = AlphaVantageClient("key", alpha_vantage_stub.url, calls_per_minute=1e9)
+    data_source = CachingDataSource(AlphaVantageDataSource("key", client=client), tmp_path, ttl=timedelta(0))
+    data_source.fetch("GE", ALL_TIME)
+    refreshed = data_source.fetch("GE", ALL_TIME)
+    assert "outputsize" not in alpha_vantage_stub.queries[0]
+    assert alpha_vantage_stub.queries[1]["outputsize"] == "compact"
+    assert len(refreshed) == 30
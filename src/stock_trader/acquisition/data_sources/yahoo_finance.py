@@ -1,16 +1,53 @@
+import contextlib
+import threading
+from datetime import datetime
 from typing import Self, cast
 import pandas as pd
 import yfinance as yf
 from stock_trader.acquisition.data_sources.data_source import DataSource, TickerNotFoundError
+from stock_trader.utils.date_range import DateRange
+
+# yf.download collects its results in module level state, so only one batch can be in flight per process
+_DOWNLOAD_LOCK = threading.Lock()
 
 
 class YFinanceDataSource(DataSource):
+    def fetch_many(self: Self, tickers: list[str], date_range: DateRange) -> dict[str, pd.DataFrame]:
+        if len(tickers) < 2:
+            return super().fetch_many(tickers, date_range)
+        with _DOWNLOAD_LOCK:
+            downloaded = yf.download(
+                tickers, period="max", group_by="ticker", auto_adjust=True, progress=False, threads=True
+            )
+        result = {}
+        for ticker in tickers:
+            try:
+                # yfinance upper-cases symbols and leaves all-NaN columns for the ones it could not find
+                df = self._check_history(downloaded[ticker.upper()].dropna(how="all").copy())
+            except (KeyError, TickerNotFoundError):
+                # symbols missing from the batch are downloaded alone, unknown ones are left out of the result
+                # instead of failing the rest of the batch
+                with contextlib.suppress(TickerNotFoundError):
+                    result.update(super().fetch_many([ticker], date_range))
+                continue
+            df = self.standardize_dataframe(df)
+            result[ticker] = self.trim_to_data_range(date_range, df)
+        return result
+
     def load_to_dataframe(
         self: Self,
         ticker: str,
     ) -> pd.DataFrame:
         stock = yf.Ticker(ticker)
         df = stock.history(period="max")
+        return self._check_history(df)
+
+    def load_to_dataframe_since(self: Self, ticker: str, since: datetime) -> pd.DataFrame:
+        stock = yf.Ticker(ticker)
+        df = stock.history(start=since)
+        return self._check_history(df)
+
+    def _check_history(self: Self, df: pd.DataFrame) -> pd.DataFrame:
         if len(df) == 0:
             raise TickerNotFoundError()
         df.index = self._convert_index(df)
@@ -19,6 +56,9 @@ class YFinanceDataSource(DataSource):
     def _convert_index(self: Self, df: pd.DataFrame) -> pd.DatetimeIndex:
         # tz_convert(None) removes the timezone information from the index
         # df has DatetimeIndex so we can use tz_convert method
+        # batch downloads already come with a timezone naive index
+        if df.index.tz is None:  # type: ignore
+            return cast(pd.DatetimeIndex, df.index)
         return df.index.tz_convert(None)  # type: ignore
 
     def __str__(self: Self) -> str:
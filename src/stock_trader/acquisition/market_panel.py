@@ -0,0 +1,108 @@
+from typing import Iterable, Iterator, Mapping, Self
+
+import numpy as np
+import pandas as pd
+
+OHLCV_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class MarketPanel:
+    """
+    OHLCV data of many tickers held in one contiguous float64 array of shape fields x dates x tickers.
+
+    All tickers share one sorted date axis, bars a ticker does not have on a date are NaN and marked
+    as missing in the mask. Every field is a contiguous dates x tickers matrix, so cross-sectional
+    computations run over whole universes at once, while frame() gives the per-ticker DataFrames
+    the rest of the code works with.
+    """
+
+    def __init__(
+        self: Self,
+        values: np.ndarray,
+        dates: pd.DatetimeIndex,
+        tickers: list[str],
+        fields: tuple[str, ...] = OHLCV_FIELDS,
+    ) -> None:
+        if values.shape != (len(fields), len(dates), len(tickers)):
+            raise ValueError(
+                f"values of shape {values.shape} do not match {len(fields)} fields, "
+                f"{len(dates)} dates and {len(tickers)} tickers"
+            )
+        self._values = values
+        self._dates = dates
+        self._tickers = list(tickers)
+        self._fields = tuple(fields)
+        self._ticker_positions = {ticker: i for i, ticker in enumerate(self._tickers)}
+        self._field_positions = {field: i for i, field in enumerate(self._fields)}
+        # a bar is present when none of its fields is missing
+        self._mask: np.ndarray = ~np.isnan(values).any(axis=0)
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame] | Iterable[tuple[str, pd.DataFrame]],
+        fields: tuple[str, ...] = OHLCV_FIELDS,
+    ) -> Self:
+        items = list(frames.items() if isinstance(frames, Mapping) else frames)
+        tickers = [ticker for ticker, _ in items]
+        if len(items) == 0:
+            dates = pd.DatetimeIndex([], dtype="datetime64[ns]")
+        else:
+            all_dates = np.concatenate([df.index.to_numpy("datetime64[ns]") for _, df in items])
+            dates = pd.DatetimeIndex(np.unique(all_dates))
+        values = np.full((len(fields), len(dates), len(tickers)), np.nan)
+        for i, (_, df) in enumerate(items):
+            rows = dates.searchsorted(df.index)
+            values[:, rows, i] = df[list(fields)].to_numpy(dtype=np.float64).T
+        return cls(values, dates, tickers, fields)
+
+    @property
+    def values(self: Self) -> np.ndarray:
+        return self._values
+
+    @property
+    def dates(self: Self) -> pd.DatetimeIndex:
+        return self._dates
+
+    @property
+    def tickers(self: Self) -> list[str]:
+        return self._tickers
+
+    @property
+    def fields(self: Self) -> tuple[str, ...]:
+        return self._fields
+
+    @property
+    def mask(self: Self) -> np.ndarray:
+        # dates x tickers, True where the ticker has a bar
+        return self._mask
+
+    def field(self: Self, name: str) -> np.ndarray:
+        # dates x tickers view of one field
+        values: np.ndarray = self._values[self._field_positions[name]]
+        return values
+
+    def frame(self: Self, ticker: str) -> pd.DataFrame:
+        """
+        Bars of a single ticker with the fields as columns.
+
+        When the ticker has no gaps between its first and last bar, which is the usual case,
+        the frame is a view of the panel and no data is copied.
+        """
+        position = self._ticker_positions[ticker]
+        rows = np.flatnonzero(self._mask[:, position])
+        if len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows):
+            rows = slice(rows[0], rows[-1] + 1)  # type: ignore
+        # with copy=False pandas keeps the fields x dates slice as the frame's single block
+        values = self._values[:, rows, position]
+        return pd.DataFrame(values.T, index=self._dates[rows], columns=list(self._fields), copy=False)
+
+    def frames(self: Self) -> Iterator[tuple[str, pd.DataFrame]]:
+        for ticker in self._tickers:
+            yield ticker, self.frame(ticker)
+
+    def __contains__(self: Self, ticker: object) -> bool:
+        return ticker in self._ticker_positions
+
+    def __len__(self: Self) -> int:
+        return len(self._tickers)
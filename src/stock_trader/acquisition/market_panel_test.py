@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_trader.acquisition.data_loaders.data_loader import SingleThreadedDataLoader
+from stock_trader.acquisition.data_sources.data_source import DataSource
+from stock_trader.acquisition.market_panel import MarketPanel
+from stock_trader.utils.date_range import DateRange
+
+
+def _make_frame(start: str, periods: int, first_value: float) -> pd.DataFrame:
+    values = np.arange(periods, dtype=np.float64) + first_value
+    return pd.DataFrame(
+        {"Open": values, "High": values, "Low": values, "Close": values, "Volume": values * 100},
+        index=pd.date_range(start, periods=periods, freq="D"),
+    )
+
+
+@pytest.fixture
+def panel() -> MarketPanel:
+    return MarketPanel.from_frames(
+        {"OLD": _make_frame("2023-01-01", 5, 1.0), "NEW": _make_frame("2023-01-03", 5, 10.0)}
+    )
+
+
+def test_tickers_share_one_aligned_date_axis(panel: MarketPanel) -> None:
+    assert panel.values.shape == (5, 7, 2)
+    assert panel.values.flags.c_contiguous
+    assert list(panel.dates) == list(pd.date_range("2023-01-01", periods=7, freq="D"))
+    assert panel.tickers == ["OLD", "NEW"]
+    close = panel.field("Close")
+    np.testing.assert_array_equal(close[:, 0], [1, 2, 3, 4, 5, np.nan, np.nan])
+    np.testing.assert_array_equal(close[:, 1], [np.nan, np.nan, 10, 11, 12, 13, 14])
+    np.testing.assert_array_equal(panel.mask[:, 1], [False, False, True, True, True, True, True])
+
+
+def test_frame_is_a_view_with_only_the_ticker_bars(panel: MarketPanel) -> None:
+    frame = panel.frame("NEW")
+    pd.testing.assert_frame_equal(frame, _make_frame("2023-01-03", 5, 10.0), check_freq=False)
+    assert np.shares_memory(frame["Close"].to_numpy(), panel.values)
+
+
+def test_frame_with_gaps_skips_missing_bars() -> None:
+    gappy = _make_frame("2023-01-01", 5, 1.0).drop(pd.Timestamp("2023-01-03"))
+    panel = MarketPanel.from_frames({"GAPPY": gappy, "FULL": _make_frame("2023-01-01", 5, 1.0)})
+    pd.testing.assert_frame_equal(panel.frame("GAPPY"), gappy)
+
+
+def test_values_must_match_axes() -> None:
+    with pytest.raises(ValueError):
+        MarketPanel(np.zeros((5, 3, 2)), pd.date_range("2023-01-01", periods=3), ["ONLY"])
+
+
+def test_data_loader_loads_panel(fake_data_source: DataSource) -> None:
+    panel = SingleThreadedDataLoader(fake_data_source).load_panel(["AAPL", "GE"], DateRange.days_back(3))
+    assert panel.tickers == ["AAPL", "GE"]
+    assert "GE" in panel and "MSFT" not in panel
+    assert len(panel.dates) == 5
+    assert panel.mask.all()
@@ -0,0 +1,44 @@
+import json
+from datetime import datetime
+from typing import Any
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+import click
+
+
+def run_on_server(server_url: str, command: str, params: dict[str, Any], state: dict[str, Any]) -> str:
+    """
+    Run a command in the process started with `stock-trader serve` instead of this one.
+
+    Args:
+    - server_url (str): Address the server listens on, e.g. http://127.0.0.1:8765.
+    - command (str): Name of the CLI command.
+    - params (dict): Already parsed and validated parameters of the command.
+    - state (dict): Options given to the CLI group: data source, API key, tickers and dates.
+
+    Returns:
+    - Everything the command printed, a ClickException is raised when it failed on the server
+    """
+    body = {
+        "command": command,
+        "params": params,
+        "state": {key: value.isoformat() if isinstance(value, datetime) else value for key, value in state.items()},
+    }
+    request = Request(
+        server_url.rstrip("/") + "/run",
+        data=json.dumps(body).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urlopen(request) as response:
+            result = json.load(response)
+    except HTTPError as error:
+        result = json.load(error)
+    except URLError as error:
+        raise click.ClickException(f"cannot reach the server at {server_url}: {error.reason}")
+    if "error" in result:
+        click.echo(result.get("output", ""), nl=False)
+        raise click.ClickException(result["error"])
+    return str(result["output"])
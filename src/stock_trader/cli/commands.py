@@ -1,22 +1,117 @@
+import functools
 from datetime import datetime
 import click
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
 
-from stock_trader.acquisition.data_sources.data_source_factory import Source, data_source_factory
-from stock_trader.acquisition.data_loaders.data_loader_factory import data_loader_factory
-from stock_trader.reporting.visualizer_factory import visualizer_factory
-from stock_trader.utils.date_range import DateRange
-from stock_trader.workflows.backtesting import BacktestingWorkflow
-from stock_trader.trading_algorithms.factory import indicator_factory, signal_factory
-from stock_trader.workflows.plotting import PlottingWorkflow
+# everything below pulls in pandas, matplotlib or the data source clients, so it is imported only by the
+# commands that need it, and --help or a mistyped option do not pay for it
+if TYPE_CHECKING:
+    from stock_trader.acquisition.data_loaders.data_loader import DataLoader
+    from stock_trader.utils.date_range import DateRange
+
+# kept in sync with stock_trader.workflows.optimization.METRICS
+_OPTIMIZATION_METRICS = ["sharpe_ratio", "annualized_return", "max_drawdown"]
+# options of the group a command forwarded to the server needs there
+_SERVER_STATE = ("data_source", "alpha_vantage_api_key", "tickers", "start", "end", "last")
+
+
+def create_data_loader(data_source: str, alpha_vantage_api_key: str | None) -> "DataLoader":
+    from stock_trader.acquisition.data_loaders.data_loader_factory import data_loader_factory
+    from stock_trader.acquisition.data_sources.data_source_factory import Source, data_source_factory
+
+    if data_source == "alpha_vantage":
+        data_src = data_source_factory(Source.ALPHA_VANTAGE, alpha_vantage_api_key=alpha_vantage_api_key)
+    elif data_source == "local":
+        data_src = data_source_factory(Source.LOCAL)
+    else:
+        data_src = data_source_factory(Source.YFINANCE)
+    return data_loader_factory(data_src)
+
+
+def _get_data_loader(ctx: click.Context) -> "DataLoader":
+    if "data_loader" not in ctx.obj:
+        ctx.obj["data_loader"] = create_data_loader(ctx.obj["data_source"], ctx.obj["alpha_vantage_api_key"])
+    data_loader: "DataLoader" = ctx.obj["data_loader"]
+    return data_loader
+
+
+def _get_date_range(ctx: click.Context) -> "DateRange":
+    if "date_range" not in ctx.obj:
+        from stock_trader.utils.date_range import DateRange
+
+        start, end, last = ctx.obj["start"], ctx.obj["end"], ctx.obj["last"]
+        ctx.obj["date_range"] = DateRange(start=start, end=end) if not last else DateRange.from_last(last)
+    date_range: "DateRange" = ctx.obj["date_range"]
+    return date_range
+
+
+def _forwarded_to_server(command: Callable[..., None]) -> Callable[..., None]:
+    # with --server the command runs in the `serve` process, which keeps data and indicators between runs
+    @functools.wraps(command)
+    def forward_or_run(ctx: click.Context, **params: Any) -> None:
+        if ctx.obj.get("server") is None:
+            return command(ctx, **params)
+        from stock_trader.cli.client import run_on_server
+
+        state = {key: ctx.obj[key] for key in _SERVER_STATE}
+        click.echo(run_on_server(ctx.obj["server"], str(ctx.command.name), ctx.params, state), nl=False)
+
+    return forward_or_run
+
+
+def _profile(ctx: click.Context, trace_file: Path | None) -> None:
+    from stock_trader.utils.profiling import start_profiling, stop_profiling
+
+    start_profiling()
+
+    def report() -> None:
+        from stock_trader.settings import APP_SETTINGS
+
+        profiler = stop_profiling()
+        assert profiler is not None
+        click.echo(profiler.format_summary())
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        path = trace_file or Path(APP_SETTINGS.report_output_path) / f"trace_{timestamp}.json"
+        profiler.write_chrome_trace(path)
+        click.echo(f"Trace saved to {path}")
+
+    # runs once the command is done, whether it succeeded or not
+    ctx.call_on_close(report)
+
+
+def _validate_signal_name(ctx: click.Context, param: click.Parameter, value: str) -> str:
+    from stock_trader.trading_algorithms.factory import signal_factory
+
+    try:
+        signal_factory(value)
+    except (KeyError, ValueError):
+        raise click.BadParameter(
+            f"{value} is not a signal, expected e.g. MovingAverageCrossover_5_200, RSI_14_30_70 or MACD_12_26_9"
+        )
+    return value
+
+
+def _validate_indicator_name(ctx: click.Context, param: click.Parameter, value: str) -> str:
+    if value.upper() == "RAW":
+        return value
+    from stock_trader.trading_algorithms.factory import indicator_factory
+
+    try:
+        indicator_factory(value)
+    except (KeyError, ValueError):
+        raise click.BadParameter(
+            f"{value} is not an indicator, expected RAW or e.g. SMA_200, EMA_5, RSI_14 or MACD_12_26_9"
+        )
+    return value
 
 
 @click.command()
 @click.option(
     "--signal-name",
-    help="signal to use for trading",
+    help="signal to use for trading, optionally followed by its parameters, e.g. MovingAverageCrossover_5_200",
     prompt=True,
-    type=click.Choice(["MovingAverageCrossover", "RSI", "MACD"], case_sensitive=False),
+    callback=_validate_signal_name,
 )
 @click.option(
     "--initial-lump-sum",
@@ -24,57 +119,246 @@ from stock_trader.workflows.plotting import PlottingWorkflow
     type=click.FLOAT,
     prompt=True,
 )
+@click.option(
+    "--vectorized/--no-vectorized",
+    help="simulate trades with array operations instead of iterating over every bar",
+    default=False,
+)
+@click.option(
+    "--portfolio/--no-portfolio",
+    help="trade all tickers from one shared cash balance instead of giving each ticker its own lump sum",
+    default=False,
+)
 @click.pass_context
-def backtest(ctx: click.Context, signal_name: str, initial_lump_sum: float) -> None:
+@_forwarded_to_server
+def backtest(ctx: click.Context, signal_name: str, initial_lump_sum: float, vectorized: bool, portfolio: bool) -> None:
+    from stock_trader.simulation.simulator import TradingSimulator, VectorizedTradingSimulator
+    from stock_trader.trading_algorithms.factory import signal_factory
+    from stock_trader.workflows.backtesting import BacktestingWorkflow
+
     signal = signal_factory(signal_name)
-    workflow = BacktestingWorkflow(ctx.obj["tickers"], ctx.obj["data_loader"], signal)
-    workflow.backtest(ctx.obj["date_range"], initial_lump_sum)
+    simulator_cls = VectorizedTradingSimulator if vectorized else TradingSimulator
+    workflow = BacktestingWorkflow(ctx.obj["tickers"], _get_data_loader(ctx), signal, simulator_cls)
+    if portfolio:
+        workflow.backtest_portfolio(_get_date_range(ctx), initial_lump_sum)
+    else:
+        workflow.backtest(_get_date_range(ctx), initial_lump_sum)
 
 @click.command()
 @click.pass_context
+@_forwarded_to_server
 def demo_backtest(ctx: click.Context) -> None:
+    from stock_trader.trading_algorithms.factory import signal_factory
+    from stock_trader.workflows.backtesting import BacktestingWorkflow
+
     signal = signal_factory("RSI")
-    workflow = BacktestingWorkflow(ctx.obj["tickers"], ctx.obj["data_loader"], signal)
-    workflow.backtest(ctx.obj["date_range"], 1000000)
+    workflow = BacktestingWorkflow(ctx.obj["tickers"], _get_data_loader(ctx), signal)
+    workflow.backtest(_get_date_range(ctx), 1000000)
 
 @click.command()
 @click.option(
     "--indicator-name",
-    help="indicator to plot",
+    help="indicator to plot, e.g. RAW, SMA_50 or MACD_12_26_9",
     prompt=True,
-    type=click.Choice(
-        ["RAW", "MACD", "RSI_14", "EMA_5", "SMA_200"],
-        case_sensitive=False,
-    ),
+    callback=_validate_indicator_name,
 )
 @click.pass_context
+@_forwarded_to_server
 def plot(ctx: click.Context, indicator_name: str) -> None:
-    workflow = PlottingWorkflow(
-        ctx.obj["tickers"],
-        ctx.obj["data_loader"],
-        visualizer_factory(),
-        indicator_factory,
-    )
-    workflow.plot(indicator_name, ctx.obj["date_range"])
+    _plot(ctx, indicator_name)
 
 @click.command()
 @click.pass_context
+@_forwarded_to_server
 def demo_plot(ctx: click.Context) -> None:
+    _plot(ctx, "RSI_14")
+
+
+def _plot(ctx: click.Context, indicator_name: str) -> None:
+    from stock_trader.reporting.visualizer_factory import visualizer_factory
+    from stock_trader.trading_algorithms.factory import indicator_factory
+    from stock_trader.workflows.plotting import PlottingWorkflow
+
     workflow = PlottingWorkflow(
         ctx.obj["tickers"],
-        ctx.obj["data_loader"],
+        _get_data_loader(ctx),
         visualizer_factory(),
         indicator_factory,
     )
-    workflow.plot("RSI_14", ctx.obj["date_range"])
+    workflow.plot(indicator_name, _get_date_range(ctx))
+
+
+def _parse_parameter_values(ctx: click.Context, param: click.Parameter, value: tuple[str, ...]) -> list[list[int]]:
+    parameter_values = []
+    for values in value:
+        try:
+            if ":" in values:
+                start, stop, *step = (int(bound) for bound in values.split(":"))
+                parameter_values.append(list(range(start, stop + 1, step[0] if step else 1)))
+            else:
+                parameter_values.append([int(parameter) for parameter in values.split(",")])
+        except ValueError:
+            raise click.BadParameter(f"{values} is neither start:stop[:step] nor a comma separated list of integers")
+    return parameter_values
+
+
+@click.command()
+@click.option(
+    "--signal-kind",
+    help="signal whose parameters are optimized",
+    prompt=True,
+    type=click.Choice(["MovingAverageCrossover", "RSI", "MACD"], case_sensitive=False),
+)
+@click.option(
+    "--param",
+    "parameter_values",
+    help="values of the next signal parameter as start:stop[:step] with stop included or as a comma separated list, "
+    "e.g. --param 5:50:5 --param 100,150,200 for MovingAverageCrossover",
+    multiple=True,
+    required=True,
+    callback=_parse_parameter_values,
+)
+@click.option("--metric", help="score to maximize", type=click.Choice(_OPTIMIZATION_METRICS), default="sharpe_ratio")
+@click.option("--initial-lump-sum", help="initial investment sum in USD", type=click.FLOAT, default=10000.0)
+@click.option("--workers", help="number of worker processes", type=click.IntRange(min=1), default=4)
+@click.option(
+    "--halving-rate",
+    help="keep the best 1/rate of configurations after every round, 1 evaluates all of them on every ticker",
+    type=click.IntRange(min=1),
+    default=3,
+)
+@click.option("--top", help="number of best configurations to print", type=click.IntRange(min=1), default=10)
+@click.pass_context
+@_forwarded_to_server
+def optimize(
+    ctx: click.Context,
+    signal_kind: str,
+    parameter_values: list[list[int]],
+    metric: str,
+    initial_lump_sum: float,
+    workers: int,
+    halving_rate: int,
+    top: int,
+) -> None:
+    from stock_trader.trading_algorithms.factory import signal_factory
+    from stock_trader.workflows.optimization import OptimizationWorkflow, parameter_grid
+
+    signal_names = parameter_grid(signal_kind, parameter_values)
+    try:
+        # every name of the grid has the same number of parameters, checking one of them is enough
+        signal_factory(signal_names[0], cached=False)
+    except (IndexError, ValueError):
+        raise click.BadParameter(
+            f"the grid of {signal_kind} parameters is empty or has a wrong number of them", param_hint="--param"
+        )
+    workflow = OptimizationWorkflow(ctx.obj["tickers"], _get_data_loader(ctx), metric, workers, halving_rate)
+    results = workflow.optimize(signal_names, _get_date_range(ctx), initial_lump_sum)
+    workflow.print_results(results, top)
+
+
+@click.command()
+@click.option(
+    "--signal-name",
+    help="signal to screen the tickers with, optionally followed by its parameters, e.g. RSI_14_30_70",
+    prompt=True,
+    callback=_validate_signal_name,
+)
+@click.pass_context
+@_forwarded_to_server
+def screen(ctx: click.Context, signal_name: str) -> None:
+    from stock_trader.trading_algorithms.factory import signal_factory
+    from stock_trader.workflows.screening import ScreeningWorkflow
+
+    workflow = ScreeningWorkflow(ctx.obj["tickers"], _get_data_loader(ctx), signal_factory(signal_name))
+    workflow.screen(_get_date_range(ctx))
+
+
+@click.command()
+@click.argument("job_file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--workers", help="number of worker processes", type=click.IntRange(min=1), default=4)
+@click.option(
+    "--output",
+    help="CSV file for the results table, batch_results_<timestamp>.csv in the report folder by default",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+)
+@click.pass_context
+def run_batch(ctx: click.Context, job_file: Path, workers: int, output: Path | None) -> None:
+    """
+    Run the backtest and plot jobs of a TOML or YAML JOB_FILE over data loaded once for all of them.
+
+    Tickers and dates not given by a job are taken from the ticker list file and the date options.
+    """
+    import pandas as pd
+
+    from stock_trader.reporting.visualizer_factory import visualizer_factory
+    from stock_trader.workflows.batch import BatchWorkflow, load_jobs, save_results
+
+    try:
+        jobs = load_jobs(job_file, ctx.obj["tickers"], _get_date_range(ctx))
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="JOB_FILE")
+    results = BatchWorkflow(jobs, _get_data_loader(ctx), visualizer_factory(), num_workers=workers).run()
+    with pd.option_context("display.width", None, "display.max_rows", None):
+        print(results.to_string(index=False))
+    save_results(results, output)
+
+
+@click.command()
+@click.option("--host", help="loopback address to listen on", default="127.0.0.1")
+@click.option("--port", help="port to listen on", type=click.IntRange(min=0, max=65535), default=8765)
+@click.option(
+    "--cache-max-bytes",
+    help="memory the loaded data of one data source may take before the least recently used is dropped",
+    type=click.IntRange(min=0),
+    default=1 << 30,
+    show_default=True,
+)
+@click.option(
+    "--cache-ttl",
+    help="minutes after which loaded data is loaded again",
+    type=click.FloatRange(min=0),
+    default=15.0,
+    show_default=True,
+)
+def serve(host: str, port: int, cache_max_bytes: int, cache_ttl: float) -> None:
+    """
+    Keep data and indicators in memory and run the commands of clients started with --server.
+
+    POST /refresh to the server drops all loaded data.
+    """
+    from datetime import timedelta
+
+    from stock_trader.cli.server import TradingServer
+
+    try:
+        server = TradingServer(host, port, cache_max_bytes, timedelta(minutes=cache_ttl))
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--host")
+    with server:
+        click.echo(f"Serving on {server.url}, pass --server={server.url} or set STOCK_TRADER_SERVER to use it")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+_DATA_SOURCES = click.Choice(["local", "yfinance", "alpha_vantage"], case_sensitive=False)
+_TICKER_LIST_FILE = click.Path(
+    exists=True,
+    resolve_path=True,
+    file_okay=True,
+    dir_okay=False,
+    allow_dash=True,
+    readable=True,
+    path_type=Path,
+)
 
 
 @click.group()
 @click.option(
     "--data-source",
-    help="source for OHLC data",
-    prompt=True,
-    type=click.Choice(["local", "yfinance", "alpha_vantage"], case_sensitive=False),
+    help="[required]: source for OHLC data",
+    type=_DATA_SOURCES,
 )
 @click.option(
     "--alpha-vantage-api-key",
@@ -85,16 +369,7 @@ def demo_plot(ctx: click.Context) -> None:
 @click.option(
     "--ticker-list-file",
     help="[required]: file containing ticker list in new lines that the application should be processing",
-    prompt=True,
-    type=click.Path(
-        exists=True,
-        resolve_path=True,
-        file_okay=True,
-        dir_okay=False,
-        allow_dash=True,
-        readable=True,
-        path_type=Path,
-    ),
+    type=_TICKER_LIST_FILE,
 )
 @click.option(
     "--start",
@@ -109,39 +384,65 @@ def demo_plot(ctx: click.Context) -> None:
     type=click.DateTime(),
 )
 @click.option("--last", help="analyze last days/months/years back", type=click.STRING)
+@click.option(
+    "--server",
+    help="run the command in a process started with `serve` at this address, e.g. http://127.0.0.1:8765",
+    envvar="STOCK_TRADER_SERVER",
+    type=click.STRING,
+)
+@click.option(
+    "--profile",
+    help="time the stages of the run, print a summary of them and write a Chrome trace, "
+    "stages run in worker processes are not recorded",
+    is_flag=True,
+)
+@click.option(
+    "--trace-file",
+    help="file --profile writes the trace to, trace_<timestamp>.json in the report folder by default",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+)
 @click.pass_context
 def cli(
     ctx: click.Context,
-    data_source: str,
+    data_source: str | None,
     alpha_vantage_api_key: str | None,
-    ticker_list_file: Path,
+    ticker_list_file: Path | None,
     start: datetime,
     end: datetime,
     last: str | None,
+    server: str | None,
+    profile: bool,
+    trace_file: Path | None,
 ) -> None:
-    data_src = None
-    date_range = DateRange(start=start, end=end) if not last else DateRange.from_last(last)
+    ctx.ensure_object(dict)
+    if profile:
+        _profile(ctx, trace_file)
+    # the server gets the data source and tickers with every request, it needs neither of them up front
+    if ctx.invoked_subcommand == "serve":
+        return
+    data_source = data_source or str(click.prompt("Data source", type=_DATA_SOURCES))
+    # jobs of a batch name their own tickers, for them the ticker list file only gives the default ones
+    if ticker_list_file is None and ctx.invoked_subcommand != "run-batch":
+        ticker_list_file = click.prompt("Ticker list file", type=_TICKER_LIST_FILE)
     if data_source == "alpha_vantage":
         alpha_vantage_api_key = alpha_vantage_api_key or str(click.prompt("Alpha Vantage API key"))
-        data_src = data_source_factory(
-            Source.ALPHA_VANTAGE,
-            alpha_vantage_api_key=alpha_vantage_api_key,
-        )
-    elif data_source == "local":
-        data_src = data_source_factory(Source.LOCAL)
-    else:
-        data_src = data_source_factory(Source.YFINANCE)
-
-    data_loader = data_loader_factory(data_src)
-    ctx.ensure_object(dict)
-    with open(ticker_list_file) as tickers_file:
-        tickers = tickers_file.readlines()
-        ctx.obj["tickers"] = [ticker.strip() for ticker in tickers]
-        ctx.obj["date_range"] = date_range
-        ctx.obj["data_loader"] = data_loader
+    # the data loader and date range are built by the commands using them, see _get_data_loader
+    ctx.obj["data_source"] = data_source
+    ctx.obj["alpha_vantage_api_key"] = alpha_vantage_api_key
+    ctx.obj["start"], ctx.obj["end"], ctx.obj["last"] = start, end, last
+    ctx.obj["server"] = server
+    ctx.obj["tickers"] = []
+    if ticker_list_file is not None:
+        with open(ticker_list_file) as tickers_file:
+            tickers = tickers_file.readlines()
+            ctx.obj["tickers"] = [ticker.strip() for ticker in tickers]
 
 
 cli.add_command(backtest)
 cli.add_command(plot)
 cli.add_command(demo_backtest)
-cli.add_command(demo_plot)
\ No newline at end of file
+cli.add_command(demo_plot)
+cli.add_command(optimize)
+cli.add_command(screen)
+cli.add_command(serve)
+cli.add_command(run_batch)
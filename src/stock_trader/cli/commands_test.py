@@ -1,8 +1,16 @@
+import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 from click.testing import CliRunner
 import pytest
 
-from stock_trader.cli.commands import cli
+from stock_trader.cli.commands import _OPTIMIZATION_METRICS, cli
+
+# modules only the commands running a workflow may import
+HEAVY_MODULES = {"pandas", "numpy", "matplotlib", "mplfinance", "yfinance", "requests", "aiohttp", "pydantic"}
+IMPORT_TIME_BUDGET_US = 300_000
 
 
 @pytest.fixture(scope="function")
@@ -93,3 +101,113 @@ def test_ticker_list_file_required(runner: CliRunner, tickers_path: Path) -> Non
     )
     assert "Ticker list file" in result.output
     assert result.exit_code == 0
+
+
+def test_unknown_indicator_name_rejected(runner: CliRunner, tickers_path: Path) -> None:
+    result = runner.invoke(
+        cli,
+        ["--data-source=local", f"--ticker-list-file={tickers_path}", "plot", "--indicator-name=SMA_x"],
+    )
+    assert "is not an indicator" in result.output
+    assert result.exit_code == 2
+
+
+def test_optimize_rejects_malformed_parameter_values(runner: CliRunner, tickers_path: Path) -> None:
+    result = runner.invoke(
+        cli,
+        [
+            "--data-source=local",
+            f"--ticker-list-file={tickers_path}",
+            "optimize",
+            "--signal-kind=RSI",
+            "--param=7:x",
+        ],
+    )
+    assert "neither start:stop[:step] nor a comma separated list" in result.output
+    assert result.exit_code == 2
+
+
+def test_cli_import_stays_light() -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import stock_trader.cli.commands"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines look like "import time: self [us] | cumulative | imported package", nested ones indented
+    imports = [line.split("|") for line in result.stderr.splitlines() if line.startswith("import time:")]
+    imported = {name.strip() for _, _, name in imports[1:]}
+    assert not {name for name in imported if name.split(".")[0] in HEAVY_MODULES}
+    cumulative = {name.strip(): int(total) for _, total, name in imports[1:]}
+    assert cumulative["stock_trader.cli.commands"] < IMPORT_TIME_BUDGET_US
+
+
+def test_help_does_not_need_settings() -> None:
+    env = {name: value for name, value in os.environ.items() if not name.startswith("STOCK_TRADER_")}
+    result = subprocess.run(
+        [sys.executable, "-m", "stock_trader", "--help"], capture_output=True, text=True, env=env, check=True
+    )
+    assert "Usage: " in result.stdout
+
+
+def test_workflows_are_imported_without_settings() -> None:
+    # worker processes, the server and run-batch import them before any setting is read
+    env = {name: value for name, value in os.environ.items() if not name.startswith("STOCK_TRADER_")}
+    modules = ["trading_algorithms.factory", "workflows.backtesting", "workflows.batch", "workflows.optimization"]
+    code = "; ".join(f"import stock_trader.{module}" for module in modules)
+    subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+
+def test_optimization_metric_choices_match_workflow() -> None:
+    from stock_trader.workflows.optimization import METRICS
+
+    assert _OPTIMIZATION_METRICS == list(METRICS)
+
+
+def test_run_batch_writes_results_table(runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "stock_trader.settings.APP_SETTINGS.source_data_folder",
+        Path(__file__).parents[1] / "acquisition/data_sources/test_data",
+    )
+    job_file = tmp_path / "jobs.toml"
+    job_file.write_text('start = 2010-01-01\nend = 2011-01-01\n\n[[jobs]]\nsignal = "RSI"\ntickers = ["AAPL", "GE"]\n')
+    output = tmp_path / "results.csv"
+    args = ["--data-source=local", "run-batch", str(job_file), "--workers=1", f"--output={output}"]
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    assert output.read_text().splitlines()[0].startswith("job,ticker,signal")
+    assert len(output.read_text().splitlines()) == 3
+
+
+def test_run_batch_rejects_invalid_job_file(runner: CliRunner, tmp_path: Path) -> None:
+    job_file = tmp_path / "jobs.toml"
+    job_file.write_text('[[jobs]]\nsignal = "NotASignal"\ntickers = ["AAPL"]\n')
+    result = runner.invoke(cli, ["--data-source=local", "run-batch", str(job_file)])
+    assert "job job_1 has an unknown signal" in result.output
+    assert result.exit_code == 2
+
+
+def test_profile_prints_summary_and_writes_trace(
+    runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        "stock_trader.settings.APP_SETTINGS.source_data_folder",
+        Path(__file__).parents[1] / "acquisition/data_sources/test_data",
+    )
+    tickers_path = tmp_path / "tickers.txt"
+    tickers_path.write_text("AAPL\nGE\n")
+    trace_file = tmp_path / "trace.json"
+    result = runner.invoke(
+        cli,
+        [
+            "--data-source=local",
+            f"--ticker-list-file={tickers_path}",
+            "--profile",
+            f"--trace-file={trace_file}",
+            "screen",
+            "--signal-name=RSI",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "slowest tickers" in result.output
+    assert {event["name"] for event in json.loads(trace_file.read_text())["traceEvents"]} >= {"fetch", "indicator"}
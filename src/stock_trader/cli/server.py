@@ -0,0 +1,125 @@
+import ipaddress
+import json
+import socket
+from contextlib import redirect_stdout
+from datetime import datetime, time, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import StringIO
+from typing import Any, Self
+
+import click
+
+from stock_trader.acquisition.data_loaders.data_loader import DataLoader, InMemoryDataLoader
+from stock_trader.cli.commands import cli, create_data_loader
+from stock_trader.utils.date_range import DateRange
+
+
+class TradingServer(HTTPServer):
+    """
+    Runs CLI commands forwarded by clients started with --server in one long-lived process.
+
+    The data of every data source stays loaded between requests and so do the indicators computed on it
+    (see get_indicator_cache), so only the first request for a ticker pays for reading and parsing it. Date
+    ranges are widened to whole days: the bars are daily, and a range ending now would otherwise never
+    match one loaded before. Requests are run one at a time and what the command printed is sent back.
+
+    Loaded data is kept for at most cache_ttl and cache_max_bytes per data source, POST /refresh drops
+    all of it. Clients are not authenticated while commands write files, so the server only listens on
+    loopback addresses.
+    """
+
+    def __init__(
+        self: Self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        cache_max_bytes: int | None = 1 << 30,
+        cache_ttl: timedelta | None = timedelta(minutes=15),
+    ) -> None:
+        if not _is_loopback(host):
+            raise ValueError(f"{host} is not a loopback address, the server runs commands for anyone reaching it")
+        super().__init__((host, port), _TradingRequestHandler)
+        self._data_loaders: dict[tuple[str, str | None], InMemoryDataLoader] = {}
+        self._cache_max_bytes = cache_max_bytes
+        self._cache_ttl = cache_ttl
+
+    @property
+    def url(self: Self) -> str:
+        return f"http://{self.server_address[0]!s}:{self.server_port}"
+
+    def respond(self: Self, request: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        """
+        Args:
+        - request (dict): Command name, its parameters and the CLI group state, as sent by run_on_server.
+
+        Returns:
+        - HTTP status and the body of the response, with the output of the command and the error if it failed
+        """
+        command = cli.commands.get(request.get("command", ""))
+        if command is None:
+            return 404, {"error": f"no such command: {request.get('command')}"}
+        output = StringIO()
+        try:
+            obj = self._make_context_object(request["state"])
+            with redirect_stdout(output), click.Context(cli, obj=obj) as ctx:
+                ctx.invoke(command, **request["params"])
+        except click.ClickException as error:
+            return 400, {"output": output.getvalue(), "error": error.format_message()}
+        except Exception as error:
+            return 500, {"output": output.getvalue(), "error": f"{type(error).__name__}: {error}"}
+        return 200, {"output": output.getvalue()}
+
+    def refresh(self: Self) -> None:
+        for data_loader in self._data_loaders.values():
+            data_loader.clear()
+
+    def _make_context_object(self: Self, state: dict[str, Any]) -> dict[str, Any]:
+        data_source, api_key = state["data_source"], state["alpha_vantage_api_key"]
+        if (data_source, api_key) not in self._data_loaders:
+            self._data_loaders[data_source, api_key] = InMemoryDataLoader(
+                create_data_loader(data_source, api_key), self._cache_max_bytes, self._cache_ttl
+            )
+        if state["last"]:
+            date_range = DateRange.from_last(state["last"])
+        else:
+            start, end = datetime.fromisoformat(state["start"]), datetime.fromisoformat(state["end"])
+            date_range = DateRange(start=start, end=end)
+        return {
+            **state,
+            "data_loader": self._data_loaders[data_source, api_key],
+            "date_range": DateRange(
+                start=datetime.combine(date_range.start.date(), time.min),
+                end=datetime.combine(date_range.end.date(), time.max),
+            ),
+        }
+
+
+class _TradingRequestHandler(BaseHTTPRequestHandler):
+    server: TradingServer
+
+    def do_POST(self: Self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/run":
+            status, response = self.server.respond(json.loads(body))
+        elif self.path == "/refresh":
+            self.server.refresh()
+            status, response = 200, {"output": "Dropped all loaded data\n"}
+        else:
+            status, response = 404, {"error": f"no such endpoint: {self.path}"}
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self: Self, format: str, *args: Any) -> None:
+        pass
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return all(
+            ipaddress.ip_address(address[4][0]).is_loopback for address in socket.getaddrinfo(host, None)
+        )
+    except (OSError, ValueError):
+        return False
@@ -0,0 +1,97 @@
+import threading
+from pathlib import Path
+from typing import Iterator
+from urllib.request import Request, urlopen
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from stock_trader.acquisition.data_loaders.data_loader import DataLoader, SingleThreadedDataLoader
+from stock_trader.cli.commands import cli
+from stock_trader.cli.server import TradingServer
+from stock_trader.conftest import FakeDataSource
+from stock_trader.utils.date_range import DateRange
+
+TICKERS_PATH = Path(__file__).parent / "test_data/test_tickers.txt"
+
+
+class CountingDataSource(FakeDataSource):
+    def __init__(self) -> None:
+        self.fetched: list[str] = []
+
+    def fetch(self, ticker: str, date_range: DateRange) -> pd.DataFrame:
+        self.fetched.append(ticker)
+        return super().fetch(ticker, date_range)
+
+
+@pytest.fixture()
+def data_source(monkeypatch: pytest.MonkeyPatch) -> CountingDataSource:
+    data_source = CountingDataSource()
+
+    def create_data_loader(data_source_name: str, alpha_vantage_api_key: str | None) -> DataLoader:
+        return SingleThreadedDataLoader(data_source)
+
+    monkeypatch.setattr("stock_trader.cli.server.create_data_loader", create_data_loader)
+    return data_source
+
+
+@pytest.fixture()
+def server(data_source: CountingDataSource) -> Iterator[TradingServer]:
+    server = TradingServer(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_on(server_url: str, *args: str) -> list[str]:
+    return ["--data-source=local", f"--ticker-list-file={TICKERS_PATH}", f"--server={server_url}", *args]
+
+
+def test_server_keeps_data_loaded_between_requests(server: TradingServer, data_source: CountingDataSource) -> None:
+    runner = CliRunner()
+    first = runner.invoke(cli, run_on(server.url, "--last=1y", "screen", "--signal-name=RSI"))
+    second = runner.invoke(cli, run_on(server.url, "--last=1y", "screen", "--signal-name=RSI"))
+
+    assert first.exit_code == 0
+    assert first.output == "AAPL: hold\nNVDA: hold\nMSFT: hold\n"
+    assert second.output == first.output
+    assert data_source.fetched == ["AAPL", "NVDA", "MSFT"]
+
+
+def test_refresh_drops_loaded_data(server: TradingServer, data_source: CountingDataSource) -> None:
+    runner = CliRunner()
+    runner.invoke(cli, run_on(server.url, "--last=1y", "screen", "--signal-name=RSI"))
+    with urlopen(Request(server.url + "/refresh", method="POST")) as response:
+        assert response.status == 200
+    runner.invoke(cli, run_on(server.url, "--last=1y", "screen", "--signal-name=RSI"))
+
+    assert data_source.fetched == ["AAPL", "NVDA", "MSFT"] * 2
+
+
+def test_serve_only_listens_on_loopback_addresses() -> None:
+    result = CliRunner().invoke(cli, ["serve", "--host=0.0.0.0", "--port=0"])
+    assert result.exit_code == 2
+    assert "not a loopback address" in result.output
+
+
+def test_server_reports_failed_commands(server: TradingServer) -> None:
+    result = CliRunner().invoke(cli, run_on(server.url, "--last=soon", "screen", "--signal-name=RSI"))
+    assert result.exit_code == 1
+    assert "Error: ValidationError" in result.output
+
+
+def test_client_reports_unreachable_server() -> None:
+    with TradingServer(port=0) as stopped:
+        url = stopped.url
+    result = CliRunner().invoke(cli, run_on(url, "screen", "--signal-name=RSI"))
+    assert result.exit_code == 1
+    assert "cannot reach the server" in result.output
+
+
+def test_serve_needs_neither_data_source_nor_tickers() -> None:
+    result = CliRunner().invoke(cli, ["serve", "--help"])
+    assert result.exit_code == 0
+    assert "Data source" not in result.output
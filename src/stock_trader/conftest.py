@@ -1,4 +1,10 @@
-from typing import Self
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, Self
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -29,3 +35,95 @@ class FakeDataSource(DataSource):
 @pytest.fixture()
 def fake_data_source():
     return FakeDataSource()
+
+
+def is_backed_by_shared_memory(array: np.ndarray) -> bool:
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return isinstance(array.base, memoryview)
+
+
+class AlphaVantageStubServer(ThreadingHTTPServer):
+    """
+    Local HTTP server answering TIME_SERIES_DAILY queries with Alpha Vantage shaped JSON.
+
+    Symbols starting with "missing" get the API's error payload, every other symbol gets a short
+    generated daily series. The first `throttled_responses` requests get the throttling note instead.
+    Before any of that, requests are answered with the (status, body) pairs of `failures` in turn, a
+    status of None closes the connection without an answer.
+    """
+
+    daemon_threads = True
+
+    def __init__(self: Self) -> None:
+        super().__init__(("127.0.0.1", 0), _AlphaVantageStubHandler)
+        self.queries: list[dict[str, str]] = []
+        self.client_ports: set[int] = set()
+        self.throttled_responses = 0
+        self.failures: list[tuple[int | None, str]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self: Self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/query"
+
+    def respond(self: Self, query: dict[str, str], client_port: int) -> tuple[int | None, str]:
+        with self._lock:
+            self.queries.append(query)
+            self.client_ports.add(client_port)
+            if self.failures:
+                return self.failures.pop(0)
+        return 200, json.dumps(self._get_payload(query))
+
+    def _get_payload(self: Self, query: dict[str, str]) -> dict[str, Any]:
+        with self._lock:
+            if self.throttled_responses > 0:
+                self.throttled_responses -= 1
+                return {
+                    "Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute."
+                }
+        if query["symbol"].lower().startswith("missing"):
+            return {"Error Message": "Invalid API call. Please retry or visit the documentation for TIME_SERIES_DAILY."}
+        dates = pd.date_range(end="2023-09-20", periods=30, freq="B")
+        series = {
+            date.strftime("%Y-%m-%d"): {
+                "1. open": f"{100.0 + i:.4f}",
+                "2. high": f"{101.0 + i:.4f}",
+                "3. low": f"{99.0 + i:.4f}",
+                "4. close": f"{100.5 + i:.4f}",
+                "5. volume": str(1000 + i),
+            }
+            for i, date in enumerate(reversed(dates))
+        }
+        return {"Meta Data": {"2. Symbol": query["symbol"]}, "Time Series (Daily)": series}
+
+
+class _AlphaVantageStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: AlphaVantageStubServer
+
+    def do_GET(self: Self) -> None:
+        query = dict(parse_qsl(urlparse(self.path).query))
+        status, text = self.server.respond(query, self.client_address[1])
+        if status is None:
+            self.close_connection = True
+            return
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self: Self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture()
+def alpha_vantage_stub() -> Iterator[AlphaVantageStubServer]:
+    server = AlphaVantageStubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
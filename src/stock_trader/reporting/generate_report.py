@@ -1,28 +1,27 @@
 from pathlib import Path
 from typing import NewType
 from datetime import datetime
-from stock_trader.reporting.history import History
-from stock_trader.reporting.performance_metrics import (
-    calculate_annualized_return,
-    calculate_sharpe_ratio,
-    calculate_max_drawdown,
-)
+from stock_trader.reporting.history import ColumnarHistory, History, to_equity_array
+from stock_trader.reporting.metrics_engine import calculate_metrics
 from stock_trader.settings import APP_SETTINGS
+from stock_trader.utils.profiling import profiled
 
 Report = NewType("Report", str)
 
 
-def create_report(history: History) -> Report:
-    annualized_return = calculate_annualized_return(history)
-    sharpe_ratio = calculate_sharpe_ratio(history)
-    max_drawdown = calculate_max_drawdown(history)
+@profiled("create_report")
+def create_report(history: History | ColumnarHistory) -> Report:
+    metrics = calculate_metrics(to_equity_array(history))
 
     report = f"""
     === Trading Simulation Report ===
 
-    - Annualized Return: {annualized_return:.2%}
-    - Sharpe Ratio: {sharpe_ratio:.2f}
-    - Maximum Drawdown: {max_drawdown:.2%}
+    - Annualized Return: {metrics.annualized_return[0]:.2%}
+    - Volatility: {metrics.volatility[0]:.2%}
+    - Sharpe Ratio: {metrics.sharpe_ratio[0]:.2f}
+    - Sortino Ratio: {metrics.sortino_ratio[0]:.2f}
+    - Maximum Drawdown: {metrics.max_drawdown[0]:.2%}
+    - Longest Drawdown: {metrics.max_drawdown_duration[0]} bars
 
     ================================
     """
@@ -30,6 +29,7 @@ def create_report(history: History) -> Report:
     return Report(report)
 
 
+@profiled("save_report", ticker_arg=1)
 def save_report(report: Report, ticker: str) -> None:
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"report_{ticker}_{timestamp}.txt"
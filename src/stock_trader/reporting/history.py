@@ -1,4 +1,8 @@
 from dataclasses import dataclass
+from typing import Iterator, Self
+
+import numpy as np
+import pandas as pd
 
 
 @dataclass
@@ -8,3 +12,87 @@ class HistoryItem:
 
 
 History = list[HistoryItem]
+
+
+class ColumnarHistory:
+    """
+    History of a simulation held in preallocated arrays instead of one HistoryItem per bar.
+
+    Columns are the bar dates (datetime64[ns]) and the cash, the market value of the held position and
+    the total equity after each bar (float64). Arrays are allocated once for capacity bars and filled by
+    append() or all at once with from_arrays(); the column properties are views of the filled part, so
+    performance metrics read them without copying. Indexing and iterating still give HistoryItems for
+    code written against History.
+    """
+
+    def __init__(self: Self, capacity: int) -> None:
+        self._dates = np.empty(capacity, dtype="datetime64[ns]")
+        self._cash = np.empty(capacity, dtype=np.float64)
+        self._position = np.empty(capacity, dtype=np.float64)
+        self._equity = np.empty(capacity, dtype=np.float64)
+        self._length = 0
+
+    @classmethod
+    def from_arrays(cls, dates: np.ndarray, cash: np.ndarray, position: np.ndarray) -> Self:
+        history = cls(0)
+        history._dates = np.asarray(dates, dtype="datetime64[ns]")
+        history._cash = np.asarray(cash, dtype=np.float64)
+        history._position = np.asarray(position, dtype=np.float64)
+        history._equity = history._cash + history._position
+        history._length = len(history._dates)
+        return history
+
+    def append(self: Self, date: np.datetime64 | pd.Timestamp, cash: float, position: float) -> None:
+        if self._length == len(self._dates):
+            raise IndexError(f"history is full, it was allocated for {len(self._dates)} bars")
+        self._dates[self._length] = date
+        self._cash[self._length] = cash
+        self._position[self._length] = position
+        self._equity[self._length] = cash + position
+        self._length += 1
+
+    @property
+    def dates(self: Self) -> np.ndarray:
+        return self._dates[: self._length]
+
+    @property
+    def cash(self: Self) -> np.ndarray:
+        return self._cash[: self._length]
+
+    @property
+    def position(self: Self) -> np.ndarray:
+        return self._position[: self._length]
+
+    @property
+    def equity(self: Self) -> np.ndarray:
+        return self._equity[: self._length]
+
+    def __len__(self: Self) -> int:
+        return self._length
+
+    def __getitem__(self: Self, index: int) -> HistoryItem:
+        if not -self._length <= index < self._length:
+            raise IndexError("history index out of range")
+        index %= self._length
+        return HistoryItem(str(pd.Timestamp(self._dates[index])), float(self._equity[index]))
+
+    def __iter__(self: Self) -> Iterator[HistoryItem]:
+        return (self[i] for i in range(self._length))
+
+    def __eq__(self: Self, other: object) -> bool:
+        if not isinstance(other, ColumnarHistory):
+            return NotImplemented
+        return all(
+            np.array_equal(mine, theirs)
+            for mine, theirs in zip(
+                (self.dates, self.cash, self.position, self.equity),
+                (other.dates, other.cash, other.position, other.equity),
+            )
+        )
+
+
+def to_equity_array(history: History | ColumnarHistory) -> np.ndarray:
+    # a columnar history already keeps the values in an array, which is used as it is
+    if isinstance(history, ColumnarHistory):
+        return history.equity
+    return np.fromiter((entry.value for entry in history), dtype=np.float64, count=len(history))
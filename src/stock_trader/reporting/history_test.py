@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_trader.reporting.history import ColumnarHistory, HistoryItem, to_equity_array
+from stock_trader.reporting.performance_metrics import (
+    calculate_annualized_return,
+    calculate_max_drawdown,
+    calculate_sharpe_ratio,
+)
+
+
+def test_appended_bars_fill_preallocated_columns() -> None:
+    history = ColumnarHistory(3)
+    history.append(pd.Timestamp("2022-01-01"), 100.0, 0.0)
+    history.append(pd.Timestamp("2022-01-02"), 10.0, 95.0)
+
+    assert len(history) == 2
+    np.testing.assert_array_equal(history.equity, [100.0, 105.0])
+    assert history.dates.dtype == np.dtype("datetime64[ns]")
+    assert history[-1] == HistoryItem("2022-01-02 00:00:00", 105.0)
+    assert [item.value for item in history] == [100.0, 105.0]
+    history.append(pd.Timestamp("2022-01-03"), 10.0, 96.0)
+    with pytest.raises(IndexError):
+        history.append(pd.Timestamp("2022-01-04"), 10.0, 97.0)
+
+
+def test_metrics_read_columnar_history_without_copying() -> None:
+    values = [100.0, 110.0, 99.0, 120.0, 130.0]
+    dates = pd.date_range("2022-01-01", periods=len(values)).to_numpy()
+    history = ColumnarHistory.from_arrays(dates, np.zeros(len(values)), np.array(values))
+    items = [HistoryItem(str(date), value) for date, value in zip(dates, values)]
+
+    assert np.shares_memory(to_equity_array(history), history.equity)
+    assert calculate_annualized_return(history) == calculate_annualized_return(items)
+    assert calculate_sharpe_ratio(history) == calculate_sharpe_ratio(items)
+    assert calculate_max_drawdown(history) == calculate_max_drawdown(items)
@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from stock_trader.reporting.history import ColumnarHistory, History, to_equity_array
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+@dataclass(frozen=True)
+class PerformanceMetrics:
+    """
+    Metrics of many backtest runs, one entry per run.
+
+    returns holds the bar to bar returns as a (bars - 1) x runs matrix, ratios and volatility are
+    annualized, drawdowns are fractions of the peak (0 or negative) and durations are counted in bars.
+    """
+
+    returns: np.ndarray
+    annualized_return: np.ndarray
+    volatility: np.ndarray
+    sharpe_ratio: np.ndarray
+    sortino_ratio: np.ndarray
+    max_drawdown: np.ndarray
+    max_drawdown_duration: np.ndarray
+
+
+def calculate_metrics(
+    equity: np.ndarray,
+    risk_free_rate: float = 0.03,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> PerformanceMetrics:
+    """
+    Compute all metrics of every run in one vectorized call.
+
+    Args:
+    - equity (ndarray): bars x runs matrix of portfolio values, a 1-D array is a single run. Runs shorter
+      than others are padded with trailing NaNs.
+    - risk_free_rate (float): Annual risk free rate the Sharpe and Sortino ratios are in excess of.
+    - periods_per_year (int): Number of bars in a year.
+
+    Returns:
+    - PerformanceMetrics, NaN ratios for runs whose returns do not vary
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.ndim == 1:
+        equity = equity[:, np.newaxis]
+    runs = np.arange(equity.shape[1])
+    lengths = np.count_nonzero(~np.isnan(equity), axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = equity[1:] / equity[:-1] - 1.0
+        start = equity[0] if len(equity) > 0 else np.full(len(runs), np.nan)
+        end = equity[np.maximum(lengths - 1, 0), runs] if len(equity) > 0 else start
+        # same convention as calculate_annualized_return: every bar counts towards the number of years
+        annualized_return = np.where(
+            (lengths >= 2) & (start != 0.0), (end / start) ** (periods_per_year / np.maximum(lengths, 1)) - 1.0, 0.0
+        )
+
+        excess = returns - risk_free_rate / periods_per_year
+        counts = np.count_nonzero(~np.isnan(returns), axis=0)
+        mean_excess = np.nansum(excess, axis=0) / counts
+        mean_return = np.nansum(returns, axis=0) / counts
+        deviation = np.sqrt(np.nansum((returns - mean_return) ** 2, axis=0) / (counts - 1))
+        downside = np.sqrt(np.nansum(np.minimum(excess, 0.0) ** 2, axis=0) / counts)
+        annualization = np.sqrt(periods_per_year)
+        volatility = deviation * annualization
+        sharpe_ratio = np.where(deviation > 0, mean_excess / deviation * annualization, np.nan)
+        sortino_ratio = np.where(downside > 0, mean_excess / downside * annualization, np.nan)
+
+        peaks = np.fmax.accumulate(equity, axis=0)
+        drawdowns = (equity - peaks) / peaks
+    max_drawdown = np.where(lengths >= 2, np.nan_to_num(np.nanmin(drawdowns, axis=0, initial=0.0)), 0.0)
+
+    # bars since the last peak, the longest stretch is the longest drawdown
+    bars = np.arange(len(equity))[:, np.newaxis]
+    last_peak = np.maximum.accumulate(np.where(equity >= peaks, bars, 0), axis=0)
+    durations = np.where(np.isnan(equity), 0, bars - last_peak)
+    max_drawdown_duration = durations.max(axis=0, initial=0)
+
+    return PerformanceMetrics(
+        returns=returns,
+        annualized_return=annualized_return,
+        volatility=volatility,
+        sharpe_ratio=sharpe_ratio,
+        sortino_ratio=sortino_ratio,
+        max_drawdown=max_drawdown,
+        max_drawdown_duration=max_drawdown_duration,
+    )
+
+
+def stack_equity(histories: Sequence[History | ColumnarHistory]) -> np.ndarray:
+    """
+    Equity of many histories as a bars x runs matrix, shorter histories padded with trailing NaNs.
+    """
+    columns = [to_equity_array(history) for history in histories]
+    equity = np.full((max((len(column) for column in columns), default=0), len(columns)), np.nan)
+    for i, column in enumerate(columns):
+        equity[: len(column), i] = column
+    return equity
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from stock_trader.reporting.history import ColumnarHistory, HistoryItem
+from stock_trader.reporting.metrics_engine import calculate_metrics, stack_equity
+from stock_trader.reporting.performance_metrics import calculate_annualized_return, calculate_max_drawdown
+
+
+@pytest.fixture
+def equity() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    equity: np.ndarray = 100.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, size=(500, 20)), axis=0))
+    return equity
+
+
+def test_metrics_match_per_run_definitions(equity: np.ndarray) -> None:
+    metrics = calculate_metrics(equity, risk_free_rate=0.03)
+    for run in range(equity.shape[1]):
+        values = equity[:, run]
+        history = [HistoryItem(str(i), value) for i, value in enumerate(values)]
+        returns = values[1:] / values[:-1] - 1.0
+        excess = returns - 0.03 / 252
+        assert metrics.annualized_return[run] == pytest.approx(calculate_annualized_return(history))
+        assert metrics.max_drawdown[run] == pytest.approx(calculate_max_drawdown(history))
+        assert metrics.volatility[run] == pytest.approx(returns.std(ddof=1) * np.sqrt(252))
+        assert metrics.sharpe_ratio[run] == pytest.approx(excess.mean() / returns.std(ddof=1) * np.sqrt(252))
+        downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))
+        assert metrics.sortino_ratio[run] == pytest.approx(excess.mean() / downside * np.sqrt(252))
+    np.testing.assert_allclose(metrics.returns, equity[1:] / equity[:-1] - 1.0)
+
+
+def test_drawdown_duration_counts_bars_below_the_peak() -> None:
+    equity = np.array([[100.0, 100.0], [110.0, 90.0], [100.0, 95.0], [105.0, 99.0], [111.0, 98.0]])
+    metrics = calculate_metrics(equity)
+    np.testing.assert_array_equal(metrics.max_drawdown_duration, [2, 4])
+    np.testing.assert_allclose(metrics.max_drawdown, [100.0 / 110.0 - 1.0, -0.1])
+
+
+def test_runs_of_different_lengths(equity: np.ndarray) -> None:
+    short = ColumnarHistory.from_arrays(np.arange(300).astype("datetime64[D]"), np.zeros(300), equity[:300, 0])
+    long = [HistoryItem(str(i), value) for i, value in enumerate(equity[:, 1])]
+    stacked = stack_equity([short, long])
+    assert stacked.shape == (500, 2)
+    assert np.isnan(stacked[300:, 0]).all()
+
+    metrics = calculate_metrics(stacked)
+    alone = calculate_metrics(equity[:300, 0])
+    for field in ("annualized_return", "volatility", "sharpe_ratio", "sortino_ratio", "max_drawdown"):
+        assert getattr(metrics, field)[0] == pytest.approx(getattr(alone, field)[0])
+    assert metrics.max_drawdown_duration[0] == alone.max_drawdown_duration[0]
+    assert metrics.annualized_return[1] == pytest.approx(calculate_metrics(equity[:, 1]).annualized_return[0])
+
+
+def test_constant_and_too_short_runs() -> None:
+    metrics = calculate_metrics(np.array([[100.0, 100.0], [100.0, np.nan], [100.0, np.nan]]))
+    np.testing.assert_array_equal(metrics.annualized_return, [0.0, 0.0])
+    np.testing.assert_array_equal(metrics.max_drawdown, [0.0, 0.0])
+    assert np.isnan(metrics.sharpe_ratio).all()
+    assert metrics.volatility[0] == 0.0
@@ -1,32 +1,35 @@
 import typing
 import numpy as np
 
-from stock_trader.reporting.history import History
+from stock_trader.reporting.history import ColumnarHistory, History, to_equity_array
 
 
-def calculate_annualized_return(history: History) -> float:
-    if len(history) < 2:
+def calculate_annualized_return(history: History | ColumnarHistory) -> float:
+    values = to_equity_array(history)
+    if len(values) < 2:
         return 0.0
-    start_value = history[0].value
-    end_value = history[-1].value
+    start_value = float(values[0])
+    end_value = float(values[-1])
     if start_value == 0.0:
         return 0.0
-    years = len(history) / 252  # Assuming 252 trading days in a year
+    years = len(values) / 252  # Assuming 252 trading days in a year
     # typeshed declares type returned for operator ** as Any because of specialized version
     # that squares a number which returns an int, while the general version returns a float
     return typing.cast(float, ((end_value / start_value) ** (1.0 / years)) - 1.0)
 
 
-def calculate_sharpe_ratio(history: History, risk_free_rate: float = 0.03) -> float:
-    returns = [entry.value for entry in history]
-    excess_returns = np.array(returns) - risk_free_rate
+def calculate_sharpe_ratio(history: History | ColumnarHistory, risk_free_rate: float = 0.03) -> float:
+    # deprecated: this is taken from the equity values rather than their returns, reports and the optimizer
+    # use the sharpe_ratio of metrics_engine.calculate_metrics instead
+    excess_returns = to_equity_array(history) - risk_free_rate
     return typing.cast(float, (np.mean(excess_returns) / np.std(excess_returns)))
 
 
-def calculate_max_drawdown(history: History) -> float:
-    if len(history) < 2:
+def calculate_max_drawdown(history: History | ColumnarHistory) -> float:
+    values = to_equity_array(history)
+    if len(values) < 2:
         return 0.0
-    values = [entry.value for entry in history]
     peaks = np.maximum.accumulate(values)
     drawdowns = (values - peaks) / peaks
     return typing.cast(float, (np.min(drawdowns)))
+
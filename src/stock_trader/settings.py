@@ -1,8 +1,10 @@
+from datetime import timedelta
 from enum import Enum, auto
 from pydantic import DirectoryPath
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import sys
+from typing import Any, Self, cast
 
 
 class Concurrency(Enum):
@@ -10,6 +12,7 @@ class Concurrency(Enum):
     PROCESSESS = auto()
     ASYNCIO = auto()
     SINGLE_THREADED = auto()
+    SHARED_MEMORY = auto()
 
 ENV_FILE = Path(__file__).parent / ".env_run"
 if "pytest" in sys.modules:
@@ -19,6 +22,40 @@ class Settings(BaseSettings):
     report_output_path: DirectoryPath
     source_data_folder: DirectoryPath
     alpha_vantage_api_key: str
+    alpha_vantage_calls_per_minute: float = 5.0
+    ohlc_cache_folder: Path | None = None
+    remote_cache_folder: Path | None = None
+    remote_cache_ttl: timedelta = timedelta(hours=12)
+    remote_cache_max_bytes: int | None = None
     concurrency: Concurrency = Concurrency.SINGLE_THREADED
+    num_workers: int = 4
+    fetch_batch_size: int = 25
+    indicator_cache_size: int = 128
+    indicator_cache_folder: Path | None = None
 
-APP_SETTINGS = Settings()
+class _LazySettings:
+    """
+    Stands in for Settings() until one of the settings is read or written.
+
+    Reading the environment and the env file and validating them happens on first use, so importing
+    modules that depend on settings stays cheap and commands that do not need them never fail on them.
+    """
+
+    def __init__(self: Self) -> None:
+        object.__setattr__(self, "_settings", None)
+
+    def _resolve(self: Self) -> Settings:
+        settings: Settings | None = object.__getattribute__(self, "_settings")
+        if settings is None:
+            settings = Settings()
+            object.__setattr__(self, "_settings", settings)
+        return settings
+
+    def __getattr__(self: Self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self: Self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+
+APP_SETTINGS = cast(Settings, _LazySettings())
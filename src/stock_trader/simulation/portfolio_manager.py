@@ -56,5 +56,12 @@ class PortfolioManager:
             "total_value": self.get_value(current_prices),
         }
 
+    @property
+    def cash(self: Self) -> float:
+        return self._cash
+
+    def get_quantity(self: Self, ticker: str) -> int:
+        return self._stocks.get(ticker, 0)
+
     def owns(self, ticker: str) -> bool:
         return ticker in self._stocks and self._stocks[ticker] > 0
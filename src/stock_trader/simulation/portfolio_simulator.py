@@ -0,0 +1,81 @@
+from typing import Mapping, Self
+
+import numpy as np
+import pandas as pd
+
+from stock_trader.acquisition.market_panel import MarketPanel
+from stock_trader.reporting.history import ColumnarHistory
+from stock_trader.trading_algorithms.signals import Signal
+from stock_trader.utils.profiling import count, profiled
+
+
+class PortfolioSimulator:
+    """
+    Simulates one book trading many tickers with a single cash balance.
+
+    Bars of all tickers are merged onto one date axis. On every date the sell signals of all held tickers
+    are executed first, their proceeds are then split equally between the tickers with a buy signal,
+    each buying as many whole shares as its part pays for. Tickers without a bar on a date do not trade
+    and are valued at their last close. Trading days are processed with array operations across all
+    tickers and the portfolio value between them is one matrix product, so Python-level work grows with
+    the number of dates on which anything trades, not with tickers times dates.
+    """
+
+    def __init__(self: Self, signal: Signal) -> None:
+        self._signal = signal
+        self._history = ColumnarHistory(0)
+        self._holdings: dict[str, int] = {}
+        self._cash = 0.0
+
+    @profiled("simulate")
+    def simulate(self: Self, data: Mapping[str, pd.DataFrame], initial_capital: float = 10000.0) -> None:
+        """
+        Args:
+        - data: Stock data of every ticker, each DataFrame is augmented with the signal's column.
+        - initial_capital (float): Cash shared by all tickers at the start.
+        """
+        panel = MarketPanel.from_frames(data, fields=("Close",))
+        close = panel.field("Close")
+        count("bars_simulated", int(panel.mask.sum()))
+        signals = np.zeros(close.shape)
+        for i, df in enumerate(data.values()):
+            signal_column = self._signal.generate_signals(df)
+            signals[panel.dates.searchsorted(df.index), i] = df[signal_column].to_numpy(dtype=np.float64)
+        buys = (signals == 1.0) & panel.mask
+        sells = (signals == -1.0) & panel.mask
+        # holdings are valued at the last known close, before listing there is nothing to value
+        valuation = np.nan_to_num(pd.DataFrame(close).ffill().to_numpy())
+
+        cash = float(initial_capital)
+        shares = np.zeros(len(panel.tickers), dtype=np.int64)
+        cash_column = np.full(len(panel.dates), cash)
+        position = np.zeros(len(panel.dates))
+        trading_days = np.flatnonzero((buys | sells).any(axis=1))
+        for day, next_trading_day in zip(trading_days, np.append(trading_days[1:], len(panel.dates))):
+            selling = sells[day] & (shares > 0)
+            cash += float(shares[selling] @ close[day, selling])
+            shares[selling] = 0
+            buying = np.flatnonzero(buys[day])
+            if len(buying) > 0:
+                prices = close[day, buying]
+                quantities = (cash / len(buying) // prices).astype(np.int64)
+                cash -= float(quantities @ prices)
+                shares[buying] += quantities
+            cash_column[day:next_trading_day] = cash
+            position[day:next_trading_day] = valuation[day:next_trading_day] @ shares
+
+        self._cash = cash
+        self._holdings = {ticker: int(quantity) for ticker, quantity in zip(panel.tickers, shares) if quantity > 0}
+        self._history = ColumnarHistory.from_arrays(panel.dates.to_numpy(), cash_column, position)
+
+    @property
+    def history(self: Self) -> ColumnarHistory:
+        return self._history
+
+    @property
+    def holdings(self: Self) -> dict[str, int]:
+        return self._holdings
+
+    @property
+    def cash(self: Self) -> float:
+        return self._cash
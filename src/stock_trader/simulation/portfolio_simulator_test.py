@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_trader.simulation.portfolio_manager import PortfolioManager
+from stock_trader.simulation.portfolio_simulator import PortfolioSimulator
+from stock_trader.simulation.simulator import TradingSimulator
+from stock_trader.trading_algorithms.indicator_graph import NodeResults
+from stock_trader.trading_algorithms.signals import Signal
+
+
+class ColumnSignal(Signal):
+    # signals are taken from the Signal column already present in the data
+    def generate_signals(self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
+        return "Signal"
+
+
+class RandomSignal(Signal):
+    def __init__(self, seed: int) -> None:
+        self._rng = np.random.default_rng(seed)
+
+    def generate_signals(self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
+        column = "RandomSignal"
+        data[column] = self._rng.choice([-1.0, 0.0, 1.0, np.nan], size=len(data), p=[0.2, 0.5, 0.25, 0.05])
+        return column
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_single_ticker_portfolio_matches_trading_simulator(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.05, size=1000)))
+    data = pd.DataFrame({"Close": close}, index=pd.date_range("2000-01-01", periods=len(close)))
+
+    loop = TradingSimulator(RandomSignal(seed), PortfolioManager())
+    loop.simulate(data.copy(), "AAPL", 10000.0)
+    portfolio = PortfolioSimulator(RandomSignal(seed))
+    portfolio.simulate({"AAPL": data.copy()}, 10000.0)
+
+    # the loop leaves out bars with failed trades, the portfolio records every date
+    values = {item.date: item.value for item in portfolio.history}
+    assert len(portfolio.history) == len(data)
+    assert all(values[item.date] == pytest.approx(item.value) for item in loop.history)
+
+
+def test_cash_is_shared_between_tickers() -> None:
+    dates = pd.date_range("2022-01-01", periods=4)
+    aapl = pd.DataFrame({"Close": [10.0, 12.0, 15.0, 15.0], "Signal": [1.0, 0.0, -1.0, 0.0]}, index=dates)
+    # GE has no bar on the first date and buys with what AAPL's sale frees up
+    ge = pd.DataFrame({"Close": [20.0, 25.0, 30.0], "Signal": [0.0, 1.0, 0.0]}, index=dates[1:])
+    simulator = PortfolioSimulator(ColumnSignal())
+    simulator.simulate({"AAPL": aapl, "GE": ge}, 105.0)
+
+    # 10 AAPL for 100 on day 1, sold for 150 on day 3 which buys 6 GE at 25
+    assert [item.value for item in simulator.history] == [105.0, 125.0, 155.0, 185.0]
+    assert simulator.holdings == {"GE": 6}
+    assert simulator.cash == pytest.approx(5.0)
+
+
+def test_buy_signals_on_one_date_split_the_cash() -> None:
+    dates = pd.date_range("2022-01-01", periods=2)
+    aapl = pd.DataFrame({"Close": [10.0, 11.0], "Signal": [1.0, 0.0]}, index=dates)
+    ge = pd.DataFrame({"Close": [30.0, 30.0], "Signal": [1.0, 0.0]}, index=dates)
+    simulator = PortfolioSimulator(ColumnSignal())
+    simulator.simulate({"AAPL": aapl, "GE": ge}, 100.0)
+
+    assert simulator.holdings == {"AAPL": 5, "GE": 1}
+    assert simulator.cash == pytest.approx(20.0)
+    assert simulator.history[-1].value == pytest.approx(105.0)
@@ -1,21 +1,27 @@
 from typing import Self
+import numpy as np
 import pandas as pd
-from stock_trader.reporting.history import History, HistoryItem
+from stock_trader.reporting.history import ColumnarHistory
 from stock_trader.simulation.portfolio_manager import PortfolioException, PortfolioManager
 from stock_trader.trading_algorithms.signals import Signal
+from stock_trader.utils.profiling import count, profiled
 
 
 class TradingSimulator:
     def __init__(self, signal: Signal, portfolioManager: PortfolioManager):
         self._portfolio = portfolioManager
-        self._history: History = []
+        self._history = ColumnarHistory(0)
         self._signal = signal
 
+    @profiled("simulate", ticker_arg=2)
     def simulate(self: Self, data: pd.DataFrame, ticker: str, initial_capital: float = 10000.0) -> None:
+        count("bars_simulated", len(data))
+        _check_close(data, ticker)
         self._portfolio.recapitalize(initial_capital)
         signal_column = self._signal.generate_signals(data)
+        self._history = ColumnarHistory(len(data))
 
-        for index, row in data.iterrows():
+        for date, (_, row) in zip(_get_dates(data.index), data.iterrows()):
             current_price = row["Close"]
             try:
                 if row[signal_column] == 1.0:  # Buy signal
@@ -25,9 +31,118 @@ class TradingSimulator:
             except PortfolioException as e:
                 print(e)
                 continue
-            current_value = self._portfolio.get_value({ticker: current_price})
-            self._history.append(HistoryItem(str(index), current_value))
+            quantity = self._portfolio.get_quantity(ticker)
+            position = quantity * current_price if quantity > 0 else 0.0
+            self._history.append(date, self._portfolio.cash, position)
 
     @property
-    def history(self: Self) -> History:
+    def history(self: Self) -> ColumnarHistory:
         return self._history
+
+
+class VectorizedTradingSimulator(TradingSimulator):
+    """
+    TradingSimulator producing the same history with array operations instead of iterrows.
+
+    Python-level work is proportional to the number of trades, not bars: the simulator jumps from
+    one trade to the next with searches over the signal positions, then forward fills cash and
+    position between trades. Bars on which TradingSimulator would hit a PortfolioException are
+    left out of the history, exactly like in the loop, and data missing a close price is rejected
+    by both.
+    """
+
+    @profiled("simulate", ticker_arg=2)
+    def simulate(self: Self, data: pd.DataFrame, ticker: str, initial_capital: float = 10000.0) -> None:
+        count("bars_simulated", len(data))
+        _check_close(data, ticker)
+        self._portfolio.recapitalize(initial_capital)
+        signal_column = self._signal.generate_signals(data)
+
+        close = data["Close"].to_numpy(dtype=np.float64)
+        signals = data[signal_column].to_numpy(dtype=np.float64)
+        trade_bars, cash_after, shares_after, failed = self._find_trades(
+            close, signals == 1.0, signals == -1.0, initial_capital
+        )
+
+        # every bar carries the state left by the most recent trade at or before it,
+        # slot 0 of cash_after/shares_after holds the state before the first trade
+        state = np.searchsorted(trade_bars, np.arange(len(close)), side="right")
+        cash = cash_after[state]
+        shares = shares_after[state]
+        position = np.where(shares > 0, shares * close, 0.0)
+
+        recorded = ~failed
+        dates = _get_dates(data.index).to_numpy(dtype="datetime64[ns]")
+        self._history = ColumnarHistory.from_arrays(dates[recorded], cash[recorded], position[recorded])
+
+    def _find_trades(
+        self: Self, close: np.ndarray, buys: np.ndarray, sells: np.ndarray, initial_capital: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        buy_bars = np.flatnonzero(buys)
+        sell_bars = np.flatnonzero(sells)
+        # signals that do not result in a trade are failures unless proven otherwise below
+        failed = buys | sells
+        cash, shares, bar = float(initial_capital), 0, 0
+        trade_bars: list[int] = []
+        cash_after: list[float] = [cash]
+        shares_after: list[int] = [shares]
+
+        while bar < len(close):
+            next_sell = np.searchsorted(sell_bars, bar)
+            exit_bar = int(sell_bars[next_sell]) if next_sell < len(sell_bars) else len(close)
+            # while invested, buy signals only go through when the leftover cash pays for another share
+            buy_bar = _first_affordable_bar(buy_bars, close, bar, exit_bar if shares > 0 else len(close), cash)
+            if buy_bar is not None:
+                # same arithmetic as PortfolioManager.buy_with_entire_cash
+                price = float(close[buy_bar])
+                quantity = int(cash // price)
+                cash -= price * quantity
+                shares += quantity
+                trade_bar = buy_bar
+            elif shares > 0 and exit_bar < len(close):
+                cash += float(close[exit_bar]) * shares
+                shares = 0
+                trade_bar = exit_bar
+            else:
+                break
+            trade_bars.append(trade_bar)
+            cash_after.append(cash)
+            shares_after.append(shares)
+            failed[trade_bar] = False
+            bar = trade_bar + 1
+
+        return (
+            np.asarray(trade_bars, dtype=np.int64),
+            np.asarray(cash_after, dtype=np.float64),
+            np.asarray(shares_after, dtype=np.int64),
+            failed,
+        )
+
+
+def _first_affordable_bar(buy_bars: np.ndarray, close: np.ndarray, start: int, stop: int, cash: float) -> int | None:
+    # gallop over the buy signals in growing blocks so we never scan far past the returned bar
+    position = int(np.searchsorted(buy_bars, start))
+    end = int(np.searchsorted(buy_bars, stop))
+    block = 16
+    while position < end:
+        candidates = buy_bars[position : min(position + block, end)]
+        affordable = np.flatnonzero(close[candidates] <= cash)
+        if len(affordable) > 0:
+            return int(candidates[affordable[0]])
+        position += block
+        block *= 2
+    return None
+
+
+def _check_close(data: pd.DataFrame, ticker: str) -> None:
+    # a bar without a close price can neither be traded at nor valued
+    missing = data.index[data["Close"].isna()]
+    if len(missing) > 0:
+        raise ValueError(f"{ticker} has no Close price on {len(missing)} bar(s), the first one on {missing[0]}")
+
+
+def _get_dates(index: pd.Index) -> pd.DatetimeIndex:
+    # histories hold naive dates, bars of a tz-aware index keep their local dates and times
+    # instead of being converted to UTC, which could move a daily bar to the day before
+    dates = pd.DatetimeIndex(index)
+    return dates.tz_localize(None) if dates.tz is not None else dates
@@ -1,12 +1,14 @@
+import numpy as np
 import pandas as pd
 import pytest
-from stock_trader.simulation.simulator import TradingSimulator
+from stock_trader.simulation.simulator import TradingSimulator, VectorizedTradingSimulator
 from stock_trader.simulation.portfolio_manager import PortfolioException, PortfolioManager
+from stock_trader.trading_algorithms.indicator_graph import NodeResults
 from stock_trader.trading_algorithms.signals import Signal
 
 
 class FakeSignal(Signal):
-    def generate_signals(self, data: pd.DataFrame) -> str:
+    def generate_signals(self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
         column = "FakeSignal"
         data.loc[data.index == "2022-01-01", column] = 0.0
         data.loc[data.index == "2022-01-02", column] = 1.0
@@ -39,9 +41,34 @@ def portfolio_manager():
     return PortfolioManager()
 
 
-@pytest.fixture
-def trading_simulator(portfolio_manager: PortfolioManager, signal: Signal):
-    return TradingSimulator(signal, portfolio_manager)
+@pytest.fixture(params=[TradingSimulator, VectorizedTradingSimulator])
+def trading_simulator(request: pytest.FixtureRequest, portfolio_manager: PortfolioManager, signal: Signal):
+    return request.param(signal, portfolio_manager)
+
+
+class RandomSignal(Signal):
+    def __init__(self, seed: int) -> None:
+        self._rng = np.random.default_rng(seed)
+
+    def generate_signals(self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
+        column = "RandomSignal"
+        data[column] = self._rng.choice([-1.0, 0.0, 1.0, np.nan], size=len(data), p=[0.2, 0.5, 0.25, 0.05])
+        return column
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("initial_capital", [0.0, 150.0, 10000.0])
+def test_vectorized_simulator_matches_loop(seed: int, initial_capital: float) -> None:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.05, size=2000)))
+    data = pd.DataFrame({"Close": close}, index=pd.date_range("2000-01-01", periods=len(close)))
+
+    loop = TradingSimulator(RandomSignal(seed), PortfolioManager())
+    loop.simulate(data.copy(), "AAPL", initial_capital)
+    vectorized = VectorizedTradingSimulator(RandomSignal(seed), PortfolioManager())
+    vectorized.simulate(data.copy(), "AAPL", initial_capital)
+
+    assert vectorized.history == loop.history
 
 
 def test_simulator_buy_sell(data: pd.DataFrame, trading_simulator: TradingSimulator):
@@ -62,3 +89,25 @@ def test_simulator_no_capital(data: pd.DataFrame, trading_simulator: TradingSimu
 
     # Check if the portfolio value remains zero throughout the simulation
     assert all(item.value == 0.0 for item in trading_simulator.history)
+
+
+@pytest.mark.parametrize("simulator_cls", [TradingSimulator, VectorizedTradingSimulator])
+def test_bars_of_a_tz_aware_index_keep_their_local_dates(simulator_cls: type[TradingSimulator]) -> None:
+    close = np.linspace(100.0, 110.0, 50)
+    data = pd.DataFrame({"Close": close}, index=pd.date_range("2023-01-02", periods=len(close), freq="D"))
+    naive = simulator_cls(RandomSignal(0), PortfolioManager())
+    naive.simulate(data.copy(), "7203", 10000.0)
+    aware = simulator_cls(RandomSignal(0), PortfolioManager())
+    aware.simulate(data.tz_localize("Asia/Tokyo"), "7203", 10000.0)
+    assert aware.history == naive.history
+
+
+# a missing close on a bar without a trade, on a buy and on a sell
+@pytest.mark.parametrize("bar", [0, 1, 3])
+def test_simulators_reject_missing_close_prices(
+    data: pd.DataFrame, trading_simulator: TradingSimulator, bar: int
+) -> None:
+    data["Close"] = data["Close"].astype(float)
+    data.iloc[bar, data.columns.get_loc("Close")] = np.nan
+    with pytest.raises(ValueError, match="AAPL has no Close price on 1 bar"):
+        trading_simulator.simulate(data, "AAPL", initial_capital=10000.0)
@@ -0,0 +1,59 @@
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from stock_trader.acquisition.market_panel import MarketPanel
+from stock_trader.trading_algorithms.indicator_graph import SourceColumn
+from stock_trader.trading_algorithms.indicators import Indicator
+
+
+def compute_batched(indicator: Indicator, data: MarketPanel | Mapping[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    Compute an indicator for a whole universe of tickers at once.
+
+    The indicator's graph is evaluated a single time on dates x tickers arrays, every pandas operation it
+    consists of then runs over all tickers in one call. Tickers may start trading at different dates or
+    miss bars, each one is computed over its own bars only, exactly as if it was computed on its own.
+
+    Args:
+    - indicator (Indicator): Any indicator, e.g. SimpleMovingAverage or MovingAverageConvergenceDivergence.
+    - data: MarketPanel or mapping of column names (e.g. "Close") to dates x tickers arrays, NaN for missing bars.
+
+    Returns:
+    - Indicator columns mapped to dates x tickers arrays, NaN where a ticker has no bar
+    """
+    fields = {field: data.field(field) for field in data.fields} if isinstance(data, MarketPanel) else data
+    graph = indicator.graph
+    source_columns = sorted({node.column for node in graph.schedule() if isinstance(node, SourceColumn)})
+    present = ~np.any([np.isnan(fields[column]) for column in source_columns], axis=0)
+
+    if present.all():
+        packed = {column: pd.DataFrame(fields[column]) for column in source_columns}
+        return {column: result.to_numpy() for column, result in graph.evaluate(packed).items()}  # type: ignore
+
+    # move the bars of every ticker to the top of its column, missing ones end up as trailing NaNs
+    order = _get_packing_order(present)
+    packed = {
+        column: pd.DataFrame(np.where(present, fields[column], np.nan)[order, np.arange(present.shape[1])])
+        for column in source_columns
+    }
+    result = {}
+    for column, packed_result in graph.evaluate(packed).items():  # type: ignore
+        unpacked = np.empty(present.shape)
+        unpacked[order, np.arange(present.shape[1])] = packed_result.to_numpy()
+        unpacked[~present] = np.nan
+        result[column] = unpacked
+    return result
+
+
+def _get_packing_order(present: np.ndarray) -> np.ndarray:
+    # row of the input that ends up at each row of the packed array
+    first = present.argmax(axis=0)
+    count = present.sum(axis=0)
+    last = len(present) - 1 - present[::-1].argmax(axis=0)
+    if np.all((count == 0) | (last - first + 1 == count)):
+        # the common case of tickers trading without gaps after listing just needs every column rotated
+        rotated: np.ndarray = (np.arange(len(present))[:, np.newaxis] + first) % len(present)
+        return rotated
+    return np.argsort(~present, axis=0, kind="stable")
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_trader.acquisition.market_panel import MarketPanel
+from stock_trader.trading_algorithms.batched_indicators import compute_batched
+from stock_trader.trading_algorithms.indicators import (
+    ExponentialMovingAverage,
+    Indicator,
+    MovingAverageConvergenceDivergence,
+    RelativeStrengthIndex,
+    SimpleMovingAverage,
+)
+
+INDICATORS = [
+    SimpleMovingAverage(window_size=20),
+    ExponentialMovingAverage(window_size=5),
+    RelativeStrengthIndex(window_size=14),
+    MovingAverageConvergenceDivergence(),
+]
+
+
+def _make_close(listing_rows: list[int], length: int = 300, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    close: np.ndarray = 100 + np.cumsum(rng.normal(size=(length, len(listing_rows))), axis=0)
+    for column, first_row in enumerate(listing_rows):
+        close[:first_row, column] = np.nan
+    return close
+
+
+def _compute_single(indicator: Indicator, close: np.ndarray) -> dict[str, np.ndarray]:
+    present = ~np.isnan(close)
+    data = pd.DataFrame({"Close": close[present]})
+    columns = indicator.graph.outputs
+    indicator.compute(data)
+    result = {}
+    for column in columns:
+        expanded = np.full(len(close), np.nan)
+        expanded[present] = data[column].to_numpy()
+        result[column] = expanded
+    return result
+
+
+@pytest.mark.parametrize("indicator", INDICATORS, ids=lambda indicator: type(indicator).__name__)
+def test_batched_indicator_matches_per_ticker_computation(indicator: Indicator) -> None:
+    close = _make_close([0, 10, 150, 290, 300])
+    close[200:205, 1] = np.nan  # a trading halt
+    batched = compute_batched(indicator, {"Close": close})
+    for ticker in range(close.shape[1]):
+        for column, expected in _compute_single(indicator, close[:, ticker]).items():
+            np.testing.assert_allclose(batched[column][:, ticker], expected, rtol=1e-12, equal_nan=True)
+
+
+def test_batched_indicator_accepts_market_panel() -> None:
+    close = _make_close([0, 0])
+    frames = {
+        ticker: pd.DataFrame(
+            {"Open": close[:, i], "High": close[:, i], "Low": close[:, i], "Close": close[:, i], "Volume": 1.0},
+            index=pd.date_range("2020-01-01", periods=len(close)),
+        )
+        for i, ticker in enumerate(["A", "B"])
+    }
+    batched = compute_batched(SimpleMovingAverage(window_size=10), MarketPanel.from_frames(frames))
+    expected = frames["B"]["Close"].rolling(window=10).mean().to_numpy()
+    np.testing.assert_allclose(batched["SMA_10"][:, 1], expected, equal_nan=True)
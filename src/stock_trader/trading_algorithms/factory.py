@@ -1,4 +1,6 @@
-from typing import Callable
+from typing import Callable, TypeVar
+from stock_trader.settings import APP_SETTINGS
+from stock_trader.trading_algorithms.indicator_cache import CachedIndicator, CachedSignal, IndicatorCache
 from stock_trader.trading_algorithms.indicators import (
     ExponentialMovingAverage,
     Indicator,
@@ -13,27 +15,56 @@ from stock_trader.trading_algorithms.signals import (
     Signal,
 )
 
-_indicator_map = {
-    "SMA_200": SimpleMovingAverage(),
-    "EMA_5": ExponentialMovingAverage(),
-    "RSI_14": RelativeStrengthIndex(),
-    "MACD": MovingAverageConvergenceDivergence(),
+T = TypeVar("T")
+
+# shared by everything the factories produce, so plotting and backtesting the same data reuse results,
+# created on first use so that importing the factories does not read the settings
+_indicator_cache: IndicatorCache | None = None
+
+# names are a kind optionally followed by its parameters, e.g. SMA_50 or MACD_8_21_5,
+# a bare kind uses the parameters below
+_indicator_kinds: dict[str, Callable[..., Indicator]] = {
+    "SMA": lambda window_size=200: SimpleMovingAverage(window_size),
+    "EMA": lambda window_size=5: ExponentialMovingAverage(window_size, span=window_size),
+    "RSI": lambda window_size=14: RelativeStrengthIndex(window_size),
+    "MACD": MovingAverageConvergenceDivergence,
 }
 
 
+def get_indicator_cache() -> IndicatorCache:
+    global _indicator_cache
+    if _indicator_cache is None:
+        _indicator_cache = IndicatorCache(APP_SETTINGS.indicator_cache_size, APP_SETTINGS.indicator_cache_folder)
+    return _indicator_cache
+
+
 def indicator_factory(indicator_name: str) -> Indicator:
-    return _indicator_map[indicator_name.upper()]
+    return CachedIndicator(_create(_indicator_kinds, indicator_name), get_indicator_cache())
 
 
-_signal_map = {
-    "MACD": MovingAverageConvergenceDivergenceSignal(),
-    "RSI": RelativeStrengthIndexSignal(),
-    "MovingAveragCrossover": MovingAverageCrossoverSignal(),
+# signal parameters: MACD_<short>_<long>_<signal>, RSI_<window>_<oversold>_<overbought>,
+# MOVINGAVERAGECROSSOVER_<short>_<long>
+_signal_kinds: dict[str, Callable[..., Signal]] = {
+    "MACD": MovingAverageConvergenceDivergenceSignal,
+    "RSI": RelativeStrengthIndexSignal,
+    "MOVINGAVERAGECROSSOVER": MovingAverageCrossoverSignal,
 }
 
 
-def signal_factory(signal_name: str) -> Signal:
-    return _signal_map[signal_name.upper()]
+def signal_factory(signal_name: str, cached: bool = True) -> Signal:
+    # uncached signals suit computations done only once, e.g. one per parameter combination
+    signal = _create(_signal_kinds, signal_name)
+    return CachedSignal(signal, get_indicator_cache()) if cached else signal
+
+
+def _create(kinds: dict[str, Callable[..., T]], name: str) -> T:
+    kind, *params = name.upper().split("_")
+    if kind not in kinds:
+        raise KeyError(name)
+    try:
+        return kinds[kind](*(int(param) for param in params))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"invalid parameters in {name}") from e
 
 
 IndicatorFactory = Callable[[str], Indicator]
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from stock_trader.trading_algorithms.factory import indicator_factory, signal_factory
+
+
+def test_indicator_name_parameters_are_used() -> None:
+    assert indicator_factory("SMA_50").graph.outputs.keys() == {"SMA_50"}
+    assert indicator_factory("sma").graph.outputs.keys() == {"SMA_200"}
+    assert indicator_factory("MACD_8_21_5").columns_for_plot[-2:] == ["EMA_8", "EMA_21"]
+
+
+def test_signal_name_parameters_are_used(sample_data_from_file: pd.DataFrame) -> None:
+    assert signal_factory("RSI_7_20_80").generate_signals(sample_data_from_file) == "Signal_RSI_7"
+    assert signal_factory("MACD_8_21_5").generate_signals(sample_data_from_file) == "Signal_MACD_8_21_5"
+    crossover = signal_factory("MovingAverageCrossover_5_50").generate_signals(sample_data_from_file)
+    assert crossover == "Signal_EMA5_SMA50"
+
+
+def test_unknown_or_invalid_names_rejected() -> None:
+    with pytest.raises(KeyError):
+        indicator_factory("WMA_5")
+    with pytest.raises(ValueError):
+        indicator_factory("SMA_five")
+    with pytest.raises(ValueError):
+        signal_factory("MovingAverageCrossover_1_2_3")
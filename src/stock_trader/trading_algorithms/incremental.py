@@ -0,0 +1,195 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Generic, Mapping, NamedTuple, Self, TypeVar
+
+T = TypeVar("T")
+
+Bar = Mapping[str, float] | float
+
+
+class IncrementalIndicator(ABC, Generic[T]):
+    """
+    Indicator updated one bar at a time in constant time and memory.
+
+    Feeding the bars of a history one by one to update() gives the same values as the batch indicator
+    computed over the whole history, so signals can be evaluated on live bars without reloading it.
+    """
+
+    def __init__(self: Self, column_name: str = "Close") -> None:
+        self._column_name = column_name
+
+    @abstractmethod
+    def update(self: Self, bar: Bar) -> T:
+        """
+        Add the next bar.
+
+        Args:
+        - bar: Row with the indicator's column (e.g. a dict or a row of the OHLCV DataFrame) or a plain value.
+
+        Returns:
+        - Value of the indicator at this bar, NaN while there are not enough bars yet
+        """
+        ...
+
+    def _get_value(self: Self, bar: Bar) -> float:
+        if isinstance(bar, (int, float)):
+            return float(bar)
+        return float(bar[self._column_name])
+
+
+class IncrementalSimpleMovingAverage(IncrementalIndicator[float]):
+    """
+    Counterpart of SimpleMovingAverage: a ring buffer of the last window_size values and their running sum.
+
+    NaN values are kept out of the sum and counted instead, the average is NaN while any is in the window.
+    """
+
+    def __init__(self: Self, window_size: int = 14, column_name: str = "Close") -> None:
+        super().__init__(column_name)
+        self._window_size = window_size
+        self._window = [0.0] * window_size
+        self._position = 0
+        self._count = 0
+        self._nan_count = 0
+        self._sum = 0.0
+        # Kahan compensation, so that the running sum does not drift over decades of bars
+        self._compensation = 0.0
+
+    def update(self: Self, bar: Bar) -> float:
+        value = self._get_value(bar)
+        dropped = self._window[self._position]
+        if math.isnan(dropped):
+            self._nan_count -= 1
+            dropped = 0.0
+        if math.isnan(value):
+            self._nan_count += 1
+            self._add(-dropped)
+        else:
+            self._add(value - dropped)
+        self._window[self._position] = value
+        self._position = (self._position + 1) % self._window_size
+        self._count += 1
+        if self._count < self._window_size or self._nan_count > 0:
+            return math.nan
+        return self._sum / self._window_size
+
+    def _add(self: Self, value: float) -> None:
+        corrected = value - self._compensation
+        total = self._sum + corrected
+        self._compensation = (total - self._sum) - corrected
+        self._sum = total
+
+
+class IncrementalExponentialMean(IncrementalIndicator[float]):
+    """
+    Counterpart of pandas' ewm(span=span, adjust=False, min_periods=min_periods).mean().
+
+    Leading NaN values are skipped, the average starts with the first valid value. Like in pandas, NaN
+    values after it repeat the average and still decay its weight against the next valid value.
+    """
+
+    def __init__(self: Self, span: int, min_periods: int = 0, column_name: str = "Close") -> None:
+        super().__init__(column_name)
+        self._alpha = 2.0 / (span + 1.0)
+        self._min_periods = min_periods
+        self._average = math.nan
+        self._weight = 1.0
+        self._count = 0
+
+    def update(self: Self, bar: Bar) -> float:
+        value = self._get_value(bar)
+        if math.isnan(value):
+            if self._count > 0:
+                self._weight *= 1.0 - self._alpha
+            return self._average if self._count >= max(self._min_periods, 1) else math.nan
+        if self._count == 0:
+            self._average = value
+        else:
+            weight = self._weight * (1.0 - self._alpha)
+            self._average = (weight * self._average + self._alpha * value) / (weight + self._alpha)
+            self._weight = 1.0
+        self._count += 1
+        return self._average if self._count >= self._min_periods else math.nan
+
+
+class IncrementalExponentialMovingAverage(IncrementalExponentialMean):
+    """
+    Counterpart of ExponentialMovingAverage, which smooths with its span whatever its window size.
+    """
+
+    def __init__(self: Self, window_size: int = 14, column_name: str = "Close", span: int = 5) -> None:
+        super().__init__(span=span, column_name=column_name)
+        self._window_size = window_size
+
+
+class IncrementalRelativeStrengthIndex(IncrementalIndicator[float]):
+    """
+    Counterpart of RelativeStrengthIndex: Wilder averages of gains and losses seeded with the plain mean
+    of the first window_size price changes. Changes from or to a NaN price count as no change.
+    """
+
+    def __init__(self: Self, window_size: int = 14, column_name: str = "Close") -> None:
+        super().__init__(column_name)
+        self._window_size = window_size
+        self._previous = math.nan
+        self._count = 0
+        self._average_gain = 0.0
+        self._average_loss = 0.0
+
+    def update(self: Self, bar: Bar) -> float:
+        value = self._get_value(bar)
+        delta = value - self._previous
+        self._previous = value
+        # comparisons with NaN are false, unlike max() which would pass it on
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        if self._count == 0:
+            pass
+        elif self._count <= self._window_size:
+            # sums of the first window_size changes, turned into their mean at the last one
+            self._average_gain += gain
+            self._average_loss += loss
+            if self._count == self._window_size:
+                self._average_gain /= self._window_size
+                self._average_loss /= self._window_size
+        else:
+            alpha = 1.0 / self._window_size
+            self._average_gain = (1.0 - alpha) * self._average_gain + alpha * gain
+            self._average_loss = (1.0 - alpha) * self._average_loss + alpha * loss
+        self._count += 1
+
+        if self._count <= self._window_size or (self._average_gain == 0.0 and self._average_loss == 0.0):
+            return math.nan
+        if self._average_loss == 0.0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self._average_gain / self._average_loss)
+
+
+class MACDValue(NamedTuple):
+    macd_line: float
+    signal_line: float
+    macd_histogram: float
+
+
+class IncrementalMovingAverageConvergenceDivergence(IncrementalIndicator[MACDValue]):
+    """
+    Counterpart of MovingAverageConvergenceDivergence.
+    """
+
+    def __init__(
+        self: Self,
+        short_window: int = 12,
+        long_window: int = 26,
+        signal_window: int = 9,
+        column_name: str = "Close",
+    ) -> None:
+        super().__init__(column_name)
+        self._short_ema = IncrementalExponentialMean(span=short_window, min_periods=short_window)
+        self._long_ema = IncrementalExponentialMean(span=long_window, min_periods=long_window)
+        self._signal_line = IncrementalExponentialMean(span=signal_window)
+
+    def update(self: Self, bar: Bar) -> MACDValue:
+        value = self._get_value(bar)
+        macd_line = self._short_ema.update(value) - self._long_ema.update(value)
+        signal_line = self._signal_line.update(macd_line)
+        return MACDValue(macd_line, signal_line, macd_line - signal_line)
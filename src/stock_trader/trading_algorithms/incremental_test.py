@@ -0,0 +1,83 @@
+import copy
+import math
+from typing import TypeVar
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_trader.trading_algorithms.incremental import (
+    IncrementalExponentialMean,
+    IncrementalExponentialMovingAverage,
+    IncrementalIndicator,
+    IncrementalMovingAverageConvergenceDivergence,
+    IncrementalRelativeStrengthIndex,
+    IncrementalSimpleMovingAverage,
+)
+from stock_trader.trading_algorithms.indicators import (
+    ExponentialMovingAverage,
+    Indicator,
+    MovingAverageConvergenceDivergence,
+    RelativeStrengthIndex,
+    SimpleMovingAverage,
+)
+
+T = TypeVar("T")
+
+
+def _feed(indicator: IncrementalIndicator[T], data: pd.DataFrame) -> list[T]:
+    return [indicator.update({"Close": close}) for close in data["Close"]]
+
+
+def _with_missing_bars(data: pd.DataFrame) -> pd.DataFrame:
+    # a leading gap, a single missing bar and a run of them
+    data = data.copy()
+    data.iloc[[0, 20, 300, 301, 302], data.columns.get_loc("Close")] = np.nan
+    return data
+
+
+@pytest.mark.parametrize("missing_bars", [False, True], ids=["complete", "missing bars"])
+@pytest.mark.parametrize(
+    "batch,incremental",
+    [
+        (SimpleMovingAverage(window_size=200), IncrementalSimpleMovingAverage(window_size=200)),
+        (SimpleMovingAverage(window_size=1), IncrementalSimpleMovingAverage(window_size=1)),
+        (ExponentialMovingAverage(window_size=5), IncrementalExponentialMovingAverage(window_size=5)),
+        (RelativeStrengthIndex(window_size=14), IncrementalRelativeStrengthIndex(window_size=14)),
+        (RelativeStrengthIndex(window_size=2), IncrementalRelativeStrengthIndex(window_size=2)),
+    ],
+)
+def test_incremental_indicator_matches_batch(
+    sample_data_from_file: pd.DataFrame, batch: Indicator, incremental: IncrementalIndicator, missing_bars: bool
+) -> None:
+    data = _with_missing_bars(sample_data_from_file) if missing_bars else sample_data_from_file
+    column = batch.compute(data)[0]
+    # the parameters are shared by every case, each feeds its own copy
+    np.testing.assert_allclose(_feed(copy.deepcopy(incremental), data), data[column], rtol=1e-9)
+
+
+@pytest.mark.parametrize("missing_bars", [False, True], ids=["complete", "missing bars"])
+def test_incremental_macd_matches_batch(sample_data_from_file: pd.DataFrame, missing_bars: bool) -> None:
+    data = _with_missing_bars(sample_data_from_file) if missing_bars else sample_data_from_file
+    MovingAverageConvergenceDivergence().compute(data)
+    values = np.array(_feed(IncrementalMovingAverageConvergenceDivergence(), data))
+    expected = data[["MACDLine", "SignalLine", "MACDHistogram"]].to_numpy()
+    np.testing.assert_allclose(values, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_moving_average_recovers_after_a_missing_bar() -> None:
+    sma = IncrementalSimpleMovingAverage(window_size=3)
+    values = [sma.update(value) for value in [1.0, 2.0, math.nan, 4.0, 5.0, 6.0, 7.0, 8.0]]
+    np.testing.assert_array_equal(values, [math.nan] * 5 + [5.0, 6.0, 7.0])
+
+
+def test_rsi_of_flat_prices_is_undefined() -> None:
+    rsi = IncrementalRelativeStrengthIndex(window_size=3)
+    assert all(math.isnan(rsi.update(10.0)) for _ in range(10))
+
+
+def test_exponential_mean_waits_for_min_periods() -> None:
+    ema = IncrementalExponentialMean(span=3, min_periods=2)
+    assert math.isnan(ema.update(math.nan))
+    assert math.isnan(ema.update(1.0))
+    assert ema.update(3.0) == 2.0
@@ -0,0 +1,226 @@
+import hashlib
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Self
+
+import numpy as np
+import pandas as pd
+
+from stock_trader.trading_algorithms.indicator_graph import IndicatorGraph, NodeResults
+from stock_trader.trading_algorithms.indicators import Indicator
+from stock_trader.trading_algorithms.signals import Signal
+from stock_trader.utils.profiling import count, profiled
+
+# columns whose content identifies the data indicators are computed from
+_SOURCE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+# name under which the returned column names are kept in on-disk entries
+_RETURNED_KEY = "__returned__"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+
+
+@dataclass(frozen=True)
+class _Entry:
+    returned: list[str]
+    columns: dict[str, np.ndarray]
+
+
+class IndicatorCache:
+    """
+    Results of indicator and signal computations keyed by what they depend on.
+
+    A key is made of the ticker, a fingerprint of the OHLCV data, the date range it covers and the class
+    and parameters of the computation. The most recently used max_entries results are kept in memory,
+    with cache_folder set every result is also written to disk, so it survives between runs.
+
+    The fingerprint hashes every row, it is computed once per DataFrame and reused for as long as the
+    frame lives and holds the same index and OHLCV arrays; writing into those arrays in place is not noticed.
+    """
+
+    def __init__(self: Self, max_entries: int = 128, cache_folder: Path | None = None) -> None:
+        self._max_entries = max_entries
+        self._cache_folder = None if cache_folder is None else Path(cache_folder)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+        # id of a live frame -> its ticker, length and arrays when its fingerprint was computed, and the fingerprint
+        self._fingerprints: dict[int, tuple[tuple[Any, ...], bytes]] = {}
+
+    @property
+    def stats(self: Self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._stats.hits, self._stats.misses, self._stats.disk_hits)
+
+    def clear(self: Self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStats()
+
+    def compute(
+        self: Self,
+        computation: Indicator | Signal,
+        data: pd.DataFrame,
+        compute: Callable[[pd.DataFrame], str | list[str]],
+    ) -> list[str]:
+        """
+        Add the columns computed by compute(data) to data, taking them from the cache when possible.
+
+        Args:
+        - computation: Indicator or signal whose class and parameters are part of the key.
+        - data (DataFrame): Stock data that will be augmented with the computed columns.
+        - compute: Callable doing the computation when the result is not cached.
+
+        Returns:
+        - Whatever compute returned, as a list of column names
+        """
+        key = self._make_key(computation, data)
+        entry = self._get(key)
+        if entry is None:
+            before = data.copy()
+            result = compute(data)
+            returned = [result] if isinstance(result, str) else list(result)
+            # columns the computation overwrote are written back on a hit just like the ones it added
+            written = {
+                column: data[column].to_numpy(copy=True)
+                for column in data.columns
+                if column not in before.columns or not data[column].equals(before[column])
+            }
+            entry = _Entry(returned, written)
+            self._put(key, entry)
+        else:
+            for column, values in entry.columns.items():
+                data[column] = values
+        return list(entry.returned)
+
+    def _get(self: Self, key: str) -> _Entry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                count("indicator_cache_hits")
+                return entry
+        entry = self._load_from_disk(key)
+        with self._lock:
+            if entry is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+                self._stats.disk_hits += 1
+                self._remember(key, entry)
+        count("indicator_cache_misses" if entry is None else "indicator_cache_hits")
+        return entry
+
+    def _put(self: Self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            self._remember(key, entry)
+        self._store_on_disk(key, entry)
+
+    def _remember(self: Self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_from_disk(self: Self, key: str) -> _Entry | None:
+        if self._cache_folder is None:
+            return None
+        try:
+            with np.load(self._cache_folder / f"{key}.npz") as stored:
+                returned = [str(column) for column in stored[_RETURNED_KEY]]
+                columns = {column: stored[column] for column in stored.files if column != _RETURNED_KEY}
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return None
+        return _Entry(returned, columns)
+
+    def _store_on_disk(self: Self, key: str, entry: _Entry) -> None:
+        if self._cache_folder is None:
+            return
+        self._cache_folder.mkdir(parents=True, exist_ok=True)
+        # written under a temporary name first, so that readers never see half-written entries
+        staging = self._cache_folder / f".{key}.{uuid.uuid4().hex}.npz"
+        np.savez(staging, **{_RETURNED_KEY: np.array(entry.returned, dtype=str)}, **entry.columns)
+        staging.replace(self._cache_folder / f"{key}.npz")
+
+    def _make_key(self: Self, computation: Indicator | Signal, data: pd.DataFrame) -> str:
+        params = sorted((name, repr(value)) for name, value in vars(computation).items())
+        key = hashlib.blake2b(digest_size=20)
+        key.update(self._get_fingerprint(data))
+        key.update(repr((type(computation).__module__, type(computation).__qualname__, params)).encode())
+        return key.hexdigest()
+
+    def _get_fingerprint(self: Self, data: pd.DataFrame) -> bytes:
+        source_columns = [column for column in _SOURCE_COLUMNS if column in data.columns]
+        # a frame given a new index or new columns holds new arrays, its fingerprint is then computed again
+        arrays = [_get_address(data.index), *(_get_address(data[column]) for column in source_columns)]
+        identity = (data.attrs.get("ticker", ""), len(data), *arrays)
+        with self._lock:
+            memoized = self._fingerprints.get(id(data))
+        if memoized is not None and memoized[0] == identity:
+            return memoized[1]
+
+        row_hashes = pd.util.hash_pandas_object(data[source_columns], index=True).to_numpy()
+        date_range = (str(data.index[0]), str(data.index[-1])) if len(data) > 0 else ("", "")
+        fingerprint = hashlib.blake2b(digest_size=20)
+        fingerprint.update(repr((data.attrs.get("ticker", ""), date_range, len(data), source_columns)).encode())
+        fingerprint.update(row_hashes.tobytes())
+        with self._lock:
+            if id(data) not in self._fingerprints:
+                # the id may be reused by another frame once this one is gone
+                weakref.finalize(data, self._fingerprints.pop, id(data), None)
+            self._fingerprints[id(data)] = (identity, fingerprint.digest())
+        return fingerprint.digest()
+
+    def __getstate__(self: Self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        # ids of frames of this process mean nothing to another one
+        state["_fingerprints"] = {}
+        return state
+
+    def __setstate__(self: Self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class CachedIndicator(Indicator):
+    def __init__(self: Self, indicator: Indicator, cache: IndicatorCache) -> None:
+        self._indicator = indicator
+        self._cache = cache
+
+    @profiled("indicator", ticker_arg=1)
+    def compute(self: Self, data: pd.DataFrame, results: NodeResults | None = None) -> list[str]:
+        return self._cache.compute(self._indicator, data, lambda data: self._indicator.compute(data, results))
+
+    @property
+    def graph(self: Self) -> IndicatorGraph:
+        return self._indicator.graph
+
+    @property
+    def columns_for_plot(self: Self) -> list[str]:
+        return self._indicator.columns_for_plot
+
+
+class CachedSignal(Signal):
+    def __init__(self: Self, signal: Signal, cache: IndicatorCache) -> None:
+        self._signal = signal
+        self._cache = cache
+
+    def generate_signals(self: Self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
+        return self._cache.compute(self._signal, data, lambda data: self._signal.generate_signals(data, results))[0]
+
+
+def _get_address(values: pd.Index | pd.Series) -> int:
+    # tz-aware dates would be converted to a new array of objects, their integers are the array the index holds
+    array = values.asi8 if isinstance(values, pd.DatetimeIndex) else np.asarray(values)
+    address: int = array.__array_interface__["data"][0]
+    return address
@@ -0,0 +1,116 @@
+import gc
+import pickle
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from stock_trader.trading_algorithms import factory
+from stock_trader.trading_algorithms.indicator_cache import CachedIndicator, CachedSignal, IndicatorCache
+from stock_trader.trading_algorithms.indicators import MovingAverageConvergenceDivergence, SimpleMovingAverage
+from stock_trader.trading_algorithms.signals import MovingAverageConvergenceDivergenceSignal
+
+
+@pytest.fixture
+def ohlcv(sample_data_from_file: pd.DataFrame) -> pd.DataFrame:
+    return sample_data_from_file[["Open", "High", "Low", "Close", "Volume"]]
+
+
+def test_repeated_computation_is_served_from_memory(ohlcv: pd.DataFrame) -> None:
+    cache = IndicatorCache()
+    indicator = CachedIndicator(MovingAverageConvergenceDivergence(), cache)
+    first = ohlcv.copy()
+    second = ohlcv.copy()
+    assert indicator.compute(first) == ["MACDLine", "SignalLine", "MACDHistogram"]
+    assert indicator.compute(second) == ["MACDLine", "SignalLine", "MACDHistogram"]
+    pd.testing.assert_frame_equal(first, second)
+    assert "EMA_26" in second.columns
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_overwritten_columns_are_written_back_on_a_hit(ohlcv: pd.DataFrame) -> None:
+    cache = IndicatorCache()
+    indicator = CachedIndicator(SimpleMovingAverage(window_size=5), cache)
+    first = ohlcv.assign(SMA_5=0.0)
+    second = ohlcv.assign(SMA_5=0.0)
+    indicator.compute(first)
+    indicator.compute(second)
+    pd.testing.assert_frame_equal(first, second)
+    assert (second["SMA_5"].dropna() != 0.0).all()
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_different_params_or_data_miss(ohlcv: pd.DataFrame) -> None:
+    cache = IndicatorCache()
+    CachedIndicator(SimpleMovingAverage(window_size=5), cache).compute(ohlcv.copy())
+    CachedIndicator(SimpleMovingAverage(window_size=10), cache).compute(ohlcv.copy())
+    CachedIndicator(SimpleMovingAverage(window_size=5), cache).compute(ohlcv.iloc[1:].copy())
+    changed = ohlcv.copy()
+    changed.loc[changed.index[-1], "Close"] += 1.0
+    CachedIndicator(SimpleMovingAverage(window_size=5), cache).compute(changed)
+    other_ticker = ohlcv.copy()
+    other_ticker.attrs["ticker"] = "GE"
+    CachedIndicator(SimpleMovingAverage(window_size=5), cache).compute(other_ticker)
+    assert (cache.stats.hits, cache.stats.misses) == (0, 5)
+
+
+def test_data_is_hashed_once_per_frame(ohlcv: pd.DataFrame, monkeypatch: pytest.MonkeyPatch) -> None:
+    hashed: list[int] = []
+    hash_pandas_object = pd.util.hash_pandas_object
+
+    def counting_hash_pandas_object(data: pd.DataFrame, **kwargs: Any) -> pd.Series:
+        hashed.append(len(data))
+        return hash_pandas_object(data, **kwargs)
+
+    monkeypatch.setattr(pd.util, "hash_pandas_object", counting_hash_pandas_object)
+    cache = IndicatorCache()
+    data = ohlcv.copy()
+    for window_size in [5, 10, 20]:
+        CachedIndicator(SimpleMovingAverage(window_size=window_size), cache).compute(data)
+    assert len(hashed) == 1
+
+    # new arrays, e.g. a replaced column, are hashed again
+    data["Close"] = data["Close"] + 1.0
+    CachedIndicator(SimpleMovingAverage(window_size=5), cache).compute(data)
+    assert len(hashed) == 2
+    assert (cache.stats.hits, cache.stats.misses) == (0, 4)
+
+    del data
+    gc.collect()
+    assert not cache._fingerprints
+
+
+def test_least_recently_used_results_are_dropped(ohlcv: pd.DataFrame) -> None:
+    cache = IndicatorCache(max_entries=2)
+    for window_size in [5, 10, 5, 20, 10]:
+        CachedIndicator(SimpleMovingAverage(window_size=window_size), cache).compute(ohlcv.copy())
+    assert (cache.stats.hits, cache.stats.misses) == (1, 4)
+
+
+def test_results_on_disk_are_shared_between_caches(ohlcv: pd.DataFrame, tmp_path: Path) -> None:
+    expected = ohlcv.copy()
+    signal = CachedSignal(MovingAverageConvergenceDivergenceSignal(), IndicatorCache(cache_folder=tmp_path))
+    signal_column = signal.generate_signals(expected)
+    cache = IndicatorCache(cache_folder=tmp_path)
+    data = ohlcv.copy()
+    assert CachedSignal(MovingAverageConvergenceDivergenceSignal(), cache).generate_signals(data) == signal_column
+    pd.testing.assert_frame_equal(data, expected)
+    assert (cache.stats.hits, cache.stats.disk_hits, cache.stats.misses) == (1, 1, 0)
+
+
+def test_cache_can_be_sent_to_other_processes(ohlcv: pd.DataFrame) -> None:
+    cache = IndicatorCache()
+    CachedIndicator(SimpleMovingAverage(window_size=5), cache).compute(ohlcv.copy())
+    copied = pickle.loads(pickle.dumps(cache))
+    CachedIndicator(SimpleMovingAverage(window_size=5), copied).compute(ohlcv.copy())
+    assert copied.stats.hits == 1
+
+
+def test_factories_share_the_cache(ohlcv: pd.DataFrame, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = IndicatorCache()
+    monkeypatch.setattr(factory, "_indicator_cache", cache)
+    factory.indicator_factory("macd").compute(ohlcv.copy())
+    factory.signal_factory("MACD").generate_signals(ohlcv.copy())
+    factory.signal_factory("MACD").generate_signals(ohlcv.copy())
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
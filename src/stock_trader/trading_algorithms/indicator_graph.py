@@ -0,0 +1,183 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Mapping, Self
+
+import numpy as np
+import pandas as pd
+
+# results of already evaluated nodes, valid for the one DataFrame they were computed on
+NodeResults = dict["Node", pd.Series]
+
+
+class Node(ABC):
+    """
+    Single step of an indicator computation.
+
+    Nodes are frozen dataclasses, so two nodes of the same kind with the same parameters and the same
+    inputs compare and hash equal and are computed only once.
+    """
+
+    @property
+    def inputs(self: Self) -> tuple["Node", ...]:
+        return ()
+
+    @abstractmethod
+    def evaluate(self: Self, data: pd.DataFrame, inputs: list[pd.Series]) -> pd.Series:
+        ...
+
+
+@dataclass(frozen=True)
+class SourceColumn(Node):
+    column: str
+
+    def evaluate(self: Self, data: pd.DataFrame, inputs: list[pd.Series]) -> pd.Series:
+        return data[self.column]
+
+
+@dataclass(frozen=True)
+class RollingMean(Node):
+    source: Node
+    window_size: int
+
+    @property
+    def inputs(self: Self) -> tuple[Node, ...]:
+        return (self.source,)
+
+    def evaluate(self: Self, data: pd.DataFrame, inputs: list[pd.Series]) -> pd.Series:
+        return inputs[0].rolling(window=self.window_size).mean()
+
+
+@dataclass(frozen=True)
+class ExponentialMean(Node):
+    source: Node
+    span: int
+    min_periods: int = 0
+
+    @property
+    def inputs(self: Self) -> tuple[Node, ...]:
+        return (self.source,)
+
+    def evaluate(self: Self, data: pd.DataFrame, inputs: list[pd.Series]) -> pd.Series:
+        return inputs[0].ewm(span=self.span, adjust=False, min_periods=self.min_periods).mean()
+
+
+@dataclass(frozen=True)
+class WilderRSI(Node):
+    source: Node
+    window_size: int
+
+    @property
+    def inputs(self: Self) -> tuple[Node, ...]:
+        return (self.source,)
+
+    def evaluate(self: Self, data: pd.DataFrame, inputs: list[pd.Series]) -> pd.Series:
+        delta = inputs[0].diff(1)
+        gain = delta.clip(lower=0).fillna(0)
+        loss = (-delta.clip(upper=0).fillna(0)).replace(-0.0, 0.0)
+        avg_gain = wilder_smoothing(gain.to_numpy(dtype=np.float64), self.window_size)
+        avg_loss = wilder_smoothing(loss.to_numpy(dtype=np.float64), self.window_size)
+        # bars before the window is filled have 0 / 0 averages and end up as NaN, like zero losses end up as 100
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / avg_loss
+        rsi: np.ndarray = 100 - (100 / (1 + rs))
+        if isinstance(inputs[0], pd.DataFrame):
+            return pd.DataFrame(rsi, index=inputs[0].index, columns=inputs[0].columns)
+        return pd.Series(rsi, index=inputs[0].index)
+
+
+@dataclass(frozen=True)
+class Difference(Node):
+    left: Node
+    right: Node
+
+    @property
+    def inputs(self: Self) -> tuple[Node, ...]:
+        return (self.left, self.right)
+
+    def evaluate(self: Self, data: pd.DataFrame, inputs: list[pd.Series]) -> pd.Series:
+        return inputs[0] - inputs[1]
+
+
+class IndicatorGraph:
+    """
+    Output columns mapped to the nodes computing them.
+
+    compute() evaluates every distinct node reachable from the outputs exactly once, inputs before the
+    nodes using them, and writes the outputs into the data. Passing the same results dict to several
+    compute() calls on one DataFrame shares intermediate series between them.
+    """
+
+    def __init__(self: Self, outputs: Mapping[str, Node] | None = None) -> None:
+        self._outputs: dict[str, Node] = {}
+        for column, node in (outputs or {}).items():
+            self.add(column, node)
+
+    def add(self: Self, column: str, node: Node) -> None:
+        existing = self._outputs.get(column)
+        if existing is not None and existing != node:
+            raise ValueError(f"column {column} is already computed by {existing}")
+        self._outputs[column] = node
+
+    def merge(self: Self, other: "IndicatorGraph") -> None:
+        for column, node in other.outputs.items():
+            self.add(column, node)
+
+    @property
+    def outputs(self: Self) -> dict[str, Node]:
+        return self._outputs
+
+    def schedule(self: Self) -> list[Node]:
+        # depth first post-order, so every node comes after all of its inputs
+        scheduled: dict[Node, None] = {}
+        for output in self._outputs.values():
+            stack: list[tuple[Node, bool]] = [(output, False)]
+            while stack:
+                node, inputs_scheduled = stack.pop()
+                if node in scheduled:
+                    continue
+                if inputs_scheduled:
+                    scheduled[node] = None
+                else:
+                    stack.append((node, True))
+                    stack.extend((node_input, False) for node_input in reversed(node.inputs))
+        return list(scheduled)
+
+    def compute(self: Self, data: pd.DataFrame, results: NodeResults | None = None) -> list[str]:
+        for column, values in self.evaluate(data, results).items():
+            data[column] = values
+        return list(self._outputs)
+
+    def evaluate(self: Self, data: pd.DataFrame, results: NodeResults | None = None) -> dict[str, pd.Series]:
+        # nodes only use pandas operations that also work column-wise on DataFrames, so data may as well
+        # map column names to dates x tickers DataFrames, every output is then one of those too
+        results = {} if results is None else results
+        for node in self.schedule():
+            if node not in results:
+                results[node] = node.evaluate(data, [results[node_input] for node_input in node.inputs])
+        return {column: results[node] for column, node in self._outputs.items()}
+
+
+def wilder_smoothing(values: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Wilder's running average along the first axis of values.
+
+    The average is seeded at index window_size with the mean of values[1 : window_size + 1] and then
+    follows avg[i] = (avg[i - 1] * (window_size - 1) + values[i]) / window_size, which is an exponential
+    moving average with alpha = 1 / window_size, so pandas' compiled ewm does the recurrence. Entries
+    before window_size are zero.
+
+    Args:
+    - values (ndarray): 1-D series or 2-D array with one series per column.
+    - window_size (int): Smoothing period.
+
+    Returns:
+    - ndarray of the same shape as values
+    """
+    smoothed = np.zeros(values.shape, dtype=np.float64)
+    if len(values) <= window_size:
+        return smoothed
+    tail = values[window_size:].astype(np.float64)
+    tail[0] = values[1 : window_size + 1].mean(axis=0)
+    recurrence = pd.DataFrame(tail.reshape(len(tail), -1)).ewm(alpha=1.0 / window_size, adjust=False).mean()
+    smoothed[window_size:] = recurrence.to_numpy().reshape(tail.shape)
+    return smoothed
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+from stock_trader.trading_algorithms.indicator_graph import (
+    Difference,
+    ExponentialMean,
+    IndicatorGraph,
+    NodeResults,
+    RollingMean,
+    SourceColumn,
+)
+from stock_trader.trading_algorithms.indicators import MovingAverageConvergenceDivergence
+from stock_trader.trading_algorithms.signals import (
+    MovingAverageConvergenceDivergenceSignal,
+    MovingAverageCrossoverSignal,
+    generate_all_signals,
+)
+
+
+def test_identical_nodes_are_scheduled_once() -> None:
+    close = SourceColumn("Close")
+    graph = IndicatorGraph(
+        {
+            "fast": ExponentialMean(SourceColumn("Close"), span=12),
+            "slow": ExponentialMean(close, span=26),
+            "spread": Difference(ExponentialMean(close, span=12), ExponentialMean(close, span=26)),
+            "same_spread": Difference(ExponentialMean(close, span=12), ExponentialMean(close, span=26)),
+        }
+    )
+    schedule = graph.schedule()
+    assert len(schedule) == 4
+    for position, node in enumerate(schedule):
+        assert all(schedule.index(node_input) < position for node_input in node.inputs)
+
+
+def test_nodes_with_different_params_are_not_merged() -> None:
+    close = SourceColumn("Close")
+    graph = IndicatorGraph({"a": ExponentialMean(close, span=12), "b": ExponentialMean(close, span=12, min_periods=12)})
+    assert len(graph.schedule()) == 3
+
+
+def test_column_can_not_be_computed_by_two_different_nodes() -> None:
+    graph = IndicatorGraph({"SMA": RollingMean(SourceColumn("Close"), 5)})
+    graph.add("SMA", RollingMean(SourceColumn("Close"), 5))
+    with pytest.raises(ValueError):
+        graph.add("SMA", RollingMean(SourceColumn("Close"), 10))
+
+
+def test_signals_share_intermediate_results(
+    sample_data_from_file: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    evaluated = []
+    original_evaluate = ExponentialMean.evaluate
+
+    def counting_evaluate(self: ExponentialMean, data: pd.DataFrame, inputs: list[pd.Series]) -> pd.Series:
+        evaluated.append(self)
+        return original_evaluate(self, data, inputs)
+
+    monkeypatch.setattr(ExponentialMean, "evaluate", counting_evaluate)
+    signals = [
+        MovingAverageConvergenceDivergenceSignal(),
+        MovingAverageCrossoverSignal(),
+        MovingAverageConvergenceDivergenceSignal(),
+    ]
+    columns = generate_all_signals(sample_data_from_file, signals)
+    assert columns == ["Signal_MACD_12_26_9", "Signal_EMA5_SMA200", "Signal_MACD_12_26_9"]
+    # EMA 12, EMA 26 and the MACD signal line, plus the crossover's EMA 5
+    assert len(evaluated) == 4
+
+
+def test_indicator_reuses_results_computed_on_same_data(sample_data_from_file: pd.DataFrame) -> None:
+    results: NodeResults = {}
+    MovingAverageConvergenceDivergenceSignal().generate_signals(sample_data_from_file, results)
+    computed = len(results)
+    expected = sample_data_from_file["MACDHistogram"].copy()
+    sample_data_from_file.drop(columns="MACDHistogram", inplace=True)
+    assert MovingAverageConvergenceDivergence().compute(sample_data_from_file, results) == [
+        "MACDLine",
+        "SignalLine",
+        "MACDHistogram",
+    ]
+    assert len(results) == computed
+    pd.testing.assert_series_equal(sample_data_from_file["MACDHistogram"], expected)
@@ -2,22 +2,42 @@ from abc import ABC, abstractmethod
 from typing import Self
 import pandas as pd
 
+from stock_trader.trading_algorithms.indicator_graph import (
+    Difference,
+    ExponentialMean,
+    IndicatorGraph,
+    NodeResults,
+    RollingMean,
+    SourceColumn,
+    WilderRSI,
+)
+from stock_trader.utils.profiling import profiled
+
 
 class Indicator(ABC):
     """
     Base class for indicators.
     """
 
-    @abstractmethod
-    def compute(self: Self, data: pd.DataFrame) -> list[str]:
+    @profiled("indicator", ticker_arg=1)
+    def compute(self: Self, data: pd.DataFrame, results: NodeResults | None = None) -> list[str]:
         """
         Compute the indicator.
 
         Args:
         - data (DataFrame): Stock data that will be augmented with the indicator column.
+        - results (dict): Optional results of nodes already computed on data, shared with other indicators.
 
         Returns:
-        - Nothing
+        - Names of the added columns
+        """
+        return self.graph.compute(data, results)
+
+    @property
+    @abstractmethod
+    def graph(self: Self) -> IndicatorGraph:
+        """
+        Columns the indicator adds mapped to the nodes computing them.
         """
         ...
 
@@ -32,10 +52,10 @@ class SimpleMovingAverage(Indicator):
         self._window_size = window_size
         self._column_name = column_name
 
-    def compute(self: Self, data: pd.DataFrame) -> list[str]:
-        sma_column = f"SMA_{self._window_size}"
-        data[sma_column] = data[self._column_name].rolling(window=self._window_size).mean()
-        return [sma_column]
+    @property
+    def graph(self: Self) -> IndicatorGraph:
+        node = RollingMean(SourceColumn(self._column_name), self._window_size)
+        return IndicatorGraph({f"SMA_{self._window_size}": node})
 
     @property
     def columns_for_plot(self: Self) -> list[str]:
@@ -43,15 +63,16 @@ class SimpleMovingAverage(Indicator):
 
 
 class ExponentialMovingAverage(Indicator):
-    def __init__(self: Self, window_size: int = 14, column_name: str = "Close") -> None:
+    def __init__(self: Self, window_size: int = 14, column_name: str = "Close", span: int = 5) -> None:
         self._window_size = window_size
         self._column_name = column_name
-        self._ema_span = 5
+        # the smoothing span is independent of the window size the column is named after
+        self._ema_span = span
 
-    def compute(self: Self, data: pd.DataFrame) -> list[str]:
-        ema_column = f"EMA_{self._window_size}"
-        data[ema_column] = data[self._column_name].ewm(span=self._ema_span, adjust=False).mean()
-        return [ema_column]
+    @property
+    def graph(self: Self) -> IndicatorGraph:
+        node = ExponentialMean(SourceColumn(self._column_name), self._ema_span)
+        return IndicatorGraph({f"EMA_{self._window_size}": node})
 
     @property
     def columns_for_plot(self: Self) -> list[str]:
@@ -63,24 +84,10 @@ class RelativeStrengthIndex(Indicator):
         self._window_size = window_size
         self._column_name = column_name
 
-    def compute(self: Self, data: pd.DataFrame) -> list[str]:
-        delta = data[self._column_name].diff(1)
-        gain = delta.clip(lower=0).fillna(0)
-        loss = (-delta.clip(upper=0).fillna(0)).replace(-0.0, 0.0)
-        avg_gain = pd.Series([0.0] * len(data))
-        avg_loss = pd.Series([0.0] * len(data))
-        avg_gain[self._window_size] = gain[1 : self._window_size + 1].mean()
-        avg_loss[self._window_size] = loss[1 : self._window_size + 1].mean()
-        for i in range(self._window_size + 1, len(data)):
-            avg_gain.iloc[i] = (avg_gain.iloc[i - 1] * (self._window_size - 1) + gain.iloc[i]) / (self._window_size)
-            avg_loss.iloc[i] = (avg_loss.iloc[i - 1] * (self._window_size - 1) + loss.iloc[i]) / (self._window_size)
-        rs = avg_gain / avg_loss
-
-        rsi_column = f"RSI_{self._window_size}"
-        rs.index = data.index  # make sure rs has the same index as data
-        data[rsi_column] = 100 - (100 / (1 + rs))
-
-        return [rsi_column]
+    @property
+    def graph(self: Self) -> IndicatorGraph:
+        node = WilderRSI(SourceColumn(self._column_name), self._window_size)
+        return IndicatorGraph({f"RSI_{self._window_size}": node})
 
     @property
     def columns_for_plot(self: Self) -> list[str]:
@@ -88,34 +95,34 @@ class RelativeStrengthIndex(Indicator):
 
 
 class MovingAverageConvergenceDivergence(Indicator):
-    def compute(self, data: pd.DataFrame) -> list[str]:
-        macd_line_column, signal_line_column, macd_histogram_column = (
-            "MACDLine",
-            "SignalLine",
-            "MACDHistogram",
-        )
-        ema_12_column, ema_26_column = "EMA_12", "EMA_26"
-
-        # Compute the 12-day and 26-day EMAs
-        data[ema_12_column] = data["Close"].ewm(span=12, adjust=False, min_periods=12).mean()
-        data[ema_26_column] = data["Close"].ewm(span=26, adjust=False, min_periods=26).mean()
-
-        # Compute the MACD line
-        macd_line = data[ema_12_column] - data[ema_26_column]
+    def __init__(self: Self, short_window: int = 12, long_window: int = 26, signal_window: int = 9) -> None:
+        self._short_window = short_window
+        self._long_window = long_window
+        self._signal_window = signal_window
 
-        # Compute the signal line
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
+    @profiled("indicator", ticker_arg=1)
+    def compute(self, data: pd.DataFrame, results: NodeResults | None = None) -> list[str]:
+        super().compute(data, results)
+        return ["MACDLine", "SignalLine", "MACDHistogram"]
 
-        # Compute the MACD histogram
-        macd_histogram = macd_line - signal_line
-
-        # Add the MACD-related columns to the DataFrame - TODO: pd.concat
-
-        data[macd_line_column] = macd_line
-        data[signal_line_column] = signal_line
-        data[macd_histogram_column] = macd_histogram
-        return [macd_line_column, signal_line_column, macd_histogram_column]
+    @property
+    def graph(self: Self) -> IndicatorGraph:
+        close = SourceColumn("Close")
+        # short and long EMAs, 12-day and 26-day by default
+        short_ema = ExponentialMean(close, span=self._short_window, min_periods=self._short_window)
+        long_ema = ExponentialMean(close, span=self._long_window, min_periods=self._long_window)
+        macd_line = Difference(short_ema, long_ema)
+        signal_line = ExponentialMean(macd_line, span=self._signal_window)
+        return IndicatorGraph(
+            {
+                f"EMA_{self._short_window}": short_ema,
+                f"EMA_{self._long_window}": long_ema,
+                "MACDLine": macd_line,
+                "SignalLine": signal_line,
+                "MACDHistogram": Difference(macd_line, signal_line),
+            }
+        )
 
     @property
     def columns_for_plot(self: Self) -> list[str]:
-        return ["MACDLine", "SignalLine", "MACDHistogram", "EMA_12", "EMA_26"]
+        return ["MACDLine", "SignalLine", "MACDHistogram", f"EMA_{self._short_window}", f"EMA_{self._long_window}"]
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from stock_trader.trading_algorithms.indicators import (
@@ -167,3 +168,34 @@ def test_macd_strategy(sample_data_from_file: pd.DataFrame) -> None:
     assert sample_data_from_file[macd_columns[0]].iloc[-1] == pytest.approx(4.979, rel=1e-3)
     assert sample_data_from_file[macd_columns[1]].iloc[-1] == pytest.approx(3.694, rel=1e-3)
     assert sample_data_from_file[macd_columns[2]].iloc[-1] == pytest.approx(1.284, rel=1e-3)
+
+
+def _reference_rsi(close: pd.Series, window_size: int) -> pd.Series:
+    # the original loop based implementation
+    delta = close.diff(1)
+    gain = delta.clip(lower=0).fillna(0)
+    loss = (-delta.clip(upper=0).fillna(0)).replace(-0.0, 0.0)
+    avg_gain = [0.0] * len(close)
+    avg_loss = [0.0] * len(close)
+    avg_gain[window_size] = gain.iloc[1 : window_size + 1].mean()
+    avg_loss[window_size] = loss.iloc[1 : window_size + 1].mean()
+    for i in range(window_size + 1, len(close)):
+        avg_gain[i] = (avg_gain[i - 1] * (window_size - 1) + gain.iloc[i]) / window_size
+        avg_loss[i] = (avg_loss[i - 1] * (window_size - 1) + loss.iloc[i]) / window_size
+    rs = pd.Series(avg_gain, index=close.index) / pd.Series(avg_loss, index=close.index)
+    return 100 - (100 / (1 + rs))
+
+
+@pytest.mark.parametrize("window_size", [2, 14, 30])
+def test_rsi_matches_loop_based_wilder_smoothing(window_size: int) -> None:
+    rng = np.random.default_rng(window_size)
+    data = pd.DataFrame({"Close": 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, size=10_000)))})
+    rsi_column = RelativeStrengthIndex(window_size=window_size).compute(data)[0]
+    expected = _reference_rsi(data["Close"], window_size)
+    assert data[rsi_column].iloc[:window_size].isna().all()
+    np.testing.assert_allclose(data[rsi_column].iloc[window_size:], expected.iloc[window_size:], rtol=1e-9)
+
+
+def test_rsi_when_window_too_long(sample_data: pd.DataFrame) -> None:
+    rsi_columns = RelativeStrengthIndex(window_size=14).compute(sample_data)
+    assert sample_data[rsi_columns[0]].isna().all()
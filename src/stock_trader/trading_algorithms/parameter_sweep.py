@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import Self, Sequence
+
+import numpy as np
+import pandas as pd
+
+from stock_trader.trading_algorithms.indicator_graph import wilder_smoothing
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """
+    Values of one indicator for many parameters as a bars x parameters array.
+
+    Column i of values holds the indicator computed with parameters[i], NaN where it is not defined yet.
+    """
+
+    parameters: np.ndarray
+    values: np.ndarray
+    index: pd.Index
+
+    def column(self: Self, parameter: int) -> np.ndarray:
+        return self.values[:, int(np.flatnonzero(self.parameters == parameter)[0])]
+
+    def to_frame(self: Self, prefix: str) -> pd.DataFrame:
+        # one column per parameter, named like the columns the indicators add, e.g. SMA_50
+        return pd.DataFrame(self.values, index=self.index, columns=[f"{prefix}_{p}" for p in self.parameters])
+
+
+def sweep_simple_moving_average(close: pd.Series, window_sizes: Sequence[int]) -> SweepResult:
+    """
+    Simple moving averages of close for every window size, all taken from one cumulative sum.
+
+    Args:
+    - close (Series): Prices to average.
+    - window_sizes: Window sizes, e.g. range(5, 251).
+
+    Returns:
+    - SweepResult, NaN before a window is filled and while it holds a NaN price like SimpleMovingAverage
+    """
+    windows = np.asarray(window_sizes, dtype=np.int64)
+    values = close.to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+    # the series is centered first, so that the cumulative sum stays small and keeps its precision
+    offset = float(np.nanmean(values)) if len(values) > 0 and not missing.all() else 0.0
+    cumulative = np.concatenate([[0.0], np.cumsum(np.where(missing, 0.0, values - offset))])
+    # NaN prices are left out of the sum and counted, so that they only spoil the windows holding them
+    cumulative_missing = np.concatenate([[0], np.cumsum(missing)])
+    ends = np.arange(1, len(values) + 1)[:, np.newaxis]
+    starts = np.maximum(ends - windows, 0)
+    averages = (cumulative[ends] - cumulative[starts]) / windows + offset
+    averages[(ends - windows < 0) | (cumulative_missing[ends] > cumulative_missing[starts])] = np.nan
+    return SweepResult(windows, averages, close.index)
+
+
+def sweep_exponential_moving_average(close: pd.Series, spans: Sequence[int]) -> SweepResult:
+    """
+    Exponential moving averages of close for every span.
+
+    Matches ExponentialMean nodes, i.e. pandas' ewm(span=span, adjust=False). The recurrence of every
+    span runs in pandas' compiled ewm, one pass over the bars per span, which is far cheaper than one
+    numpy operation per bar over all spans once there are more bars than spans.
+    """
+    spans_array = np.asarray(spans, dtype=np.int64)
+    averages = np.empty((len(close), len(spans_array)))
+    for i, span in enumerate(spans_array):
+        averages[:, i] = close.ewm(span=int(span), adjust=False).mean().to_numpy(dtype=np.float64)
+    return SweepResult(spans_array, averages, close.index)
+
+
+def sweep_relative_strength_index(close: pd.Series, window_sizes: Sequence[int]) -> SweepResult:
+    """
+    Relative strength indices of close for every window size.
+
+    Matches RelativeStrengthIndex: gains and losses are taken once for all windows, then smoothed with
+    wilder_smoothing for each window, one compiled pass over the bars per window like in the sweep of
+    exponential moving averages.
+    """
+    windows = np.asarray(window_sizes, dtype=np.int64)
+    delta = np.diff(close.to_numpy(dtype=np.float64), prepend=np.nan)
+    # comparisons with NaN are false, so changes from or to a NaN price count as no change like in WilderRSI
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    rsi = np.empty((len(delta), len(windows)))
+    for i, window_size in enumerate(windows):
+        average_gain = wilder_smoothing(gain, int(window_size))
+        average_loss = wilder_smoothing(loss, int(window_size))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi[:, i] = 100 - (100 / (1 + average_gain / average_loss))
+    return SweepResult(windows, rsi, close.index)
@@ -0,0 +1,71 @@
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_trader.trading_algorithms.indicators import (
+    ExponentialMovingAverage,
+    Indicator,
+    RelativeStrengthIndex,
+    SimpleMovingAverage,
+)
+from stock_trader.trading_algorithms.parameter_sweep import (
+    SweepResult,
+    sweep_exponential_moving_average,
+    sweep_relative_strength_index,
+    sweep_simple_moving_average,
+)
+
+
+@pytest.mark.parametrize("window_size", [1, 5, 14, 200])
+def test_sweep_simple_moving_average_matches_indicator(sample_data_from_file: pd.DataFrame, window_size: int) -> None:
+    sweep = sweep_simple_moving_average(sample_data_from_file["Close"], range(1, 251))
+    column = SimpleMovingAverage(window_size).compute(sample_data_from_file)[0]
+    np.testing.assert_allclose(sweep.column(window_size), sample_data_from_file[column], rtol=1e-9)
+    assert sweep.values.shape == (len(sample_data_from_file), 250)
+
+
+@pytest.mark.parametrize("span", [2, 5, 26])
+def test_sweep_exponential_moving_average_matches_indicator(sample_data_from_file: pd.DataFrame, span: int) -> None:
+    sweep = sweep_exponential_moving_average(sample_data_from_file["Close"], [2, 5, 12, 26])
+    column = ExponentialMovingAverage(span, span=span).compute(sample_data_from_file)[0]
+    np.testing.assert_allclose(sweep.column(span), sample_data_from_file[column], rtol=1e-9)
+
+
+@pytest.mark.parametrize("window_size", [2, 7, 14, 30])
+def test_sweep_relative_strength_index_matches_indicator(sample_data_from_file: pd.DataFrame, window_size: int) -> None:
+    sweep = sweep_relative_strength_index(sample_data_from_file["Close"], [2, 7, 14, 30])
+    column = RelativeStrengthIndex(window_size).compute(sample_data_from_file)[0]
+    np.testing.assert_allclose(sweep.column(window_size), sample_data_from_file[column], rtol=1e-9)
+
+
+def test_sweeps_match_indicators_around_missing_prices(sample_data_from_file: pd.DataFrame) -> None:
+    data = sample_data_from_file.copy()
+    data.iloc[[0, 20, 300, 301], data.columns.get_loc("Close")] = np.nan
+    sweeps: list[tuple[SweepResult, Callable[[int], Indicator]]] = [
+        (sweep_simple_moving_average(data["Close"], [1, 14, 50]), SimpleMovingAverage),
+        (
+            sweep_exponential_moving_average(data["Close"], [1, 14, 50]),
+            lambda span: ExponentialMovingAverage(span=span),
+        ),
+        (sweep_relative_strength_index(data["Close"], [1, 14, 50]), RelativeStrengthIndex),
+    ]
+    for sweep, indicator in sweeps:
+        for parameter in sweep.parameters:
+            column = indicator(int(parameter)).compute(data)[0]
+            np.testing.assert_allclose(sweep.column(parameter), data[column], rtol=1e-9)
+        # every column recovers after the missing prices
+        assert np.isfinite(sweep.values[-1]).all()
+
+
+def test_sweep_windows_longer_than_the_data_are_all_nan() -> None:
+    close = pd.Series([1.0, 2.0, 3.0])
+    assert np.isnan(sweep_simple_moving_average(close, [5]).values).all()
+    assert np.isnan(sweep_relative_strength_index(close, [5]).values).all()
+
+
+def test_sweep_result_to_frame() -> None:
+    frame = sweep_simple_moving_average(pd.Series([1.0, 2.0, 3.0]), [1, 2]).to_frame("SMA")
+    assert list(frame.columns) == ["SMA_1", "SMA_2"]
+    np.testing.assert_allclose(frame["SMA_2"], [np.nan, 1.5, 2.5])
@@ -4,6 +4,7 @@ from typing import Self
 import pandas as pd
 from pandas import DataFrame
 
+from stock_trader.trading_algorithms.indicator_graph import IndicatorGraph, NodeResults
 from stock_trader.trading_algorithms.indicators import (
     ExponentialMovingAverage,
     MovingAverageConvergenceDivergence,
@@ -14,17 +15,23 @@ from stock_trader.trading_algorithms.indicators import (
 
 class Signal(ABC):
     @abstractmethod
-    def generate_signals(self, data: pd.DataFrame) -> str:
+    def generate_signals(self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
         ...
 
 
+def generate_all_signals(data: pd.DataFrame, signals: list[Signal]) -> list[str]:
+    # indicators several signals depend on are computed only once
+    results: NodeResults = {}
+    return [signal.generate_signals(data, results) for signal in signals]
+
+
 class MovingAverageCrossoverSignal(Signal):
-    def __init__(self) -> None:
-        self._short_window_days = 5
-        self._long_window_days = 200
+    def __init__(self, short_window_days: int = 5, long_window_days: int = 200) -> None:
+        self._short_window_days = short_window_days
+        self._long_window_days = long_window_days
 
-    def generate_signals(self: Self, data: DataFrame) -> str:
-        short_ema_column, long_sma_column = self._calculate_indicators(data)
+    def generate_signals(self: Self, data: DataFrame, results: NodeResults | None = None) -> str:
+        short_ema_column, long_sma_column = self._calculate_indicators(data, results)
         return self._calculate_buy_sell_signal_from_indicators(data, short_ema_column, long_sma_column)
 
     def _calculate_buy_sell_signal_from_indicators(
@@ -35,35 +42,41 @@ class MovingAverageCrossoverSignal(Signal):
         data.loc[data[short_ema_column] <= data[long_sma_column], ma_crossover_column] = -1.0
         return ma_crossover_column
 
-    def _calculate_indicators(self: Self, data: pd.DataFrame) -> tuple[str, str]:
-        short_ema_column = ExponentialMovingAverage(window_size=self._short_window_days).compute(data)
-        long_sma_column = SimpleMovingAverage(window_size=self._long_window_days).compute(data)
-        return short_ema_column[0], long_sma_column[0]
+    def _calculate_indicators(self: Self, data: pd.DataFrame, results: NodeResults | None) -> tuple[str, str]:
+        graph = IndicatorGraph()
+        graph.merge(ExponentialMovingAverage(window_size=self._short_window_days, span=self._short_window_days).graph)
+        graph.merge(SimpleMovingAverage(window_size=self._long_window_days).graph)
+        short_ema_column, long_sma_column = graph.compute(data, results)
+        return short_ema_column, long_sma_column
 
 
 class RelativeStrengthIndexSignal(Signal):
-    def __init__(self) -> None:
-        self._window_size = 14
+    def __init__(self, window_size: int = 14, oversold: float = 30, overbought: float = 70) -> None:
+        self._window_size = window_size
+        self._oversold = oversold
+        self._overbought = overbought
 
-    def generate_signals(self: Self, data: pd.DataFrame) -> str:
+    def generate_signals(self: Self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
         rsi_signal_column = f"Signal_RSI_{self._window_size}"
-        rsi_column = RelativeStrengthIndex(window_size=self._window_size).compute(data)[0]
-        data.loc[data[rsi_column] > 70, rsi_signal_column] = -1.0  # Sell signal
-        data.loc[data[rsi_column] < 30, rsi_signal_column] = 1.0  # Buy signal
-        data.loc[(30 <= data[rsi_column]) & (data[rsi_column] <= 70), rsi_signal_column] = 0.0
+        rsi_column = RelativeStrengthIndex(window_size=self._window_size).compute(data, results)[0]
+        data.loc[data[rsi_column] > self._overbought, rsi_signal_column] = -1.0  # Sell signal
+        data.loc[data[rsi_column] < self._oversold, rsi_signal_column] = 1.0  # Buy signal
+        data.loc[(self._oversold <= data[rsi_column]) & (data[rsi_column] <= self._overbought), rsi_signal_column] = 0.0
         data[rsi_signal_column].fillna(0.0)  # Hold signal
         return rsi_signal_column
 
 
 class MovingAverageConvergenceDivergenceSignal(Signal):
-    def __init__(self) -> None:
-        self._short_window_days = 12
-        self._long_window_days = 26
-        self._signal_window_days = 9
+    def __init__(self, short_window_days: int = 12, long_window_days: int = 26, signal_window_days: int = 9) -> None:
+        self._short_window_days = short_window_days
+        self._long_window_days = long_window_days
+        self._signal_window_days = signal_window_days
 
-    def generate_signals(self: Self, data: pd.DataFrame) -> str:
+    def generate_signals(self: Self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
         macd_column = f"Signal_MACD_{self._short_window_days}_{self._long_window_days}_{self._signal_window_days}"
-        MovingAverageConvergenceDivergence().compute(data)
+        MovingAverageConvergenceDivergence(
+            self._short_window_days, self._long_window_days, self._signal_window_days
+        ).compute(data, results)
         data[macd_column] = 0.0
         data.loc[data["MACDLine"] > data["SignalLine"], macd_column] = 1.0  # Buy signal
         data.loc[data["MACDLine"] < data["SignalLine"], macd_column] = -1.0  # Sell signal
@@ -0,0 +1,240 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Self, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# profiler the stages report to, None while profiling is off
+_profiler: "Profiler | None" = None
+# stage names and tickers of the stages entered in the current thread or task, innermost last
+_active_stages: ContextVar[tuple[tuple[str, str | None], ...]] = ContextVar("active_stages", default=())
+_NOT_PROFILED = contextlib.nullcontext()
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    ticker: str | None
+    start_ns: int
+    duration_ns: int
+    depth: int
+    thread_id: int
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def mean_ns(self: Self) -> float:
+        return self.total_ns / self.calls if self.calls else 0.0
+
+
+class Profiler:
+    """
+    Collects how long the stages of a run took and counters of what they processed.
+
+    Every stage run is kept as a Span with the ticker it worked on, inherited from the enclosing stage
+    when the stage itself does not know it. A stage re-entered while it is already running, e.g. through
+    super(), is timed once. Only stages run in this process are recorded.
+    """
+
+    def __init__(self: Self) -> None:
+        self._origin_ns = time.perf_counter_ns()
+        self._spans: list[Span] = []
+        self._counters: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def spans(self: Self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    @property
+    def counters(self: Self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def record(self: Self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def count(self: Self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def stage_stats(self: Self) -> dict[str, StageStats]:
+        """
+        Returns:
+        - Calls, total and longest time of every stage, in the order the stages were first finished
+        """
+        stats: dict[str, StageStats] = {}
+        for span in self.spans:
+            stage = stats.setdefault(span.name, StageStats())
+            stage.calls += 1
+            stage.total_ns += span.duration_ns
+            stage.max_ns = max(stage.max_ns, span.duration_ns)
+        return stats
+
+    def ticker_stats(self: Self) -> dict[str, dict[str, StageStats]]:
+        """
+        Returns:
+        - Stage stats of every ticker, stages run without a ticker are left out
+        """
+        stats: dict[str, dict[str, StageStats]] = {}
+        for span in self.spans:
+            if span.ticker is not None:
+                stage = stats.setdefault(span.ticker, {}).setdefault(span.name, StageStats())
+                stage.calls += 1
+                stage.total_ns += span.duration_ns
+                stage.max_ns = max(stage.max_ns, span.duration_ns)
+        return stats
+
+    def format_summary(self: Self, slowest_tickers: int = 10) -> str:
+        lines = [f"{'stage':<30}{'calls':>10}{'total [ms]':>14}{'mean [ms]':>14}{'max [ms]':>14}"]
+        for name, stage in self.stage_stats().items():
+            lines.append(
+                f"{name:<30}{stage.calls:>10}{stage.total_ns / 1e6:>14.3f}"
+                f"{stage.mean_ns / 1e6:>14.3f}{stage.max_ns / 1e6:>14.3f}"
+            )
+        # stages nested in another one are part of its time already
+        ticker_totals = Counter[str]()
+        for span in self.spans:
+            if span.ticker is not None and span.depth == 0:
+                ticker_totals[span.ticker] += span.duration_ns
+        if ticker_totals:
+            lines.append("")
+            lines.append(f"{'slowest tickers':<30}{'total [ms]':>14}")
+            for ticker, total_ns in ticker_totals.most_common(slowest_tickers):
+                lines.append(f"{ticker:<30}{total_ns / 1e6:>14.3f}")
+        if counters := self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<30}{'value':>14}")
+            lines.extend(f"{name:<30}{value:>14}" for name, value in counters.items())
+        return "\n".join(lines)
+
+    def write_chrome_trace(self: Self, path: Path) -> None:
+        """
+        Write the spans in the Trace Event Format, to be opened in chrome://tracing or ui.perfetto.dev.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": "stage",
+                "ph": "X",
+                "ts": (span.start_ns - self._origin_ns) / 1e3,
+                "dur": span.duration_ns / 1e3,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {} if span.ticker is None else {"ticker": span.ticker},
+            }
+            for span in self.spans
+        ]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": self.counters}, file)
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_name", "_ticker", "_start_ns", "_token")
+
+    def __init__(self: Self, profiler: Profiler, name: str, ticker: str | None) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._ticker = ticker
+
+    def __enter__(self: Self) -> None:
+        active = _active_stages.get()
+        if self._ticker is None and active:
+            self._ticker = active[-1][1]
+        self._token = _active_stages.set((*active, (self._name, self._ticker)))
+        self._start_ns = time.perf_counter_ns()
+
+    def __exit__(self: Self, *exc_info: Any) -> None:
+        end_ns = time.perf_counter_ns()
+        _active_stages.reset(self._token)
+        self._profiler.record(
+            Span(
+                self._name,
+                self._ticker,
+                self._start_ns,
+                end_ns - self._start_ns,
+                len(_active_stages.get()),
+                threading.get_ident(),
+            )
+        )
+
+
+def start_profiling() -> Profiler:
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def stop_profiling() -> Profiler | None:
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def stage(name: str, ticker: str | None = None) -> ContextManager[None]:
+    """
+    Time the block as the stage name, a no-op context unless profiling was started.
+    """
+    profiler = _profiler
+    if profiler is None:
+        return _NOT_PROFILED
+    active = _active_stages.get()
+    if active and active[-1][0] == name:
+        return _NOT_PROFILED
+    return _Stage(profiler, name, ticker)
+
+
+def count(name: str, amount: int = 1) -> None:
+    profiler = _profiler
+    if profiler is not None:
+        profiler.count(name, amount)
+
+
+def profiled(name: str, ticker_arg: int | None = None) -> Callable[[F], F]:
+    """
+    Time every call of the decorated function as the stage name.
+
+    Args:
+    - name (str): Name of the stage.
+    - ticker_arg (int): Position of the argument with the ticker, either the ticker itself or a DataFrame
+      with the ticker in its attrs; other stages take the ticker of the stage they are called from.
+    """
+
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # the only cost while profiling is off
+            if _profiler is None:
+                return function(*args, **kwargs)
+            with stage(name, _get_ticker(args, ticker_arg)):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def _get_ticker(args: tuple[Any, ...], ticker_arg: int | None) -> str | None:
+    if ticker_arg is None or ticker_arg >= len(args):
+        return None
+    value = args[ticker_arg]
+    if isinstance(value, str):
+        return value
+    attrs = getattr(value, "attrs", None)
+    return attrs.get("ticker") if isinstance(attrs, dict) else None
@@ -0,0 +1,88 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+from stock_trader.simulation.portfolio_manager import PortfolioManager
+from stock_trader.simulation.simulator import VectorizedTradingSimulator
+from stock_trader.trading_algorithms.signals import RelativeStrengthIndexSignal
+from stock_trader.utils.date_range import DateRange
+from stock_trader.utils.profiling import Profiler, count, profiled, stage, start_profiling, stop_profiling
+
+TEST_DATA = Path(__file__).parents[1] / "acquisition/data_sources/test_data"
+
+
+@pytest.fixture()
+def profiler() -> Iterator[Profiler]:
+    try:
+        yield start_profiling()
+    finally:
+        stop_profiling()
+
+
+@profiled("outer", ticker_arg=0)
+def outer(ticker: str) -> str:
+    with stage("inner"):
+        count("inner_runs")
+    return nested()
+
+
+@profiled("outer")
+def nested() -> str:
+    return "done"
+
+
+def test_nothing_is_recorded_while_profiling_is_off() -> None:
+    profiler = Profiler()
+    assert outer("AAPL") == "done"
+    assert profiler.spans == []
+    assert stop_profiling() is None
+
+
+def test_stages_are_recorded_with_tickers_of_enclosing_stages(profiler: Profiler) -> None:
+    assert outer("AAPL") == "done"
+    outer("GE")
+
+    # nested() re-enters the stage it is called from and is not timed again
+    assert [(span.name, span.ticker, span.depth) for span in profiler.spans] == [
+        ("inner", "AAPL", 1),
+        ("outer", "AAPL", 0),
+        ("inner", "GE", 1),
+        ("outer", "GE", 0),
+    ]
+    stats = profiler.stage_stats()
+    assert list(stats) == ["inner", "outer"]
+    assert stats["outer"].calls == 2
+    assert stats["outer"].total_ns >= stats["inner"].total_ns
+    assert set(profiler.ticker_stats()) == {"AAPL", "GE"}
+    assert profiler.counters == {"inner_runs": 2}
+
+    summary = profiler.format_summary()
+    assert summary.splitlines()[0].split() == ["stage", "calls", "total", "[ms]", "mean", "[ms]", "max", "[ms]"]
+    assert "slowest tickers" in summary
+    assert "inner_runs" in summary
+
+
+def test_chrome_trace_has_an_event_per_stage(profiler: Profiler, tmp_path: Path) -> None:
+    outer("AAPL")
+    profiler.write_chrome_trace(tmp_path / "trace.json")
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    events = trace["traceEvents"]
+    assert [event["name"] for event in events] == ["inner", "outer"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert events[1]["args"] == {"ticker": "AAPL"}
+    assert trace["otherData"] == {"inner_runs": 1}
+
+
+def test_fetch_and_simulation_stages_are_profiled(profiler: Profiler) -> None:
+    date_range = DateRange(start=datetime(2010, 1, 1), end=datetime(2012, 1, 1))
+    data = LocalCSVDataSource(TEST_DATA).fetch("AAPL", date_range)
+    VectorizedTradingSimulator(RelativeStrengthIndexSignal(), PortfolioManager()).simulate(data, "AAPL")
+
+    stats = profiler.ticker_stats()["AAPL"]
+    assert {"fetch", "trim_to_data_range", "indicator", "simulate"} <= set(stats)
+    assert profiler.counters["bars_simulated"] == len(data)
@@ -1,27 +1,123 @@
-from typing import Self
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Self, Type
 import pandas as pd
 
 from stock_trader.acquisition.data_loaders.data_loader import DataLoader
-from stock_trader.reporting.generate_report import create_report, save_report
+from stock_trader.acquisition.data_loaders.shared_memory import (
+    SharedFrame,
+    from_shared_memory,
+    release_shared_memory,
+)
+from stock_trader.reporting.generate_report import Report, create_report, save_report
+from stock_trader.settings import APP_SETTINGS, Concurrency
 from stock_trader.simulation.portfolio_manager import PortfolioManager
+from stock_trader.simulation.portfolio_simulator import PortfolioSimulator
 from stock_trader.simulation.simulator import TradingSimulator
 from stock_trader.trading_algorithms.signals import Signal
 from stock_trader.utils.date_range import DateRange
+from stock_trader.workflows.process_pool import chunked, run_chunks_in_order, share_frame
+
+# signal and simulator class, sent once to every worker process instead of with every chunk
+_worker_setup: tuple[Signal, Type[TradingSimulator]] | None = None
 
 
 class BacktestingWorkflow:
-    def __init__(self: Self, tickers: list[str], data_loader: DataLoader, signal: Signal) -> None:
+    """
+    Backtests a signal on every ticker separately and saves a report for each of them.
+
+    With more than one worker, tickers are sent in chunks of chunk_size to a process pool, at most two
+    chunks per worker at a time, and the reports are saved in the order of the tickers whatever order
+    the workers finish in. The data of a chunk is put into shared memory as it is loaded and the worker
+    takes it over from there, so the frames are never pickled. By default workers are used when
+    Settings.concurrency is one of the process based modes, their number is then Settings.num_workers.
+    """
+
+    def __init__(
+        self: Self,
+        tickers: list[str],
+        data_loader: DataLoader,
+        signal: Signal,
+        simulator_cls: Type[TradingSimulator] = TradingSimulator,
+        num_workers: int | None = None,
+        chunk_size: int = 8,
+    ) -> None:
         self._data_loader = data_loader
         self._tickers = tickers
         self._signal = signal
+        self._simulator_cls = simulator_cls
+        self._num_workers = _get_default_num_workers() if num_workers is None else num_workers
+        self._chunk_size = chunk_size
 
     def backtest(self: Self, date_range: DateRange, initial_lump_sum: float) -> None:
-        data = self._data_loader.load_for_tickers(self._tickers, date_range)
-        for ticker in self._tickers:
-            self._backtest_single_ticker(data[ticker], initial_lump_sum, ticker)
+        tickers_data = self._data_loader.iter_tickers(self._tickers, date_range)
+        if self._num_workers <= 1:
+            for ticker, data in tickers_data:
+                report = _backtest_single_ticker(data, initial_lump_sum, ticker, self._signal, self._simulator_cls)
+                save_report(report, ticker)
+            return
+        for ticker, report in self._backtest_in_processes(tickers_data, initial_lump_sum):
+            save_report(report, ticker)
 
-    def _backtest_single_ticker(self: Self, data: pd.DataFrame, initial_lump_sum: float, ticker: str) -> None:
-        simulator = TradingSimulator(self._signal, PortfolioManager())
-        simulator.simulate(data, ticker, initial_lump_sum)
+    def backtest_portfolio(self: Self, date_range: DateRange, initial_lump_sum: float) -> None:
+        # all tickers trade from one cash balance, the whole book gets a single report
+        simulator = PortfolioSimulator(self._signal)
+        simulator.simulate(self._data_loader.load_for_tickers(self._tickers, date_range), initial_lump_sum)
         report = create_report(simulator.history)
-        save_report(report, ticker)
+        save_report(report, "PORTFOLIO")
+
+    def _backtest_in_processes(
+        self: Self, tickers_data: Iterable[tuple[str, pd.DataFrame]], initial_lump_sum: float
+    ) -> Iterator[tuple[str, Report]]:
+        # every frame sent, released at the end in case a worker never got to take it over
+        sent: list[SharedFrame] = []
+
+        def share(chunk: list[tuple[str, pd.DataFrame]]) -> list[tuple[str, SharedFrame]]:
+            shared = [(ticker, share_frame(data)) for ticker, data in chunk]
+            sent.extend(frame for _, frame in shared)
+            return shared
+
+        try:
+            with ProcessPoolExecutor(
+                self._num_workers, initializer=_init_worker, initargs=(self._signal, self._simulator_cls)
+            ) as executor:
+                chunks = (share(chunk) for chunk in chunked(tickers_data, self._chunk_size))
+                max_pending = 2 * self._num_workers
+                yield from run_chunks_in_order(executor, _backtest_chunk, chunks, max_pending, initial_lump_sum)
+        finally:
+            for frame in sent:
+                release_shared_memory(frame)
+
+
+def _get_default_num_workers() -> int:
+    if APP_SETTINGS.concurrency in (Concurrency.PROCESSESS, Concurrency.SHARED_MEMORY):
+        return APP_SETTINGS.num_workers
+    return 1
+
+
+def _init_worker(signal: Signal, simulator_cls: Type[TradingSimulator]) -> None:
+    global _worker_setup
+    _worker_setup = (signal, simulator_cls)
+
+
+def _backtest_chunk(chunk: list[tuple[str, SharedFrame]], initial_lump_sum: float) -> list[tuple[str, Report]]:
+    assert _worker_setup is not None
+    signal, simulator_cls = _worker_setup
+    reports = []
+    for ticker, frame in chunk:
+        # the block is unlinked as soon as it is attached, its memory goes away with the frame
+        data = from_shared_memory(frame)
+        data.attrs["ticker"] = ticker
+        reports.append((ticker, _backtest_single_ticker(data, initial_lump_sum, ticker, signal, simulator_cls)))
+    return reports
+
+
+def _backtest_single_ticker(
+    data: pd.DataFrame,
+    initial_lump_sum: float,
+    ticker: str,
+    signal: Signal,
+    simulator_cls: Type[TradingSimulator],
+) -> Report:
+    simulator = simulator_cls(signal, PortfolioManager())
+    simulator.simulate(data, ticker, initial_lump_sum)
+    return create_report(simulator.history)
@@ -6,11 +6,14 @@ from freezegun import freeze_time
 from pytest import MonkeyPatch
 from stock_trader.acquisition.data_loaders.data_loader import SingleThreadedDataLoader
 from stock_trader.acquisition.data_sources.data_source import DataSource
-from stock_trader.settings import Settings
+from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+from stock_trader.settings import Concurrency, Settings
 from stock_trader.trading_algorithms.signals import MovingAverageCrossoverSignal
 from stock_trader.utils.date_range import DateRange
 from stock_trader.workflows.backtesting import BacktestingWorkflow
 
+TEST_DATA = Path(__file__).parents[1] / "acquisition/data_sources/test_data"
+
 
 @freeze_time("2021-01-01")
 def test_backtesting_workflow(tmp_path: Path, fake_data_source: DataSource, monkeypatch: MonkeyPatch) -> None:
@@ -28,3 +31,41 @@ def test_backtesting_workflow(tmp_path: Path, fake_data_source: DataSource, monk
         assert "Annualized Return" in report
         assert "Sharpe Ratio" in report
         assert "Maximum Drawdown" in report
+
+
+@freeze_time("2021-01-01")
+def test_portfolio_backtesting_workflow(tmp_path: Path, fake_data_source: DataSource, monkeypatch: MonkeyPatch) -> None:
+    settings = Settings(report_output_path=tmp_path)
+    monkeypatch.setattr("stock_trader.reporting.generate_report.APP_SETTINGS", settings)
+    date_range = DateRange(start=datetime(2021, 1, 1), end=datetime(2021, 1, 10))
+    data_loader = SingleThreadedDataLoader(fake_data_source)
+    workflow = BacktestingWorkflow(["GE", "AAPL"], data_loader, MovingAverageCrossoverSignal())
+    workflow.backtest_portfolio(date_range, 10000)
+    assert (tmp_path / Path("report_PORTFOLIO_2021-01-01_00-00-00.txt")).exists()
+
+
+def test_parallel_backtesting_saves_reports_in_ticker_order(monkeypatch: MonkeyPatch) -> None:
+    saved: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        "stock_trader.workflows.backtesting.save_report", lambda report, ticker: saved.append((ticker, report))
+    )
+    tickers = ["GE", "AAPL", "GE", "AAPL"]
+    date_range = DateRange(start=datetime(2010, 1, 1), end=datetime(2012, 1, 1))
+    data_loader = SingleThreadedDataLoader(LocalCSVDataSource(TEST_DATA))
+
+    BacktestingWorkflow(tickers, data_loader, MovingAverageCrossoverSignal(), num_workers=1).backtest(date_range, 10000)
+    serial = list(saved)
+    saved.clear()
+    workflow = BacktestingWorkflow(tickers, data_loader, MovingAverageCrossoverSignal(), num_workers=2, chunk_size=1)
+    workflow.backtest(date_range, 10000)
+
+    assert [ticker for ticker, _ in saved] == tickers
+    assert saved == serial
+
+
+def test_process_based_concurrency_backtests_in_processes(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("stock_trader.workflows.backtesting.APP_SETTINGS.concurrency", Concurrency.SHARED_MEMORY)
+    monkeypatch.setattr("stock_trader.workflows.backtesting.APP_SETTINGS.num_workers", 3)
+    data_loader = SingleThreadedDataLoader(LocalCSVDataSource(TEST_DATA))
+    workflow = BacktestingWorkflow([], data_loader, MovingAverageCrossoverSignal())
+    assert workflow._num_workers == 3
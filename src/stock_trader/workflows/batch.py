@@ -0,0 +1,316 @@
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Self, Type
+
+import numpy as np
+import pandas as pd
+
+from stock_trader.acquisition.data_loaders.data_loader import DataLoader
+from stock_trader.reporting.history import ColumnarHistory
+from stock_trader.reporting.metrics_engine import calculate_metrics, stack_equity
+from stock_trader.reporting.visualizer import Visualizer
+from stock_trader.settings import APP_SETTINGS
+from stock_trader.simulation.portfolio_manager import PortfolioManager
+from stock_trader.simulation.simulator import TradingSimulator, VectorizedTradingSimulator
+from stock_trader.trading_algorithms.factory import IndicatorFactory, indicator_factory, signal_factory
+from stock_trader.utils.date_range import DateRange
+from stock_trader.workflows.plotting import PlottingWorkflow
+from stock_trader.workflows.process_pool import (
+    attach_shared_data,
+    chunked,
+    run_chunks_in_order,
+    shared_data,
+    worker_data,
+)
+
+# keys a job may have, any of the ones other than name and jobs may also be given once for all jobs
+_JOB_KEYS = {"name", "signal", "indicator", "tickers", "ticker_list_file", "start", "end", "last", "initial_lump_sum"}
+# keys taken together, from the job when it gives any of them and otherwise from the top of the file
+_TICKER_KEYS = ("tickers", "ticker_list_file")
+_DATE_KEYS = ("start", "end", "last")
+RESULT_COLUMNS = [
+    "job",
+    "ticker",
+    "signal",
+    "indicator",
+    "start",
+    "end",
+    "initial_lump_sum",
+    "final_value",
+    "annualized_return",
+    "volatility",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "max_drawdown",
+]
+
+# signal name, ticker, start, end and initial lump sum of one backtest
+_Task = tuple[str, str, datetime, datetime, float]
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """
+    One entry of a job file: backtests signal, plots indicator or both, on every ticker over date_range.
+    """
+
+    name: str
+    tickers: list[str]
+    date_range: DateRange
+    signal: str | None = None
+    indicator: str | None = None
+    initial_lump_sum: float = 10000.0
+
+
+def load_jobs(path: Path, default_tickers: list[str], default_date_range: DateRange) -> list[BatchJob]:
+    """
+    Read jobs from a TOML or YAML file with a list of tables under "jobs".
+
+    Keys at the top of the file are defaults of every job, e.g. the following jobs run over the last year
+    unless they give any of start, end or last themselves, and likewise for tickers and ticker_list_file:
+
+        ticker_list_file = "tickers.txt"
+        last = "1y"
+
+        [[jobs]]
+        name = "rsi"
+        signal = "RSI_14_30_70"
+        indicator = "RSI_14"
+
+    Args:
+    - path (Path): Job file, YAML when its suffix is .yaml or .yml; ticker list files are relative to it.
+    - default_tickers (list[str]): Tickers of jobs that give neither tickers nor ticker_list_file.
+    - default_date_range (DateRange): Date range of jobs that give neither start, end nor last.
+
+    Returns:
+    - Jobs in the order of the file, ValueError is raised for entries that are not valid jobs
+    """
+    content = _read_job_file(path)
+    defaults = {key: value for key, value in content.items() if key != "jobs"}
+    entries = content.get("jobs")
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path} has no [[jobs]] entries")
+    return [
+        _make_job(i, _apply_defaults(entry, defaults), path.parent, default_tickers, default_date_range)
+        for i, entry in enumerate(entries)
+    ]
+
+
+class BatchWorkflow:
+    """
+    Runs many backtest and plot jobs in one process over data loaded once.
+
+    The union of the tickers of all jobs is loaded in a single call for a date range covering every job
+    and each job works on its slice. Backtests of all jobs are split into chunks of chunk_size
+    (job, ticker) pairs which a pool of num_workers processes runs, attached read-only to the data put
+    into shared memory like in OptimizationWorkflow. Metrics of all backtests are then computed at once
+    from their equity. Plots are drawn in this process after the backtests.
+    """
+
+    def __init__(
+        self: Self,
+        jobs: list[BatchJob],
+        data_loader: DataLoader,
+        visualizer: Visualizer,
+        indicator_factory: IndicatorFactory = indicator_factory,
+        num_workers: int = 4,
+        chunk_size: int = 8,
+        simulator_cls: Type[TradingSimulator] = VectorizedTradingSimulator,
+    ) -> None:
+        self._jobs = jobs
+        self._data_loader = data_loader
+        self._visualizer = visualizer
+        self._indicator_factory = indicator_factory
+        self._num_workers = num_workers
+        self._chunk_size = chunk_size
+        self._simulator_cls = simulator_cls
+
+    def run(self: Self) -> pd.DataFrame:
+        """
+        Returns:
+        - One row per job and ticker with data, see RESULT_COLUMNS; metrics are NaN for jobs without a signal
+        """
+        tickers = list(dict.fromkeys(ticker for job in self._jobs for ticker in job.tickers))
+        covering_range = DateRange(
+            start=min(job.date_range.start for job in self._jobs), end=max(job.date_range.end for job in self._jobs)
+        )
+        data = self._data_loader.load_for_tickers(tickers, covering_range)
+        # runs are (job index, ticker) pairs, jobs hold lists and are not hashable
+        runs = [(i, ticker) for i, job in enumerate(self._jobs) for ticker in job.tickers if ticker in data]
+        backtests = [(i, ticker) for i, ticker in runs if self._jobs[i].signal is not None]
+
+        histories = self._backtest(data, backtests)
+        for job in self._jobs:
+            if job.indicator is not None:
+                PlottingWorkflow(
+                    job.tickers, _SlicingDataLoader(data), self._visualizer, self._indicator_factory
+                ).plot(job.indicator, job.date_range)
+        return self._make_results(runs, dict(zip(backtests, histories)))
+
+    def _backtest(self: Self, data: dict[str, pd.DataFrame], backtests: list[tuple[int, str]]) -> list[ColumnarHistory]:
+        tasks: list[_Task] = [
+            (str(job.signal), ticker, job.date_range.start, job.date_range.end, job.initial_lump_sum)
+            for job, ticker in ((self._jobs[i], ticker) for i, ticker in backtests)
+        ]
+        if self._num_workers <= 1 or not tasks:
+            return _backtest_chunk(tasks, self._simulator_cls, data)
+        backtested = {ticker: data[ticker] for _, ticker, *_ in tasks}
+        with shared_data(backtested) as shared:
+            with ProcessPoolExecutor(self._num_workers, initializer=attach_shared_data, initargs=(shared,)) as executor:
+                chunks = chunked(tasks, self._chunk_size)
+                max_pending = 2 * self._num_workers
+                return list(run_chunks_in_order(executor, _backtest_chunk, chunks, max_pending, self._simulator_cls))
+
+    def _make_results(
+        self: Self, runs: list[tuple[int, str]], histories: dict[tuple[int, str], ColumnarHistory]
+    ) -> pd.DataFrame:
+        backtested = [run for run in runs if run in histories]
+        metrics = calculate_metrics(stack_equity([histories[run] for run in backtested]))
+        columns = {
+            "final_value": np.array(
+                [_final_value(histories[i, ticker], self._jobs[i].initial_lump_sum) for i, ticker in backtested]
+            ),
+            "annualized_return": metrics.annualized_return,
+            "volatility": metrics.volatility,
+            "sharpe_ratio": metrics.sharpe_ratio,
+            "sortino_ratio": metrics.sortino_ratio,
+            "max_drawdown": metrics.max_drawdown,
+        }
+        positions = {run: i for i, run in enumerate(backtested)}
+        rows = []
+        for i, ticker in runs:
+            job, position = self._jobs[i], positions.get((i, ticker))
+            rows.append(
+                {
+                    "job": job.name,
+                    "ticker": ticker,
+                    "signal": job.signal,
+                    "indicator": job.indicator,
+                    "start": job.date_range.start,
+                    "end": job.date_range.end,
+                    "initial_lump_sum": job.initial_lump_sum,
+                    **{
+                        name: np.nan if position is None else float(values[position])
+                        for name, values in columns.items()
+                    },
+                }
+            )
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def save_results(results: pd.DataFrame, path: Path | None = None) -> None:
+    if path is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        path = Path(APP_SETTINGS.report_output_path) / f"batch_results_{timestamp}.csv"
+    results.to_csv(path, index=False)
+    print(f"Results saved to {path}")
+
+
+class _SlicingDataLoader(DataLoader):
+    # serves the jobs' date ranges out of the data loaded once for all of them
+    def __init__(self: Self, data: dict[str, pd.DataFrame]) -> None:
+        self._data = data
+
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        for ticker in tickers:
+            if ticker in self._data:
+                df = self._data[ticker].loc[date_range.start : date_range.end].copy()
+                df.attrs["ticker"] = ticker
+                yield ticker, df
+
+
+def _final_value(history: ColumnarHistory, initial_lump_sum: float) -> float:
+    return float(history.equity[-1]) if len(history) > 0 else initial_lump_sum
+
+
+def _read_job_file(path: Path) -> dict[str, Any]:
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML job files need PyYAML, install stock-trader[yaml] or use a TOML file")
+        with open(path) as file:
+            content = yaml.safe_load(file)
+    else:
+        with open(path, "rb") as file:
+            content = tomllib.load(file)
+    if not isinstance(content, dict):
+        raise ValueError(f"{path} is not a table of jobs")
+    return content
+
+
+def _apply_defaults(entry: Any, defaults: dict[str, Any]) -> dict[str, Any]:
+    if not isinstance(entry, dict):
+        raise ValueError(f"job {entry!r} is not a table")
+    job = {**defaults, **entry}
+    for keys in (_TICKER_KEYS, _DATE_KEYS):
+        # e.g. a job's start is not combined with the last of the file
+        if any(key in entry for key in keys):
+            for key in keys:
+                if key not in entry:
+                    job.pop(key, None)
+    return job
+
+
+def _make_job(
+    index: int, entry: dict[str, Any], folder: Path, default_tickers: list[str], default_date_range: DateRange
+) -> BatchJob:
+    name = str(entry.get("name", f"job_{index + 1}"))
+    if unknown := set(entry) - _JOB_KEYS:
+        raise ValueError(f"job {name} has unknown keys: {', '.join(sorted(unknown))}")
+    signal, indicator = entry.get("signal"), entry.get("indicator")
+    if signal is None and indicator is None:
+        raise ValueError(f"job {name} has neither a signal to backtest nor an indicator to plot")
+    try:
+        if signal is not None:
+            signal_factory(signal, cached=False)
+        if indicator is not None and indicator.upper() != "RAW":
+            indicator_factory(indicator)
+    except (KeyError, ValueError):
+        raise ValueError(f"job {name} has an unknown signal {signal} or indicator {indicator}")
+
+    if "tickers" in entry:
+        tickers = [str(ticker) for ticker in entry["tickers"]]
+    elif "ticker_list_file" in entry:
+        with open(folder / entry["ticker_list_file"]) as tickers_file:
+            tickers = [ticker.strip() for ticker in tickers_file if ticker.strip()]
+    else:
+        tickers = default_tickers
+    if not tickers:
+        raise ValueError(f"job {name} has no tickers")
+
+    if "last" in entry:
+        date_range = DateRange.from_last(entry["last"])
+    elif "start" in entry or "end" in entry:
+        date_range = DateRange(
+            start=_to_datetime(entry.get("start", default_date_range.start)),
+            end=_to_datetime(entry.get("end", default_date_range.end)),
+        )
+    else:
+        date_range = default_date_range
+    return BatchJob(name, tickers, date_range, signal, indicator, float(entry.get("initial_lump_sum", 10000.0)))
+
+
+def _to_datetime(value: str | date | datetime) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(value)
+
+
+def _backtest_chunk(
+    chunk: list[_Task], simulator_cls: Type[TradingSimulator], data: Mapping[str, pd.DataFrame] = worker_data
+) -> list[ColumnarHistory]:
+    # workers backtest on the data attached by attach_shared_data, a single process on its own data
+    histories = []
+    for signal_name, ticker, start, end, initial_lump_sum in chunk:
+        # the signal adds its columns to a shallow copy of the slice, the shared columns are never written
+        ticker_data = data[ticker].loc[start:end].copy(deep=False)
+        simulator = simulator_cls(signal_factory(signal_name, cached=False), PortfolioManager())
+        simulator.simulate(ticker_data, ticker, initial_lump_sum)
+        histories.append(simulator.history)
+    return histories
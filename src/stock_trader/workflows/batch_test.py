@@ -0,0 +1,150 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Self
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_trader.acquisition.data_loaders.data_loader import SingleThreadedDataLoader
+from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+from stock_trader.reporting.visualizer import Subplot, Visualizer
+from stock_trader.simulation.portfolio_manager import PortfolioManager
+from stock_trader.simulation.simulator import VectorizedTradingSimulator
+from stock_trader.trading_algorithms.factory import signal_factory
+from stock_trader.utils.date_range import DateRange
+from stock_trader.workflows.batch import RESULT_COLUMNS, BatchJob, BatchWorkflow, load_jobs
+
+TEST_DATA = Path(__file__).parents[1] / "acquisition/data_sources/test_data"
+DEFAULT_RANGE = DateRange(start=datetime(2000, 1, 1), end=datetime(2020, 1, 1))
+
+
+class RecordingVisualizer(Visualizer):
+    def __init__(self: Self) -> None:
+        super().__init__()
+        self.plotted: list[tuple[str, pd.Timestamp, pd.Timestamp, list[str]]] = []
+
+    def _can_draw_indicator(self: Self, indicator_name: str) -> bool:
+        return False
+
+    def _get_subplot(self: Self, data: pd.DataFrame, indicator_name: str) -> Subplot:
+        raise NotImplementedError
+
+    def plot(self: Self, data: pd.DataFrame, ticker: str, indicator_names: list[str]) -> None:
+        self.plotted.append((ticker, data.index[0], data.index[-1], indicator_names))
+
+
+class CountingDataLoader(SingleThreadedDataLoader):
+    def __init__(self: Self) -> None:
+        super().__init__(LocalCSVDataSource(TEST_DATA))
+        self.loads: list[tuple[list[str], DateRange]] = []
+
+    def iter_tickers(self: Self, tickers: list[str], date_range: DateRange) -> Iterator[tuple[str, pd.DataFrame]]:
+        self.loads.append((list(tickers), date_range))
+        return super().iter_tickers(tickers, date_range)
+
+
+def test_load_jobs_applies_defaults_of_the_file(tmp_path: Path) -> None:
+    (tmp_path / "tickers.txt").write_text("AAPL\nGE\n")
+    job_file = tmp_path / "jobs.toml"
+    job_file.write_text(
+        """
+ticker_list_file = "tickers.txt"
+initial_lump_sum = 5000
+
+[[jobs]]
+name = "rsi"
+signal = "RSI_14_30_70"
+start = 2005-01-01
+end = 2006-01-01
+
+[[jobs]]
+indicator = "SMA_50"
+tickers = ["GE"]
+initial_lump_sum = 100
+"""
+    )
+    rsi, sma = load_jobs(job_file, ["MSFT"], DEFAULT_RANGE)
+
+    rsi_range = DateRange(start=datetime(2005, 1, 1), end=datetime(2006, 1, 1))
+    assert rsi == BatchJob("rsi", ["AAPL", "GE"], rsi_range, "RSI_14_30_70", None, 5000.0)
+    assert sma == BatchJob("job_2", ["GE"], DEFAULT_RANGE, None, "SMA_50", 100.0)
+
+
+def test_dates_and_tickers_of_a_job_replace_the_ones_of_the_file(tmp_path: Path) -> None:
+    (tmp_path / "tickers.txt").write_text("AAPL\nGE\n")
+    job_file = tmp_path / "jobs.toml"
+    job_file.write_text(
+        """
+ticker_list_file = "tickers.txt"
+last = "1y"
+
+[[jobs]]
+signal = "RSI_14_30_70"
+tickers = ["MSFT"]
+start = 2005-01-01
+
+[[jobs]]
+signal = "RSI_14_30_70"
+"""
+    )
+    own, inherited = load_jobs(job_file, ["IBM"], DEFAULT_RANGE)
+
+    assert own.tickers == ["MSFT"]
+    assert own.date_range == DateRange(start=datetime(2005, 1, 1), end=DEFAULT_RANGE.end)
+    assert inherited.tickers == ["AAPL", "GE"]
+    assert (inherited.date_range.end - inherited.date_range.start).days == 365
+
+
+def test_load_jobs_reads_yaml(tmp_path: Path) -> None:
+    pytest.importorskip("yaml")
+    job_file = tmp_path / "jobs.yaml"
+    job_file.write_text("jobs:\n  - signal: MACD_12_26_9\n    start: 2010-01-01\n")
+
+    (job,) = load_jobs(job_file, ["AAPL"], DEFAULT_RANGE)
+    date_range = DateRange(start=datetime(2010, 1, 1), end=DEFAULT_RANGE.end)
+    assert job == BatchJob("job_1", ["AAPL"], date_range, "MACD_12_26_9")
+
+
+@pytest.mark.parametrize(
+    "jobs",
+    [
+        "",
+        '[[jobs]]\ntickers = ["AAPL"]\n',
+        '[[jobs]]\nsignal = "NotASignal"\n',
+        '[[jobs]]\nsignal = "RSI"\ncapital = 1000\n',
+    ],
+    ids=["no jobs", "nothing to do", "unknown signal", "unknown key"],
+)
+def test_load_jobs_rejects_invalid_entries(tmp_path: Path, jobs: str) -> None:
+    job_file = tmp_path / "jobs.toml"
+    job_file.write_text(jobs)
+    with pytest.raises(ValueError):
+        load_jobs(job_file, ["AAPL"], DEFAULT_RANGE)
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_batch_loads_data_once_and_backtests_every_job(num_workers: int) -> None:
+    early = DateRange(start=datetime(2005, 1, 1), end=datetime(2008, 1, 1))
+    late = DateRange(start=datetime(2010, 1, 1), end=datetime(2012, 1, 1))
+    jobs = [
+        BatchJob("crossover", ["AAPL", "GE"], early, "MovingAverageCrossover_5_50", initial_lump_sum=1000.0),
+        BatchJob("rsi", ["GE"], late, "RSI_14_30_70", "RSI_14"),
+    ]
+    data_loader = CountingDataLoader()
+    visualizer = RecordingVisualizer()
+    results = BatchWorkflow(jobs, data_loader, visualizer, num_workers=num_workers, chunk_size=1).run()
+
+    assert data_loader.loads == [(["AAPL", "GE"], DateRange(start=early.start, end=late.end))]
+    assert list(results.columns) == RESULT_COLUMNS
+    assert list(zip(results["job"], results["ticker"])) == [("crossover", "AAPL"), ("crossover", "GE"), ("rsi", "GE")]
+    assert [ticker for ticker, *_ in visualizer.plotted] == ["GE"]
+    assert visualizer.plotted[0][1] >= late.start
+
+    # every row is the same backtest as on the job's own data
+    for row in results.itertuples():
+        data = LocalCSVDataSource(TEST_DATA).fetch(row.ticker, DateRange(start=row.start, end=row.end))
+        simulator = VectorizedTradingSimulator(signal_factory(row.signal, cached=False), PortfolioManager())
+        simulator.simulate(data, row.ticker, row.initial_lump_sum)
+        assert row.final_value == pytest.approx(simulator.history.equity[-1])
+    assert np.isfinite(results["sharpe_ratio"]).all()
@@ -0,0 +1,152 @@
+import itertools
+import math
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Self, Sequence, Type
+
+import numpy as np
+
+from stock_trader.acquisition.data_loaders.data_loader import DataLoader
+from stock_trader.reporting.metrics_engine import calculate_metrics, stack_equity
+from stock_trader.simulation.portfolio_manager import PortfolioManager
+from stock_trader.simulation.simulator import TradingSimulator, VectorizedTradingSimulator
+from stock_trader.trading_algorithms.factory import signal_factory
+from stock_trader.utils.date_range import DateRange
+from stock_trader.workflows.process_pool import attach_shared_data, shared_data, worker_data
+
+# fields of PerformanceMetrics configurations are ranked by, higher is better for all of them,
+# so reports and the optimizer agree on e.g. the Sharpe ratio being one of the returns
+METRICS = ("sharpe_ratio", "annualized_return", "max_drawdown")
+
+
+@dataclass(frozen=True)
+class OptimizationResult:
+    signal_name: str
+    score: float
+    tickers_evaluated: int
+
+
+def parameter_grid(signal_kind: str, parameter_values: Sequence[Sequence[int]]) -> list[str]:
+    """
+    Names of the signals for every combination of parameter values, e.g. MovingAverageCrossover_5_200.
+
+    Args:
+    - signal_kind (str): Signal kind understood by signal_factory, e.g. MovingAverageCrossover or RSI.
+    - parameter_values: Values to try for each of the signal's parameters, in the order of its name.
+
+    Returns:
+    - Signal names, the last parameter varying fastest
+    """
+    return ["_".join([signal_kind, *map(str, combination)]) for combination in itertools.product(*parameter_values)]
+
+
+class OptimizationWorkflow:
+    """
+    Grid search over signal parameters with successive halving.
+
+    Data of all tickers is loaded once and put into shared memory, which the worker processes attach to
+    read-only, so only signal names and scores travel between processes. Every configuration is first
+    backtested on a few tickers, then only the best 1 / halving_rate of them go on to the next round,
+    which adds halving_rate times as many tickers, until the survivors were evaluated on all of them.
+    A configuration's score is its metric averaged over the tickers it was evaluated on.
+    """
+
+    def __init__(
+        self: Self,
+        tickers: list[str],
+        data_loader: DataLoader,
+        metric: str = "sharpe_ratio",
+        num_workers: int = 4,
+        halving_rate: int = 3,
+        simulator_cls: Type[TradingSimulator] = VectorizedTradingSimulator,
+    ) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"unknown metric {metric}, expected one of {', '.join(METRICS)}")
+        if halving_rate < 1:
+            raise ValueError("halving rate must be at least 1")
+        self._tickers = tickers
+        self._data_loader = data_loader
+        self._metric = metric
+        self._num_workers = num_workers
+        self._halving_rate = halving_rate
+        self._simulator_cls = simulator_cls
+
+    def optimize(
+        self: Self, signal_names: list[str], date_range: DateRange, initial_lump_sum: float
+    ) -> list[OptimizationResult]:
+        """
+        Returns:
+        - Results of all configurations, best first; ones dropped early carry fewer evaluated tickers
+        """
+        data = self._data_loader.load_for_tickers(self._tickers, date_range)
+        tickers = list(data)
+        with shared_data(data) as shared:
+            # the workers have their own attachments, the local copies are not needed any more
+            del data
+            with ProcessPoolExecutor(self._num_workers, initializer=attach_shared_data, initargs=(shared,)) as executor:
+                return self._successive_halving(executor, signal_names, tickers, initial_lump_sum)
+
+    def print_results(self: Self, results: list[OptimizationResult], top: int = 10) -> None:
+        print(f"{'signal':<40}{self._metric:>20}{'tickers':>10}")
+        for result in results[:top]:
+            print(f"{result.signal_name:<40}{result.score:>20.4f}{result.tickers_evaluated:>10}")
+
+    def _successive_halving(
+        self: Self,
+        executor: ProcessPoolExecutor,
+        signal_names: list[str],
+        tickers: list[str],
+        initial_lump_sum: float,
+    ) -> list[OptimizationResult]:
+        scores: dict[str, list[float]] = {name: [] for name in signal_names}
+        survivors = list(signal_names)
+        # enough rounds to get down to a single configuration, the last one using every ticker
+        rounds, remaining = 0, len(survivors)
+        while self._halving_rate > 1 and remaining > 1:
+            remaining = math.ceil(remaining / self._halving_rate)
+            rounds += 1
+        evaluated, budget = 0, max(1, math.ceil(len(tickers) / self._halving_rate**rounds))
+        while evaluated < len(tickers) and survivors:
+            budget = min(budget, len(tickers))
+            new_tickers = tickers[evaluated:budget]
+            futures: dict[str, Future[list[float]]] = {
+                name: executor.submit(
+                    _evaluate, name, new_tickers, initial_lump_sum, self._metric, self._simulator_cls
+                )
+                for name in survivors
+            }
+            for name, future in futures.items():
+                scores[name].extend(future.result())
+            evaluated = budget
+            if evaluated < len(tickers):
+                survivors = sorted(survivors, key=lambda name: _mean_score(scores[name]), reverse=True)
+                survivors = survivors[: max(1, math.ceil(len(survivors) / self._halving_rate))]
+                budget *= self._halving_rate
+
+        results = [OptimizationResult(name, _mean_score(values), len(values)) for name, values in scores.items()]
+        # configurations that made it further come first, ties keep the order of signal_names
+        return sorted(results, key=lambda result: (result.tickers_evaluated, result.score), reverse=True)
+
+
+def _mean_score(scores: list[float]) -> float:
+    finite = [score for score in scores if math.isfinite(score)]
+    return float(np.mean(finite)) if finite else -math.inf
+
+
+def _evaluate(
+    signal_name: str,
+    tickers: list[str],
+    initial_lump_sum: float,
+    metric: str,
+    simulator_cls: Type[TradingSimulator],
+) -> list[float]:
+    histories = []
+    for ticker in tickers:
+        # the signal adds its columns to a shallow copy, the shared columns are never written
+        data = worker_data[ticker].copy(deep=False)
+        simulator = simulator_cls(signal_factory(signal_name, cached=False), PortfolioManager())
+        simulator.simulate(data, ticker, initial_lump_sum)
+        histories.append(simulator.history)
+    # metrics of all the tickers at once
+    scores: np.ndarray = getattr(calculate_metrics(stack_equity(histories)), metric)
+    return [float(score) for score in scores]
@@ -0,0 +1,54 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from stock_trader.acquisition.data_loaders.data_loader import SingleThreadedDataLoader
+from stock_trader.acquisition.data_sources.local_csv import LocalCSVDataSource
+from stock_trader.reporting.metrics_engine import calculate_metrics
+from stock_trader.simulation.portfolio_manager import PortfolioManager
+from stock_trader.simulation.simulator import VectorizedTradingSimulator
+from stock_trader.trading_algorithms.signals import MovingAverageCrossoverSignal
+from stock_trader.utils.date_range import DateRange
+from stock_trader.workflows.optimization import OptimizationWorkflow, parameter_grid
+
+TEST_DATA = Path(__file__).parents[1] / "acquisition/data_sources/test_data"
+DATE_RANGE = DateRange(start=datetime(2005, 1, 1), end=datetime(2012, 1, 1))
+
+
+def test_parameter_grid() -> None:
+    names = parameter_grid("RSI", [[7, 14], [30], [70, 80]])
+    assert names == ["RSI_7_30_70", "RSI_7_30_80", "RSI_14_30_70", "RSI_14_30_80"]
+
+
+def test_optimization_scores_every_configuration_on_all_tickers_without_halving() -> None:
+    data_loader = SingleThreadedDataLoader(LocalCSVDataSource(TEST_DATA))
+    workflow = OptimizationWorkflow(["AAPL", "GE"], data_loader, "sharpe_ratio", num_workers=2, halving_rate=1)
+    signal_names = parameter_grid("MovingAverageCrossover", [[5, 20], [50, 100]])
+    results = workflow.optimize(signal_names, DATE_RANGE, 10000.0)
+
+    assert sorted(result.signal_name for result in results) == sorted(signal_names)
+    assert all(result.tickers_evaluated == 2 for result in results)
+    assert [result.score for result in results] == sorted((result.score for result in results), reverse=True)
+
+    # scores are the metric of the reports averaged over the tickers, same as a backtest in this process
+    best = results[0]
+    short, long = (int(param) for param in best.signal_name.split("_")[1:])
+    expected = []
+    for ticker, data in data_loader.iter_tickers(["AAPL", "GE"], DATE_RANGE):
+        simulator = VectorizedTradingSimulator(MovingAverageCrossoverSignal(short, long), PortfolioManager())
+        simulator.simulate(data, ticker, 10000.0)
+        expected.append(calculate_metrics(simulator.history.equity).sharpe_ratio[0])
+    assert best.score == pytest.approx(sum(expected) / len(expected))
+
+
+def test_successive_halving_drops_weak_configurations_early() -> None:
+    data_loader = SingleThreadedDataLoader(LocalCSVDataSource(TEST_DATA))
+    workflow = OptimizationWorkflow(["AAPL", "GE"], data_loader, "max_drawdown", num_workers=2, halving_rate=3)
+    results = workflow.optimize(parameter_grid("RSI", [[7, 14, 21], [20, 30, 40]]), DATE_RANGE, 10000.0)
+
+    assert len(results) == 9
+    evaluated = [result.tickers_evaluated for result in results]
+    assert evaluated.count(2) == 3
+    assert evaluated.count(1) == 6
+    assert evaluated == sorted(evaluated, reverse=True)
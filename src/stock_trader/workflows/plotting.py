@@ -22,10 +22,9 @@ class PlottingWorkflow:
         self._indicator_factory = indicator_factory
 
     def plot(self: Self, indicator: str, date_range: DateRange) -> None:
-        data = self._data_loader.load_for_tickers(self._tickers, date_range)
-        for ticker in self._tickers:
-            if ticker in data and len(data[ticker]) > 0:
-                self._plot_for_ticket(data[ticker], ticker, indicator)
+        for ticker, data in self._data_loader.iter_tickers(self._tickers, date_range):
+            if len(data) > 0:
+                self._plot_for_ticket(data, ticker, indicator)
                 print(ticker)
 
     def _plot_for_ticket(self: Self, ticker_ohlc: pd.DataFrame, ticker: str, indicator_name: str) -> None:
@@ -0,0 +1,80 @@
+import contextlib
+from collections import deque
+from concurrent.futures import Executor, Future
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Mapping, TypeVar
+
+import pandas as pd
+
+from stock_trader.acquisition.data_loaders.shared_memory import (
+    SharedFrame,
+    from_shared_memory,
+    release_shared_memory,
+    to_shared_memory,
+)
+from stock_trader.acquisition.market_panel import OHLCV_FIELDS
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# data of every ticker, attached once by each worker process initialized with attach_shared_data
+worker_data: dict[str, pd.DataFrame] = {}
+
+
+def share_frame(df: pd.DataFrame) -> SharedFrame:
+    # only the OHLCV columns, whatever else a frame holds may not fit into shared memory
+    return to_shared_memory(df[[field for field in OHLCV_FIELDS if field in df.columns]])
+
+
+@contextlib.contextmanager
+def shared_data(data: Mapping[str, pd.DataFrame]) -> Iterator[dict[str, SharedFrame]]:
+    """
+    Put the data of every ticker into shared memory for the duration of the block.
+
+    Worker processes started with attach_shared_data as their initializer then all share it read-only,
+    so only tickers and results travel between the processes.
+    """
+    shared: dict[str, SharedFrame] = {}
+    try:
+        for ticker in data:
+            shared[ticker] = share_frame(data[ticker])
+        # no reference to the frames is kept, callers may drop theirs once the workers attach to the copies
+        del data
+        yield shared
+    finally:
+        for frame in shared.values():
+            release_shared_memory(frame)
+
+
+def attach_shared_data(shared: dict[str, SharedFrame]) -> None:
+    worker_data.clear()
+    worker_data.update({ticker: from_shared_memory(frame, unlink=False) for ticker, frame in shared.items()})
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def run_chunks_in_order(
+    executor: Executor,
+    function: Callable[..., list[R]],
+    chunks: Iterable[list[T]],
+    max_pending: int,
+    *args: Any,
+) -> Iterator[R]:
+    """
+    Run function(chunk, *args) for every chunk in executor and yield the results in the order of the chunks.
+
+    At most max_pending chunks are submitted at a time, so chunks produced lazily, e.g. while data is still
+    being loaded, are only taken once the workers are ready for them.
+    """
+    # futures are consumed first in, first out, which keeps the results in the order of the chunks
+    pending: deque[Future[list[R]]] = deque()
+    for chunk in chunks:
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+        pending.append(executor.submit(function, chunk, *args))
+    while pending:
+        yield from pending.popleft().result()
@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+from stock_trader.acquisition.data_sources.data_source import DataSource
+from stock_trader.workflows.process_pool import (
+    attach_shared_data,
+    chunked,
+    run_chunks_in_order,
+    shared_data,
+    worker_data,
+)
+
+
+def _double_slowly(chunk: list[int], started: list[int]) -> list[int]:
+    started.extend(chunk)
+    # earlier chunks finish last
+    time.sleep(0.01 * (10 - chunk[0]))
+    return [2 * item for item in chunk]
+
+
+def test_chunked_keeps_the_last_partial_chunk() -> None:
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_results_are_yielded_in_the_order_of_the_chunks() -> None:
+    started: list[int] = []
+    with ThreadPoolExecutor(4) as executor:
+        results = list(run_chunks_in_order(executor, _double_slowly, chunked(range(8), 2), 4, started))
+    assert results == [2 * item for item in range(8)]
+    assert sorted(started) == list(range(8))
+
+
+def test_chunks_are_only_taken_when_fewer_than_max_pending_are_running() -> None:
+    taken: list[int] = []
+
+    def chunks() -> Iterator[list[int]]:
+        for item in range(6):
+            taken.append(item)
+            yield [item]
+
+    with ThreadPoolExecutor(2) as executor:
+        results = run_chunks_in_order(executor, _double_slowly, chunks(), 2, [])
+        assert next(results) == 0
+        # the first chunk was waited for once the third one was taken
+        assert taken == [0, 1, 2]
+        assert list(results) == [2, 4, 6, 8, 10]
+
+
+def test_shared_data_is_attached_read_only_and_released(fake_data_source: DataSource) -> None:
+    df = fake_data_source.load_to_dataframe("AAPL")
+    with shared_data({"AAPL": df}) as shared:
+        attach_shared_data(shared)
+        pd.testing.assert_frame_equal(worker_data["AAPL"], df[worker_data["AAPL"].columns], check_freq=False)
+        with pytest.raises(ValueError):
+            worker_data["AAPL"]["Close"].to_numpy()[0] = 0.0
+        worker_data.clear()
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(shared["AAPL"].block_name)
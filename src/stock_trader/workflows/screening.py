@@ -0,0 +1,32 @@
+from typing import Self
+
+from stock_trader.acquisition.data_loaders.data_loader import DataLoader
+from stock_trader.trading_algorithms.signals import Signal
+from stock_trader.utils.date_range import DateRange
+
+_SIGNAL_NAMES = {1.0: "buy", -1.0: "sell"}
+
+
+class ScreeningWorkflow:
+    """
+    Reports the signal every ticker gives on its last bar, i.e. what to trade today.
+    """
+
+    def __init__(self: Self, tickers: list[str], data_loader: DataLoader, signal: Signal) -> None:
+        self._tickers = tickers
+        self._data_loader = data_loader
+        self._signal = signal
+
+    def screen(self: Self, date_range: DateRange) -> dict[str, str]:
+        """
+        Returns:
+        - Tickers with data mapped to "buy", "sell" or "hold", in the order of the tickers
+        """
+        screened = {}
+        for ticker, data in self._data_loader.iter_tickers(self._tickers, date_range):
+            if len(data) == 0:
+                continue
+            signal_column = self._signal.generate_signals(data)
+            screened[ticker] = _SIGNAL_NAMES.get(float(data[signal_column].iloc[-1]), "hold")
+            print(f"{ticker}: {screened[ticker]}")
+        return screened
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import pandas as pd
+
+from stock_trader.acquisition.data_loaders.data_loader import SingleThreadedDataLoader
+from stock_trader.acquisition.data_sources.data_source import DataSource
+from stock_trader.trading_algorithms.indicator_graph import NodeResults
+from stock_trader.trading_algorithms.signals import Signal
+from stock_trader.utils.date_range import DateRange
+from stock_trader.workflows.screening import ScreeningWorkflow
+
+
+class LastCloseSignal(Signal):
+    # buys tickers whose last close is above 27, sells the rest
+    def generate_signals(self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
+        data["LastClose"] = (data["Close"] > 27).map({True: 1.0, False: -1.0})
+        data.loc[data.index[:-1], "LastClose"] = 0.0
+        return "LastClose"
+
+
+def test_screening_reports_signal_of_last_bar(fake_data_source: DataSource) -> None:
+    data_loader = SingleThreadedDataLoader(fake_data_source)
+    date_range = DateRange(start=datetime(2023, 1, 1), end=datetime(2023, 1, 10))
+    workflow = ScreeningWorkflow(["GE", "AAPL"], data_loader, LastCloseSignal())
+    assert workflow.screen(date_range) == {"GE": "buy", "AAPL": "buy"}
+
+
+def test_screening_holds_on_missing_signal(fake_data_source: DataSource) -> None:
+    data_loader = SingleThreadedDataLoader(fake_data_source)
+    date_range = DateRange(start=datetime(2023, 1, 1), end=datetime(2023, 1, 10))
+
+    class NoSignal(Signal):
+        def generate_signals(self, data: pd.DataFrame, results: NodeResults | None = None) -> str:
+            data["Nothing"] = float("nan")
+            return "Nothing"
+
+    assert ScreeningWorkflow(["GE"], data_loader, NoSignal()).screen(date_range) == {"GE": "hold"}